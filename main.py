@@ -3,6 +3,7 @@ import sys
 import argparse
 from pathlib import Path
 from datetime import datetime
+from io import BytesIO
 import pyperclip
 import requests
 import platform
@@ -26,6 +27,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Markdown 转 Word")
         self.resize(700, 400)
         self.setStyleSheet(self.get_stylesheet())
+        # 当前的转换工作线程
+        self.worker = None
         
         # 创建主布局
         main_layout = QVBoxLayout()
@@ -191,6 +194,13 @@ class MainWindow(QMainWindow):
             self.convert_btn.setEnabled(True)
     
     def start_conversion(self):
+        # 转换进行中时按钮用于取消
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancel()
+            self.convert_btn.setEnabled(False)
+            self.update_status("正在取消...")
+            return
+        
         input_path = self.file_path.text()
         if not os.path.exists(input_path):
             self.show_message("错误", "文件不存在", QMessageBox.Icon.Critical)
@@ -200,7 +210,7 @@ class MainWindow(QMainWindow):
         self.progress.setVisible(True)
         self.progress.setValue(0)
         self.progress_label.setText("转换中... 0%")
-        self.convert_btn.setEnabled(False)
+        self.convert_btn.setText("取消转换")
         self.update_status("正在转换文件，请稍候...")
         
         # 创建工作线程执行转换
@@ -208,6 +218,7 @@ class MainWindow(QMainWindow):
         self.worker.progress.connect(self.update_progress)
         self.worker.finished.connect(self.conversion_complete)
         self.worker.error.connect(self.conversion_error)
+        self.worker.cancelled.connect(self.conversion_cancelled)
         self.worker.start()
     
     def update_progress(self, value):
@@ -233,13 +244,23 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.show_message("警告", f"无法自动打开文件: {str(e)}", QMessageBox.Icon.Warning)
         
-        self.convert_btn.setEnabled(True)
+        self.reset_convert_button()
     
     def conversion_error(self, error_msg):
         self.progress.setVisible(False)
         self.progress_label.setText("转换失败")
         self.update_status(f"转换失败: {error_msg}")
         self.show_message("错误", f"转换失败: {error_msg}", QMessageBox.Icon.Critical)
+        self.reset_convert_button()
+    
+    def conversion_cancelled(self):
+        self.progress.setVisible(False)
+        self.progress_label.setText("已取消")
+        self.update_status("转换已取消")
+        self.reset_convert_button()
+    
+    def reset_convert_button(self):
+        self.convert_btn.setText("开始转换")
         self.convert_btn.setEnabled(True)
     
     def update_status(self, message):
@@ -258,35 +279,38 @@ class ConversionWorker(QThread):
     progress = Signal(int)
     finished = Signal(str)
     error = Signal(str)
+    cancelled = Signal()
     
     def __init__(self, input_path):
         super().__init__()
         self.input_path = input_path
+        self.cancel_token = CancellationToken()
+    
+    def cancel(self):
+        """请求取消转换，转换在处理下一个块之前停止"""
+        self.cancel_token.cancel()
+    
+    def report_progress(self, done, total):
+        """转换进度回调，保存文档占最后 5%"""
+        self.progress.emit(done * 95 // total if total else 95)
     
     def run(self):
         try:
-            # 模拟转换过程
-            self.progress.emit(20)
-            
             # 构建输出路径
-            filename = os.path.splitext(os.path.basename(self.input_path))[0]
             output_path = build_output_path(None, self.input_path, None)
-            self.progress.emit(50)
             
-            # 调用转换接口（示例）
-            response = requests.post(
-                'http://127.0.0.1:2403/convert',
-                json={
-                    'input_path': self.input_path,
-                    'output_path': output_path
-                }
-            )
+            with open(self.input_path, 'r', encoding='utf-8') as f:
+                content = f.read()
             
-            if response.status_code == 200:
-                self.progress.emit(100)
-                self.finished.emit(output_path)
-            else:
-                self.error.emit("API返回错误")
+            # 在工作线程中直接转换，报告真实进度
+            converter = BaseConverter()
+            converter.convert(content, progress=self.report_progress, cancel=self.cancel_token)
+            converter.save(output_path)
+            
+            self.progress.emit(100)
+            self.finished.emit(output_path)
+        except ConversionCancelled:
+            self.cancelled.emit()
         except Exception as e:
             self.error.emit(str(e))
 
@@ -294,10 +318,14 @@ class ConversionWorker(QThread):
 # sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 # 导入转换器
-from src.converter import BaseConverter
+from src.converter import BaseConverter, CancellationToken, ConversionCancelled, LimitExceededError
+from src.converter.base import DOCX_CONTENT_TYPE
+from src.converter.limits import SERVER_LIMITS
 
 # 创建异步Flask应用
 app = Flask(__name__)
+# 服务端共享的转换器，限制单次转换占用的资源；文档状态保存在每个请求的上下文中，可并发使用
+server_converter = BaseConverter(limits=SERVER_LIMITS)
 # 启用异步支持（需要Flask 2.0+）
 if hasattr(app, 'run_task'):
     app.run = lambda **kwargs: app.run_task(**kwargs)
@@ -440,11 +468,11 @@ if __name__ == "__main__":
 def async_convert():  # 改为同步函数
     data = request.get_json()  # 同步获取JSON数据
     
-    # 执行文件转换
+    # 执行文件转换；未提供 output_path 时直接在响应中返回 DOCX 文件
     input_path = data.get('input_path')
     output_path = data.get('output_path')
     
-    if not input_path or not output_path:
+    if not input_path:
         return {'error': '缺少必要参数'}, 400
     
     try:
@@ -452,20 +480,35 @@ def async_convert():  # 改为同步函数
         if not os.path.exists(input_path):
             return {'error': '输入文件不存在'}, 400
         
-        # 使用BaseConverter进行转换（需要实现具体转换逻辑）
-        converter = BaseConverter()
+        # 读取前先检查文件大小，避免把超大文件读入内存
+        file_size = os.path.getsize(input_path)
+        if file_size > SERVER_LIMITS.max_input_bytes:
+            return {'error': f'输入文件过大: {file_size} 字节', 'limit': 'max_input_bytes'}, 413
+        
+        # 所有请求共享同一个预热的转换器，每个请求使用独立的转换上下文
+        converter = server_converter
         
         # 读取Markdown文件
         with open(input_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        if not output_path:
+            # 在内存中生成 DOCX，不经过临时文件
+            docx_bytes = converter.convert_to_bytes(content)
+            download_name = f"{Path(input_path).stem}.docx"
+            return send_file(BytesIO(docx_bytes), mimetype=DOCX_CONTENT_TYPE,
+                             as_attachment=True, download_name=download_name)
+        
         # 执行转换
-        doc = converter.convert(content)
+        context = converter.new_context()
+        converter.convert(content, context=context)
         
         # 保存文档
-        doc.save(output_path)
+        converter.save(output_path, context=context)
         
         return {'output_path': output_path}
+    except LimitExceededError as e:
+        return {'error': str(e), 'limit': e.limit}, 413
     except Exception as e:
         return {'error': str(e)}, 500
 
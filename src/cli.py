@@ -6,25 +6,67 @@ import os
 import argparse
 import time
 from pathlib import Path
+from typing import Optional
 from docx import Document
 from converter import BaseConverter
+from converter.cache import BlockCache
 
 
-def convert_file(input_file: str, output_file: str, debug: bool = False) -> None:
+def convert_file(input_file: str, output_file: str, debug: bool = False, stream: bool = False,
+                 jobs: int = 0, cache_file: Optional[str] = None,
+                 profile: Optional[str] = None, deterministic: bool = False) -> None:
     """转换文件
     
     Args:
         input_file: 输入的 Markdown 文件路径
-        output_file: 输出的 DOCX 文件路径
+        output_file: 输出的 DOCX 文件路径，'-' 表示写入标准输出
         debug: 是否显示调试信息
+        stream: 是否按块流式读取和转换，输入不全部读入内存，生成的文档仍在内存中
+        jobs: 并行转换的进程数，0 表示不并行
+        cache_file: 块缓存文件路径，提供时增量转换并在转换后更新缓存
+        profile: 性能统计输出，'-' 打印到终端，其他值作为 JSON 文件路径
+        deterministic: 是否生成可复现的输出，相同输入得到逐字节相同的文件
     """
-    # 读取输入文件
-    with open(input_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # 初始化转换器
+    block_cache = BlockCache(path=cache_file) if cache_file else None
+    converter = BaseConverter(debug=debug, block_cache=block_cache, profile=profile is not None,
+                              deterministic=deterministic)
     
-    # 初始化转换器并执行转换
-    converter = BaseConverter(debug=debug)
-    doc = converter.convert(content)
+    if stream:
+        # 逐行读取，按块解析和转换
+        with open(input_file, 'r', encoding='utf-8') as f:
+            doc = converter.convert_stream(f)
+    elif jobs:
+        # 按章节并行转换
+        with open(input_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        doc = converter.convert_parallel(content, max_workers=jobs)
+    else:
+        # 读取输入文件
+        with open(input_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        doc = converter.convert(content)
+    
+    # 图片获取失败、HTML 回退等容错处理的警告总是输出到标准错误
+    for warning in converter.stats.warnings:
+        print(f"警告: {warning}", file=sys.stderr)
+    
+    if block_cache is not None:
+        block_cache.save()
+        if debug:
+            print(f"块缓存: 命中 {block_cache.hits}, 未命中 {block_cache.misses}",
+                  file=sys.stderr if output_file == '-' else sys.stdout)
+    
+    if output_file == '-':
+        # 写入标准输出，便于通过管道传给其他程序；提示信息改为输出到标准错误
+        converter.save(sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        if profile == '-':
+            print(converter.stats.format(), file=sys.stderr)
+        elif profile:
+            with open(profile, 'w', encoding='utf-8') as f:
+                f.write(converter.stats.to_json())
+        return
     
     # 检查输出文件是否被占用，如果是则添加时间戳后缀
     output_path = Path(output_file)
@@ -34,8 +76,13 @@ def convert_file(input_file: str, output_file: str, debug: bool = False) -> None
     while attempt < 5:  # 最多尝试5次
         try:
             # 尝试保存文件
-            doc.save(final_output_file)
+            converter.save(final_output_file)
             print(f"转换完成: {final_output_file}")
+            if profile == '-':
+                print(converter.stats.format())
+            elif profile:
+                with open(profile, 'w', encoding='utf-8') as f:
+                    f.write(converter.stats.to_json())
             return
         except PermissionError:
             # 文件被占用，添加时间戳后缀
@@ -56,8 +103,15 @@ def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='将 Markdown 文件转换为 DOCX 文件')
     parser.add_argument('input', help='输入的 Markdown 文件路径')
-    parser.add_argument('output', help='输出的 DOCX 文件路径')
+    parser.add_argument('output', help="输出的 DOCX 文件路径，'-' 表示写入标准输出")
     parser.add_argument('--debug', action='store_true', help='显示调试信息')
+    parser.add_argument('--stream', action='store_true', help='按块流式读取和解析超大文件；只限制输入占用的内存，生成的文档仍完整保存在内存中')
+    parser.add_argument('--jobs', type=int, default=0, help='按一级/二级标题分章节并行转换的进程数')
+    parser.add_argument('--cache', metavar='FILE', help='块缓存文件，重复转换同一文件时只转换改动的块')
+    parser.add_argument('--profile', metavar='JSON_FILE', nargs='?', const='-',
+                        help='统计解析、各转换器和保存耗时；不带参数时打印，带参数时写入 JSON 文件')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='生成可复现的输出：固定时间戳、关系 ID 和图片名，相同输入得到相同的文件')
     
     args = parser.parse_args()
     
@@ -66,7 +120,8 @@ def main():
         sys.exit(1)
     
     try:
-        convert_file(args.input, args.output, args.debug)
+        convert_file(args.input, args.output, args.debug, args.stream, args.jobs, args.cache, args.profile,
+                     args.deterministic)
     except Exception as e:
         print(f"错误: {str(e)}")
         sys.exit(1)
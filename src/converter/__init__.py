@@ -1,14 +1,42 @@
 """
 转换器包
+
+包中的名称按需导入：``import converter`` 本身不会加载 python-docx、
+markdown-it 或任何转换器模块，第一次访问 BaseConverter 等名称时才导入。
 """
-from .base import BaseConverter, ElementConverter, MD2DocxError, ParseError, ConvertError
-from .elements import (
-    HeadingConverter,
-    TextConverter,
-    BlockquoteConverter,
-    ListConverter,
-    CodeConverter
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # 运行时不执行；静态导入让 PyInstaller 等打包工具和类型检查器发现导出的模块
+    from .base import BaseConverter
+    from .elements.base import ElementConverter
+    from .errors import (MD2DocxError, ParseError, ConvertError, LimitExceededError,
+                         ConversionCancelled)
+    from .progress import CancellationToken
+    from .result import ConversionResult
+    from .limits import Limits
+    from .elements import (HeadingConverter, TextConverter, BlockquoteConverter,
+                           ListConverter, CodeConverter)
+
+# 导出名称 -> 所在模块
+_EXPORTS = {
+    'BaseConverter': '.base',
+    'ElementConverter': '.elements.base',
+    'MD2DocxError': '.errors',
+    'ParseError': '.errors',
+    'ConvertError': '.errors',
+    'LimitExceededError': '.errors',
+    'ConversionCancelled': '.errors',
+    'CancellationToken': '.progress',
+    'ConversionResult': '.result',
+    'Limits': '.limits',
+    'HeadingConverter': '.elements',
+    'TextConverter': '.elements',
+    'BlockquoteConverter': '.elements',
+    'ListConverter': '.elements',
+    'CodeConverter': '.elements',
+}
 
 __all__ = [
     'BaseConverter',
@@ -16,9 +44,24 @@ __all__ = [
     'MD2DocxError',
     'ParseError',
     'ConvertError',
+    'LimitExceededError',
+    'ConversionCancelled',
+    'CancellationToken',
+    'ConversionResult',
+    'Limits',
     'HeadingConverter',
     'TextConverter',
     'BlockquoteConverter',
     'ListConverter',
     'CodeConverter'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """首次访问导出名称时导入对应模块"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,98 +1,349 @@
 """
 基础转换器模块，处理 Markdown 到 DOCX 的核心转换逻辑
 """
-from typing import Dict, List, Tuple
+import time
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Dict, Iterable, List, Optional
 from docx import Document
 from markdown_it import MarkdownIt
+from markdown_it.token import Token
+from docx.oxml.ns import qn
+from lxml import etree
 
+from .body import get_body_writer
 from .elements.base import ElementConverter
-from .elements import (
-    HeadingConverter,
-    TextConverter,
-    BlockquoteConverter,
-    ListConverter,
-    CodeConverter,
-    LinkConverter,
-    ImageConverter,
-    TableConverter,
-    HRConverter,
-    TaskListConverter,
-    HtmlConverter
-)
+from .errors import MD2DocxError, ParseError, ConvertError, LimitExceededError, ConversionCancelled
+from .ir import EMPTY_INLINE, ListItem, build_ir
+from .parser import get_parser
+from .template import new_document
+from .stream import DEFAULT_CHUNK_SIZE, iter_chunks, scan_references
+from .cache import BlockCache, DocumentMark, capture, fingerprint, replay
+from .stats import ConversionStats
+from .result import ConversionResult
+from .trace import Tracer
+from .limits import Limits, ResourceGovernor
+from .progress import CancellationToken, ProgressCallback, ProgressMonitor
+from .context import ConversionContext, current_context
+from .reproducible import save_reproducible
+from . import elements
 
+if TYPE_CHECKING:
+    # 只有并行转换才需要 concurrent.futures，运行时在 convert_parallel 中导入
+    from concurrent.futures import Executor
 
-class MD2DocxError(Exception):
-    """基础异常类"""
-    pass
 
+# DOCX 文件的 MIME 类型，用于 HTTP 响应
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
 
-class ParseError(MD2DocxError):
-    """解析错误"""
-    pass
-
-
-class ConvertError(MD2DocxError):
-    """转换错误"""
-    pass
+# 块级标记处理函数：handler(tokens, index) -> 下一个待处理的索引
+Handler = Callable[[List[Token], int], int]
 
 
 class BaseConverter:
-    """基础转换器，处理文档结构"""
+    """基础转换器，处理文档结构
+    
+    转换器本身只保存配置、分派表和跨文档的缓存，每个文档的状态保存在
+    ConversionContext 中。不指定上下文时使用转换器的默认上下文（reset 重新创建）；
+    并发转换时每个请求使用 new_context() 创建的上下文，同一个转换器可以在
+    多个线程中同时使用。
+    """
 
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, block_cache: Optional[BlockCache] = None, profile: bool = False,
+                 tracer: Optional[Tracer] = None, limits: Optional[Limits] = None,
+                 deterministic: bool = False):
         """初始化转换器
         
         Args:
             debug: 是否显示调试信息
+            block_cache: 块缓存，提供时启用增量转换，未改动的顶层块复用缓存的片段
+            profile: 是否记录每个元素转换器的耗时、调用次数和输出大小
+            tracer: 跟踪器，默认在调试模式下记录并立即输出事件，否则不记录
+            limits: 资源限制，超出时抛出 LimitExceededError，默认不限制
+            deterministic: 是否生成可复现的输出，相同输入和选项保存出逐字节相同的文件
         """
         # 调试模式
         self.debug = debug
+        # 跟踪器：转换器和元素转换器的调试事件都记录到这里
+        self.tracer = tracer if tracer is not None else Tracer(enabled=debug, echo=debug, dump_on_error=False)
+        # 资源限制，每个上下文各自计数
+        self.limits = limits
+        # 性能统计模式
+        self.profile = profile
+        # 增量转换使用的块缓存
+        self.block_cache = block_cache
+        # 可复现输出模式
+        self.deterministic = deterministic
         
-        # 启用所有需要的插件
-        self.md = (MarkdownIt('commonmark', {'breaks': True, 'html': True})  # 启用HTML支持
-                  .enable('strikethrough')
-                  .enable('emphasis')
-                  .enable('table'))  # 启用表格支持
-        self.document = Document()
+        # 默认上下文，未指定上下文的转换使用它
+        self._default_context = self.new_context()
         self.converters = {}
-        self._list_stack: List[Tuple[str, int]] = []  # [(list_type, level), ...]
+        # 块级分派表：token.type -> 处理函数
+        self.handlers: Dict[str, Handler] = {}
         
-        # 自动注册所有转换器
+        # 自动注册所有转换器和处理函数
         self._register_default_converters()
+        self._register_default_handlers()
         
         # 调试信息
-        if self.debug:
-            print(f"转换器注册完成: {self.converters.keys()}")
+        self.tracer.event('base', "转换器注册完成: {}", list(self.converters))
+    
+    def new_context(self, document: Optional[Document] = None) -> ConversionContext:
+        """创建一个新的转换上下文
+        
+        Args:
+            document: 目标文档，默认从模板缓存克隆
+            
+        Returns:
+            ConversionContext: 转换上下文
+        """
+        return ConversionContext(document if document is not None else new_document(), self.limits)
+    
+    @property
+    def context(self) -> ConversionContext:
+        """当前的转换上下文：转换期间为正在使用的上下文，否则为默认上下文"""
+        context = current_context()
+        return context if context is not None else self._default_context
+    
+    @property
+    def document(self) -> Document:
+        """当前上下文的目标文档"""
+        return self.context.document
+    
+    @document.setter
+    def document(self, document: Document) -> None:
+        self.context.document = document
+    
+    @property
+    def stats(self) -> ConversionStats:
+        """当前上下文的转换统计"""
+        return self.context.stats
+    
+    @property
+    def governor(self) -> Optional[ResourceGovernor]:
+        """当前上下文的资源用量，未设置资源限制时为 None"""
+        return self.context.governor
+    
+    @property
+    def md(self) -> MarkdownIt:
+        """当前线程共享的、预先配置好的 Markdown 解析器"""
+        return get_parser()
     
     def _register_default_converters(self):
-        """注册默认的转换器"""
-        self.register_converter('heading', HeadingConverter(self))
-        self.register_converter('text', TextConverter(self))
-        self.register_converter('blockquote', BlockquoteConverter(self))
-        self.register_converter('list', ListConverter(self))
-        self.register_converter('code', CodeConverter(self))
-        self.register_converter('link', LinkConverter(self))
-        self.register_converter('image', ImageConverter(self))
-        self.register_converter('table', TableConverter(self))
-        self.register_converter('hr', HRConverter(self))
-        self.register_converter('task_list', TaskListConverter(self))
-        self.register_converter('html', HtmlConverter(self))  # 注册HTML转换器
-    
-    def register_converter(self, element_type: str, converter: ElementConverter):
+        """注册默认的转换器
+        
+        转换器类通过 elements 包按需导入，首次创建转换器时才加载各转换器模块。
+        """
+        self.register_converter('heading', elements.HeadingConverter(self))
+        self.register_converter('text', elements.TextConverter(self))
+        self.register_converter('blockquote', elements.BlockquoteConverter(self))
+        self.register_converter('list', elements.ListConverter(self))
+        self.register_converter('code', elements.CodeConverter(self))
+        self.register_converter('link', elements.LinkConverter(self))
+        self.register_converter('image', elements.ImageConverter(self))
+        self.register_converter('table', elements.TableConverter(self))
+        self.register_converter('hr', elements.HRConverter(self))
+        self.register_converter('task_list', elements.TaskListConverter(self))
+        self.register_converter('html', elements.HtmlConverter(self))  # 注册HTML转换器
+    
+    def _register_default_handlers(self):
+        """注册默认的块级标记处理函数（token.type -> 处理函数）"""
+        self.register_handler('heading_open', self._handle_heading)
+        self.register_handler('blockquote_open', self._handle_blockquote)
+        self.register_handler('list_item_open', self._handle_list_item)
+        self.register_handler('fence', self._handle_fence)
+        self.register_handler('image', self._handle_image)
+        self.register_handler('hr', self._handle_hr)
+        self.register_handler('table_open', self._handle_table)
+        self.register_handler('html_block', self._handle_html)
+        self.register_handler('html_inline', self._handle_html)
+        self.register_handler('paragraph_open', self._handle_paragraph)
+    
+    def register_converter(self, element_type: str, converter: ElementConverter,
+                           token_types: Optional[Iterable[str]] = None):
         """注册一个元素转换器
         
         Args:
             element_type: 元素类型
             converter: 对应的转换器实例
+            token_types: 由该转换器处理的标记类型。提供时会在分派表中注册
+                通用处理函数：叶子标记调用 ``convert(token)``，成对标记调用
+                ``convert(token, tokens)``，其中 tokens 为开始到结束的全部标记
         """
         converter.set_document(self.document)
+        converter.trace_source = element_type
+        if self.profile:
+            converter.convert = self._profiled(element_type, converter.convert)
+            # 行内图片和链接由行内渲染引擎调用 convert_in_paragraph，同样计入该转换器
+            if hasattr(converter, 'convert_in_paragraph'):
+                converter.convert_in_paragraph = self._profiled(element_type, converter.convert_in_paragraph)
         self.converters[element_type] = converter
+        for token_type in token_types or ():
+            self.register_handler(token_type, self._make_converter_handler(element_type))
+    
+    def reset(self, document: Optional[Document] = None) -> Document:
+        """开始一个新文档，以便复用同一个转换器实例
+        
+        清除上一次转换的文档级状态（列表编号、代码块状态等），解析器、
+        模板和图片等缓存保持预热。
+        
+        Args:
+            document: 新的目标文档，默认从模板缓存克隆
+            
+        Returns:
+            Document: 新的目标文档
+        """
+        self._default_context = self.new_context(document)
+        for converter in self.converters.values():
+            converter.set_document(self.document)
+            converter.reset()
+        return self.document
+    
+    def register_handler(self, token_type: str, handler: Handler) -> None:
+        """在分派表中注册块级标记处理函数
+        
+        Args:
+            token_type: 标记类型（token.type）
+            handler: 处理函数，签名为 ``handler(tokens, index) -> next_index``
+        """
+        self.handlers[token_type] = handler
+    
+    def _make_converter_handler(self, element_type: str) -> Handler:
+        """为通过 register_converter 注册的转换器生成通用处理函数
+        
+        Args:
+            element_type: 元素类型
+            
+        Returns:
+            Handler: 处理函数
+        """
+        def handler(tokens: List[Token], i: int) -> int:
+            end = self._block_end(i)
+            converter = self.converters.get(element_type)
+            if converter:
+                if end > i:
+                    converter.convert(tokens[i], tokens[i:end + 1])
+                else:
+                    converter.convert(tokens[i])
+            return end + 1
+        return handler
+    
+    def _block_end(self, i: int) -> int:
+        """获取开始标记 i 对应的结束标记索引，叶子标记返回自身索引"""
+        block = self.context.blocks.get(i)
+        return block.end if block else i
     
-    def convert(self, md_text: str) -> Document:
+    def convert(self, md_text: str, progress: Optional[ProgressCallback] = None,
+                cancel: Optional[CancellationToken] = None,
+                context: Optional[ConversionContext] = None) -> Document:
         """将 Markdown 文本转换为 DOCX 文档
         
         Args:
             md_text: Markdown 文本
+            progress: 进度回调 ``progress(已处理标记数, 标记总数)``，节流调用，
+                完成时总是以 (total, total) 调用一次
+            cancel: 取消令牌，在处理每个块之前检查
+            context: 转换上下文，默认为转换器的默认上下文
+        
+        Returns:
+            Document: 生成的 DOCX 文档
+        
+        Raises:
+            ParseError: Markdown 解析错误
+            ConvertError: 转换过程错误
+            ConversionCancelled: 转换被取消
+        """
+        context = context if context is not None else self.context
+        try:
+            with context.activate():
+                if context.governor is not None:
+                    context.governor.start()
+                    context.governor.add_input(md_text)
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                # 解析 Markdown 文本为 AST
+                tokens = self._parse(md_text)
+                if progress is not None or cancel is not None:
+                    context.monitor = ProgressMonitor(len(tokens), progress, cancel)
+                self._convert_tokens(tokens)
+                if context.monitor is not None:
+                    context.monitor.finish()
+                return context.document
+            
+        except Exception as e:
+            if not isinstance(e, ConversionCancelled):
+                self._dump_trace()
+            if isinstance(e, MD2DocxError):
+                raise
+            raise ConvertError(f"转换失败: {str(e)}")
+        finally:
+            context.monitor = None
+    
+    def convert_stream(self, lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       context: Optional[ConversionContext] = None) -> Document:
+        """以流式方式转换 Markdown 文本
+        
+        输入按安全的块边界切分（代码块、列表之外的空行），逐块解析和转换，
+        同一时刻只保留一个分块的文本和标记。列表和编号状态在分块之间保留。
+        
+        分块只限制输入文本和标记占用的内存：生成的文档仍然完整地保存在内存中，
+        峰值内存随输出文档的大小增长。
+        
+        引用式链接定义对所有分块生效：可以定位的输入（例如打开的文件）先预扫描
+        一遍收集定义，再回到起点转换；只能迭代一次的输入只能引用之前分块中的定义。
+        
+        Args:
+            lines: Markdown 文本行的可迭代对象，例如打开的文件
+            chunk_size: 每个分块的目标字符数
+            context: 转换上下文，默认为转换器的默认上下文
+        
+        Returns:
+            Document: 生成的 DOCX 文档
+        
+        Raises:
+            ParseError: Markdown 解析错误
+            ConvertError: 转换过程错误
+        """
+        context = context if context is not None else self.context
+        try:
+            with context.activate():
+                governor = context.governor
+                if governor is not None:
+                    governor.start()
+                # 各分块共用一个解析环境，引用式链接定义跨分块生效
+                env: Dict[str, Any] = {}
+                if hasattr(lines, 'seekable') and lines.seekable():
+                    start = time.perf_counter()
+                    position = lines.tell()
+                    env['references'] = scan_references(lines, self.md, chunk_size)
+                    lines.seek(position)
+                    self.stats.parse_time += time.perf_counter() - start
+                for chunk in iter_chunks(lines, chunk_size):
+                    if governor is not None:
+                        governor.add_input(chunk)
+                    self._convert_tokens(self._parse(chunk, env))
+                return context.document
+            
+        except Exception as e:
+            self._dump_trace()
+            if isinstance(e, MD2DocxError):
+                raise
+            raise ConvertError(f"转换失败: {str(e)}")
+    
+    def convert_parallel(self, md_text: str, max_workers: Optional[int] = None,
+                         executor: Optional['Executor'] = None,
+                         context: Optional[ConversionContext] = None) -> Document:
+        """按一级/二级标题切分文档，在多个进程中并行转换后合并
+        
+        各章节由工作进程中的默认转换器独立转换，通过 register_converter
+        或 register_handler 注册的自定义转换器不会生效。合并时重新分配
+        关系 ID、编号 ID 和图片，并合并章节中新增或修改的样式。
+        资源限制中的输入大小对整个文档检查，其余限制在每个章节内分别检查。
+        
+        Args:
+            md_text: Markdown 文本
+            max_workers: 工作进程数，默认为 CPU 核心数
+            executor: 复用的执行器（例如服务中常驻的进程池），提供时忽略 max_workers
+            context: 转换上下文，默认为转换器的默认上下文
         
         Returns:
             Document: 生成的 DOCX 文档
@@ -101,254 +352,441 @@ class BaseConverter:
             ParseError: Markdown 解析错误
             ConvertError: 转换过程错误
         """
+        # 避免与 parallel 模块循环导入
+        from .parallel import convert_parallel
+        
+        context = context if context is not None else self.context
         try:
-            # 解析 Markdown 文本为 AST
-            tokens = self.md.parse(md_text)
+            if context.governor is not None:
+                context.governor.start()
+                context.governor.add_input(md_text)
+            start = time.perf_counter()
+            try:
+                return convert_parallel(context.document, md_text, max_workers=max_workers,
+                                        executor=executor, debug=self.debug, limits=self.limits,
+                                        stats=context.stats, profile=self.profile)
+            finally:
+                context.stats.convert_time += time.perf_counter() - start
             
-            # 调试：打印所有标记
-            if self.debug:
-                print("-----------------===============================================")
-                print(tokens)
-                print("-----------------===============================================")
+        except Exception as e:
+            self._dump_trace()
+            if isinstance(e, MD2DocxError):
+                raise
+            raise ConvertError(f"转换失败: {str(e)}")
+    
+    def _dump_trace(self) -> None:
+        """转换出错时输出跟踪缓冲区中最近的事件"""
+        if self.tracer.dump_on_error:
+            self.tracer.dump()
+    
+    def save(self, path_or_stream: Any, context: Optional[ConversionContext] = None) -> None:
+        """保存文档，并记录保存耗时
+        
+        可复现输出模式下先规范化关系 ID、图片部件名和核心属性，
+        再以固定的条目顺序和时间戳写入。
+        
+        Args:
+            path_or_stream: 文件路径或可写的文件对象
+            context: 要保存的转换上下文，默认为转换器的默认上下文
+        """
+        context = context if context is not None else self.context
+        start = time.perf_counter()
+        if self.deterministic:
+            save_reproducible(context.document, path_or_stream)
+        else:
+            context.document.save(path_or_stream)
+        context.stats.save_time += time.perf_counter() - start
 
-                for token in tokens:
-                    print(f"Token type={token.type}, tag={token.tag if hasattr(token, 'tag') else ''}, content={token.content if hasattr(token, 'content') else ''}")
-                    if hasattr(token, 'children') and token.children is not None:
-                        for child in token.children:
-                            print(f"  Child: type={child.type}, content={child.content if hasattr(child, 'content') else ''}")
+    def convert_to_stream(self, md_text: str, fileobj: BinaryIO,
+                          progress: Optional[ProgressCallback] = None,
+                          cancel: Optional[CancellationToken] = None,
+                          context: Optional[ConversionContext] = None) -> None:
+        """转换 Markdown 文本并把 DOCX 包直接写入文件对象，不经过临时文件
 
-            # 用于跟踪已处理的段落，避免重复处理
-            processed_paragraphs = set()
+        文件对象只需要支持 write，不要求可定位，可以是 HTTP 响应流或套接字
+        （socket.makefile('wb')）。每次调用默认使用新的上下文，
+        可以在多个线程中同时调用。
+
+        Args:
+            md_text: Markdown 文本
+            fileobj: 可写的二进制文件对象
+            progress: 进度回调，见 convert
+            cancel: 取消令牌，见 convert
+            context: 转换上下文，默认为新的上下文
+
+        Raises:
+            ParseError: Markdown 解析错误
+            ConvertError: 转换过程错误
+            ConversionCancelled: 转换被取消
+        """
+        context = context if context is not None else self.new_context()
+        self.convert(md_text, progress=progress, cancel=cancel, context=context)
+        self.save(fileobj, context=context)
+
+    def convert_to_bytes(self, md_text: str, progress: Optional[ProgressCallback] = None,
+                         cancel: Optional[CancellationToken] = None,
+                         context: Optional[ConversionContext] = None) -> bytes:
+        """转换 Markdown 文本并返回 DOCX 文件内容
+
+        每次调用默认使用新的上下文，可以在多个线程中同时调用。
+
+        Args:
+            md_text: Markdown 文本
+            progress: 进度回调，见 convert
+            cancel: 取消令牌，见 convert
+            context: 转换上下文，默认为新的上下文
+
+        Returns:
+            bytes: DOCX 文件内容
+
+        Raises:
+            ParseError: Markdown 解析错误
+            ConvertError: 转换过程错误
+            ConversionCancelled: 转换被取消
+        """
+        buffer = BytesIO()
+        self.convert_to_stream(md_text, buffer, progress=progress, cancel=cancel, context=context)
+        return buffer.getvalue()
+
+    def convert_with_result(self, md_text: str, progress: Optional[ProgressCallback] = None,
+                            cancel: Optional[CancellationToken] = None,
+                            context: Optional[ConversionContext] = None) -> ConversionResult:
+        """转换 Markdown 文本，返回文档以及元素数量、图片、回退、耗时和警告
+
+        每次调用默认使用新的上下文，可以在多个线程中同时调用。
+
+        Args:
+            md_text: Markdown 文本
+            progress: 进度回调，见 convert
+            cancel: 取消令牌，见 convert
+            context: 转换上下文，默认为新的上下文
+
+        Returns:
+            ConversionResult: 转换结果
+
+        Raises:
+            ParseError: Markdown 解析错误
+            ConvertError: 转换过程错误
+            ConversionCancelled: 转换被取消
+        """
+        context = context if context is not None else self.new_context()
+        document = self.convert(md_text, progress=progress, cancel=cancel, context=context)
+        return ConversionResult(document, context.stats)
+
+    def _parse(self, md_text: str, env: Optional[Dict[str, Any]] = None) -> List[Token]:
+        """解析 Markdown 文本，并记录解析耗时"""
+        start = time.perf_counter()
+        tokens = self.md.parse(md_text, env)
+        self.stats.parse_time += time.perf_counter() - start
+        return tokens
+    
+    def _profiled(self, element_type: str, convert: Callable) -> Callable:
+        """包装元素转换器的 convert（或 convert_in_paragraph）方法，记录独占耗时、调用次数和输出大小
+        
+        Args:
+            element_type: 元素类型
+            convert: 原方法
             
-            # 转换每个节点
-            i = 0
-            while i < len(tokens):
-                token = tokens[i]
-                # 调试信息
-                if self.debug:
-                    print(f"Processing token: type={token.type}, tag={token.tag if hasattr(token, 'tag') else ''}")
-                
-                # 处理标题
-                if token.type == 'heading_open':
-                    converter = self.converters.get('heading')
-                    if converter and i + 1 < len(tokens):
-                        content_token = tokens[i + 1]
-                        if content_token.type == 'inline':
-                            converter.convert((token, content_token))
-                            i += 2  # 跳过内容标记
-                
-                # 处理引用块
-                elif token.type == 'blockquote_open':
-                    converter = self.converters.get('blockquote')
-                    if converter:
-                        # 查找引用块的内容
-                        content_start = i + 1
-                        content_end = content_start
-                        nesting_level = 1
-                        
-                        while content_end < len(tokens):
-                            if tokens[content_end].type == 'blockquote_open':
-                                nesting_level += 1
-                            elif tokens[content_end].type == 'blockquote_close':
-                                nesting_level -= 1
-                                if nesting_level == 0:
-                                    break
-                            content_end += 1
-                        
-                        if content_end < len(tokens):
-                            # 处理引用块内的内容
-                            j = content_start
-                            empty_quote = True
-                            while j < content_end:
-                                if tokens[j].type == 'paragraph_open' and j + 1 < content_end:
-                                    content_token = tokens[j + 1]
-                                    if content_token.type == 'inline':
-                                        # 获取当前引用块的层级
-                                        current_level = 0
-                                        k = j
-                                        while k >= 0:
-                                            if tokens[k].type == 'blockquote_open':
-                                                current_level += 1
-                                            k -= 1
-                                        # 使用正确的引用块标记
-                                        quote_token = tokens[i]
-                                        quote_token.markup = '>' * current_level
-                                        converter.convert((quote_token, content_token))
-                                        empty_quote = False
-                                        j += 2
-                                        continue
-                                j += 1
-                            
-                            # 处理空引用块
-                            if empty_quote:
-                                converter.convert((tokens[i], None))
-                            
-                            i = content_end  # 跳到引用块结束标记
-                
-                # 处理列表
-                elif token.type in ('bullet_list_open', 'ordered_list_open'):
-                    # 更新列表栈
-                    list_type = 'ordered' if token.type == 'ordered_list_open' else 'bullet'
-                    level = len(self._list_stack) + 1
-                    self._list_stack.append((list_type, level))
-                    i += 1
-                
-                # 处理列表项
-                elif token.type == 'list_item_open':
-                    converter = self.converters.get('list')
-                    if converter:
-                        # 获取列表类型和级别
-                        list_type = self._list_stack[-1][0] if self._list_stack else 'bullet'
-                        level = self._list_stack[-1][1] if self._list_stack else 1
-                        
-                        # 创建列表token
-                        list_token = type('ListToken', (), {
-                            'type': f'{list_type}_list_open',
-                            'content': '  ' * (level - 1)
-                        })
-                        
-                        # 查找列表项内容
-                        content_token = None
-                        j = i + 1
-                        paragraph_indices = []
-                        while j < len(tokens) and tokens[j].type != 'list_item_close':
-                            if tokens[j].type == 'paragraph_open' and j + 1 < len(tokens):
-                                content_token = tokens[j + 1]
-                                paragraph_indices.append(j)
-                                if content_token.type == 'inline':
-                                    break
-                            j += 1
-                        
-                        # 处理空列表项
-                        if not content_token:
-                            content_token = type('EmptyToken', (), {
-                                'type': 'inline',
-                                'children': []
-                            })
-                        
-                        # 检查是否为任务列表项
-                        is_task_list = False
-                        if content_token.type == 'inline' and hasattr(content_token, 'content'):
-                            content = content_token.content.strip()
-                            if content.startswith('[ ] ') or content.startswith('[x] '):
-                                is_task_list = True
-                        
-                        # 使用任务列表转换器或普通列表转换器
-                        if is_task_list and 'task_list' in self.converters:
-                            self.converters['task_list'].convert((list_token, content_token))
-                            # 记录已处理的段落，避免重复处理
-                            for paragraph_index in paragraph_indices:
-                                processed_paragraphs.add(paragraph_index)
-                        else:
-                            converter.convert((list_token, content_token))
-                        
-                        # 跳过列表项内的段落，避免重复处理
-                        while j < len(tokens) and tokens[j].type != 'list_item_close':
-                            j += 1
-                        
-                        i = j + 1 if j < len(tokens) else i + 1
-                    else:
-                        i += 1
-                
-                # 处理列表结束
-                elif token.type in ('bullet_list_close', 'ordered_list_close'):
-                    if self._list_stack:
-                        self._list_stack.pop()
-                    i += 1
-                
-                # 处理代码块
-                elif token.type == 'fence':
-                    converter = self.converters.get('code')
-                    if converter:
-                        converter.convert(token)
-                    i += 1
-                
-                # 处理图片
-                elif token.type == 'image':
-                    converter = self.converters.get('image')
-                    if converter:
-                        converter.convert((token, token))
-                    i += 1
-                
-                # 处理水平线
-                elif token.type == 'hr':
-                    converter = self.converters.get('hr')
-                    if converter:
-                        converter.convert(token)
-                    else:
-                        self.document.add_paragraph('---')
-                    i += 1
-                
-                # 处理表格
-                elif token.type == 'table_open':
-                    converter = self.converters.get('table')
-                    if converter:
-                        # 查找表格的结束位置
-                        table_end = i + 1
-                        while table_end < len(tokens) and tokens[table_end].type != 'table_close':
-                            table_end += 1
-                        
-                        if table_end < len(tokens):
-                            # 提取整个表格的tokens
-                            table_tokens = tokens[i:table_end+1]
-                            if self.debug:
-                                print(f"处理表格tokens: {table_tokens}")
-                            converter.convert(tokens[i], table_tokens)
-                            i = table_end + 1  # 跳过整个表格
-                        else:
-                            i += 1
-                    else:
-                        i += 1
-                
-                # 处理HTML标签
-                elif token.type == 'html_block' or token.type == 'html_inline':
-                    converter = self.converters.get('html')
-                    if converter:
-                        if self.debug:
-                            print(f"处理HTML标签: {token.content if hasattr(token, 'content') else ''}")
-                        converter.convert(token)
-                    i += 1
-                
-                # 处理段落
-                elif token.type == 'paragraph_open':
-                    # 检查是否已经处理过这个段落
-                    if i in processed_paragraphs:
-                        # 跳过已处理的段落
-                        i += 2  # 跳过段落开始和内容标记
-                        while i < len(tokens) and tokens[i].type != 'paragraph_close':
-                            i += 1
-                        i += 1  # 跳过段落结束标记
-                    else:
-                        converter = self.converters.get('text')
-                        if converter and i + 1 < len(tokens):
-                            content_token = tokens[i + 1]
-                            if content_token.type == 'inline':
-                                # 检查是否为任务列表项
-                                is_task_list = False
-                                if hasattr(content_token, 'content'):
-                                    content = content_token.content.strip()
-                                    if content.startswith('[ ] ') or content.startswith('[x] '):
-                                        is_task_list = True
-                                
-                                # 如果是任务列表项，使用任务列表转换器
-                                if is_task_list and 'task_list' in self.converters:
-                                    # 创建一个虚拟的列表token
-                                    list_token = type('ListToken', (), {
-                                        'type': 'bullet_list_open',
-                                        'content': ''
-                                    })
-                                    self.converters['task_list'].convert((list_token, content_token))
-                                else:
-                                    converter.convert((token, content_token))
-                                i += 2  # 跳过内容标记
-                        else:
-                            i += 1
+        Returns:
+            Callable: 包装后的方法
+        """
+        def profiled(*args, **kwargs):
+            stats = self.stats
+            marker = self._last_block() if not stats._child_times else None
+            stats._child_times.append(0.0)
+            start = time.perf_counter()
+            try:
+                return convert(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                child_time = stats._child_times.pop()
+                converter_stats = stats.converter(element_type)
+                converter_stats.calls += 1
+                converter_stats.time += elapsed - child_time
+                if stats._child_times:
+                    stats._child_times[-1] += elapsed
                 else:
-                    i += 1
+                    # 只在最外层调用统计新增的正文元素
+                    self._measure_output(marker, converter_stats)
+        return profiled
+    
+    def _measure_output(self, marker: Optional[Any], converter_stats) -> None:
+        """统计 marker 之后新增的正文元素数和 XML 字节数"""
+        body = self.document.element.body
+        element = marker.getnext() if marker is not None else (body[0] if len(body) else None)
+        while element is not None and element.tag != qn('w:sectPr'):
+            converter_stats.elements += 1
+            converter_stats.output_bytes += len(etree.tostring(element))
+            element = element.getnext()
+    
+    def _convert_tokens(self, tokens: List[Token]) -> None:
+        """转换一段完整的标记流
+        
+        Args:
+            tokens: 标记列表
+        """
+        # 调试：记录所有标记
+        if self.tracer.enabled_for('tokens'):
+            trace = self.tracer.event
+            trace('tokens', "标记数: {}", len(tokens))
+            for token in tokens:
+                trace('tokens', "Token type={}, tag={}, content={}", token.type, token.tag, token.content)
+                for child in token.children or ():
+                    trace('tokens', "  Child: type={}, content={}", child.type, child.content)
 
-            return self.document
+        context = self.context
+        if context.governor is not None:
+            context.governor.add_tokens(len(tokens))
+        context.stats.count_elements(tokens)
+        
+        start = time.perf_counter()
+        # 预先建立块级节点（开始/结束标记配对、列表项层级），处理函数通过它 O(1) 定位
+        context.blocks = build_ir(tokens)
+        context.quote_stack = []
+        
+        # 按分派表转换每个节点
+        try:
+            if self.block_cache is not None:
+                self._convert_cached(tokens)
+            else:
+                self._convert_range(tokens, 0, len(tokens))
+        finally:
+            context.stats.convert_time += time.perf_counter() - start
+    
+    def _convert_cached(self, tokens: List[Token]) -> None:
+        """逐个顶层块转换，指纹命中时回放缓存的片段
+        
+        指纹由块的标记内容和转换前的转换器状态（列表、编号、代码块等上下文）
+        以及文档中的样式数量组成；命中时回放片段并恢复转换后的状态。
+        
+        Args:
+            tokens: 标记列表
+        """
+        cache = self.block_cache
+        context = self.context
+        document = context.document
+        styles = document.styles.element
+        i = 0
+        while i < len(tokens):
+            end = self._block_end(i) + 1
+            key = fingerprint(tokens, i, end, (self._get_state(), len(styles)))
+            entry = cache.get(key)
+            if entry is not None:
+                if context.monitor is not None:
+                    context.monitor.update(i)
+                replay(document, entry)
+                self._set_state(entry.state)
+            else:
+                mark = DocumentMark(document, self._last_block())
+                self._convert_range(tokens, i, end)
+                cache.put(key, capture(document, mark, self._get_state()))
+            i = end
+    
+    def _get_state(self) -> tuple:
+        """收集所有转换器的跨块状态"""
+        return tuple((name, converter.get_state()) for name, converter in self.converters.items())
+    
+    def _set_state(self, state: tuple) -> None:
+        """恢复 _get_state 收集的状态"""
+        for name, converter_state in state:
+            converter = self.converters.get(name)
+            if converter is not None:
+                converter.set_state(converter_state)
+    
+    def _convert_range(self, tokens: List[Token], start: int, end: int) -> None:
+        """按分派表转换 [start, end) 范围内的标记
+        
+        Args:
+            tokens: 标记列表
+            start: 起始索引
+            end: 结束索引（不包含）
+        """
+        handlers = self.handlers
+        trace = self.tracer.event if self.tracer.enabled_for('base') else None
+        context = self.context
+        governor = context.governor
+        monitor = context.monitor
+        i = start
+        while i < end:
+            token = tokens[i]
+            # 调试信息
+            if trace:
+                trace('base', "Processing token: type={}, tag={}", token.type, token.tag)
+            # 协作式检查耗时和嵌套深度
+            if governor is not None:
+                governor.check_deadline()
+                governor.check_depth(token.level)
+            # 报告进度并检查取消
+            if monitor is not None:
+                monitor.update(i)
             
-        except Exception as e:
-            if isinstance(e, MD2DocxError):
-                raise
-            raise ConvertError(f"转换失败: {str(e)}") 
\ No newline at end of file
+            handler = handlers.get(token.type)
+            i = handler(tokens, i) if handler else i + 1
+    
+    def _last_block(self) -> Optional[Any]:
+        """获取文档主体中最后一个块级元素（sectPr 之前）"""
+        return get_body_writer(self.document).last_block()
+    
+    def _handle_heading(self, tokens: List[Token], i: int) -> int:
+        """处理标题"""
+        end = self._block_end(i)
+        converter = self.converters.get('heading')
+        if converter and i + 1 < end:
+            content_token = tokens[i + 1]
+            if content_token.type == 'inline':
+                converter.convert((tokens[i], content_token))
+        return end + 1
+    
+    def _handle_blockquote(self, tokens: List[Token], i: int) -> int:
+        """处理引用块
+        
+        引用层级由运行中的引用栈给出；引用块内的段落交给引用块转换器，
+        其余子块（列表、代码、表格、嵌套引用等）按分派表正常转换，
+        再由引用块转换器补上对应层级的缩进。
+        """
+        converter = self.converters.get('blockquote')
+        content_end = self._block_end(i)
+        if not converter or content_end == i:
+            return i + 1
+        
+        quote_stack = self.context.quote_stack
+        quote_stack.append(tokens[i])
+        level = len(quote_stack)
+        marker = self._last_block()
+        try:
+            self._convert_range(tokens, i + 1, content_end)
+        finally:
+            quote_stack.pop()
+        
+        # 收集本引用块内生成的块级元素
+        if marker is not None:
+            element = marker.getnext()
+        else:
+            body = self.document.element.body
+            element = body[0] if len(body) else None
+        blocks = []
+        while element is not None and element.tag != qn('w:sectPr'):
+            blocks.append(element)
+            element = element.getnext()
+        
+        # 处理空引用块
+        if not blocks:
+            converter.convert((tokens[i], None), level=level)
+            return content_end + 1
+        
+        for block in blocks:
+            converter.indent_block(block, level)
+        return content_end + 1
+    
+    def _handle_list_item(self, tokens: List[Token], i: int) -> int:
+        """处理列表项
+        
+        列表项的首个段落由列表转换器输出，其余子块（如嵌套列表）
+        交回主循环继续分派。
+        """
+        converter = self.converters.get('list')
+        if not converter:
+            return i + 1
+        
+        block = self.context.blocks.get(i)
+        if block is None:
+            return i + 1
+        list_item = block.item or ListItem()
+        
+        # 查找列表项内容：紧跟在 list_item_open 之后的段落
+        next_index = i + 1
+        content_token = EMPTY_INLINE
+        if next_index < block.end and tokens[next_index].type == 'paragraph_open':
+            if tokens[next_index + 1].type == 'inline':
+                content_token = tokens[next_index + 1]
+            next_index = self._block_end(next_index) + 1
+        
+        # 使用任务列表转换器或普通列表转换器
+        if self._is_task_item(content_token) and 'task_list' in self.converters:
+            self.converters['task_list'].convert((list_item, content_token))
+        else:
+            converter.convert((list_item, content_token))
+        
+        return next_index
+    
+    def _handle_fence(self, tokens: List[Token], i: int) -> int:
+        """处理代码块"""
+        converter = self.converters.get('code')
+        if converter:
+            converter.convert(tokens[i])
+        return i + 1
+    
+    def _handle_image(self, tokens: List[Token], i: int) -> int:
+        """处理图片"""
+        converter = self.converters.get('image')
+        if converter:
+            converter.convert((tokens[i], tokens[i]))
+        return i + 1
+    
+    def _handle_hr(self, tokens: List[Token], i: int) -> int:
+        """处理水平线"""
+        converter = self.converters.get('hr')
+        if converter:
+            converter.convert(tokens[i])
+        else:
+            get_body_writer(self.document).add_paragraph('---')
+        return i + 1
+    
+    def _handle_table(self, tokens: List[Token], i: int) -> int:
+        """处理表格"""
+        converter = self.converters.get('table')
+        table_end = self._block_end(i)
+        if not converter or table_end == i:
+            return i + 1
+        
+        # 提取整个表格的tokens
+        table_tokens = tokens[i:table_end + 1]
+        if self.governor is not None:
+            self.governor.add_table_cells(
+                sum(1 for token in table_tokens if token.type in ('td_open', 'th_open')))
+        self.tracer.event('base', "处理表格: {} 个标记", len(table_tokens))
+        converter.convert(tokens[i], table_tokens)
+        return table_end + 1  # 跳过整个表格
+    
+    def _handle_html(self, tokens: List[Token], i: int) -> int:
+        """处理HTML标签"""
+        converter = self.converters.get('html')
+        if converter:
+            token = tokens[i]
+            self.tracer.event('base', "处理HTML标签: {}", token.content)
+            converter.convert(token)
+        return i + 1
+    
+    def _handle_paragraph(self, tokens: List[Token], i: int) -> int:
+        """处理段落"""
+        end = self._block_end(i)
+        converter = self.converters.get('text')
+        if not converter or i + 1 >= end:
+            return i + 1
+        
+        content_token = tokens[i + 1]
+        if content_token.type != 'inline':
+            return i + 1
+        
+        # 引用块内的段落使用引用块转换器
+        quote_stack = self.context.quote_stack
+        if quote_stack and 'blockquote' in self.converters:
+            self.converters['blockquote'].convert(
+                (quote_stack[-1], content_token), level=len(quote_stack))
+            return end + 1
+        
+        # 如果是任务列表项，使用任务列表转换器
+        if self._is_task_item(content_token) and 'task_list' in self.converters:
+            # 作为一级无序列表项处理
+            self.converters['task_list'].convert((ListItem(), content_token))
+        else:
+            converter.convert((tokens[i], content_token))
+        return end + 1
+    
+    @staticmethod
+    def _is_task_item(content_token: Any) -> bool:
+        """检查内容标记是否为任务列表项"""
+        if content_token.type == 'inline' and hasattr(content_token, 'content'):
+            content = content_token.content.strip()
+            return content.startswith('[ ] ') or content.startswith('[x] ')
+        return False
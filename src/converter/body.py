@@ -0,0 +1,164 @@
+"""
+正文写入模块，向文档主体末尾（最后的 sectPr 之前）追加块级元素
+
+python-docx 的 ``document.add_paragraph()`` 和 ``add_table()`` 每次都要在 w:body
+的子元素中线性查找 sectPr 再插入，``document.paragraphs`` 也要遍历整个正文，
+正文有几十万个段落时每个块的开销随文档长度增长。BodyWriter 记住 sectPr
+元素，新块直接插入到它之前，开销与文档长度无关。
+
+新块立即进入正文，不做延迟缓冲：引用块缩进、块缓存录制和性能统计都要在
+转换过程中从正文读取刚生成的块。
+"""
+from typing import Any, Iterable, Optional
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import qn
+from docx.oxml.table import CT_Tbl
+from docx.section import Section
+from docx.shared import Emu, Inches, Length
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from .builder import new_paragraph, new_run
+from .styles import get_style_index
+
+_P = qn('w:p')
+_SECT_PR = qn('w:sectPr')
+
+
+class BodyWriter:
+    """一个文档的正文写入器"""
+
+    def __init__(self, document: Document):
+        """初始化正文写入器
+
+        Args:
+            document: 文档
+        """
+        self._document = document
+        self._body = document.element.body
+        # 段落和表格代理对象的父对象，与 document.add_paragraph() 返回的相同
+        self._parent = document._body
+        self._sect_pr: Optional[Any] = None
+
+    def _anchor(self) -> Optional[Any]:
+        """正文的 sectPr，元素已被移除（例如并行转换的章节文档）时重新查找"""
+        sect_pr = self._sect_pr
+        if sect_pr is None or sect_pr.getparent() is not self._body:
+            body = self._body
+            if len(body) and body[-1].tag == _SECT_PR:
+                sect_pr = body[-1]
+            else:
+                sect_pr = body.find(_SECT_PR)
+            self._sect_pr = sect_pr
+        return sect_pr
+
+    def append(self, element: Any) -> Any:
+        """把块级元素追加到正文末尾
+
+        Args:
+            element: w:p、w:tbl 等块级元素
+
+        Returns:
+            Any: 传入的元素
+        """
+        sect_pr = self._anchor()
+        if sect_pr is not None:
+            sect_pr.addprevious(element)
+        else:
+            self._body.append(element)
+        return element
+
+    def extend(self, elements: Iterable[Any]) -> None:
+        """按顺序追加多个块级元素
+
+        Args:
+            elements: 块级元素
+        """
+        sect_pr = self._anchor()
+        if sect_pr is None:
+            self._body.extend(elements)
+            return
+        for element in elements:
+            sect_pr.addprevious(element)
+
+    def add_paragraph(self, text: str = '', style: Optional[str] = None) -> Paragraph:
+        """在正文末尾添加段落，等价于 ``document.add_paragraph(text, style)``
+
+        Args:
+            text: 段落文本
+            style: 段落样式名称
+
+        Returns:
+            Paragraph: 新段落
+        """
+        style_id = None
+        if style is not None:
+            style_id = get_style_index(self._document).style_id(style, WD_STYLE_TYPE.PARAGRAPH)
+        p = new_paragraph(style_id)
+        if text:
+            p.append(new_run(text))
+        return Paragraph(self.append(p), self._parent)
+
+    def add_table(self, rows: int, cols: int, style: Optional[str] = None) -> Table:
+        """在正文末尾添加表格，等价于 ``document.add_table(rows, cols, style)``
+
+        Args:
+            rows: 行数
+            cols: 列数
+            style: 表格样式名称
+
+        Returns:
+            Table: 新表格
+        """
+        tbl = CT_Tbl.new_tbl(rows, cols, self._block_width())
+        table = Table(self.append(tbl), self._parent)
+        if style is not None:
+            get_style_index(self._document).set_table_style(table, style)
+        else:
+            tbl.tblStyle_val = None
+        return table
+
+    def _block_width(self) -> Length:
+        """最后一节的版心宽度，新表格的列宽按它均分"""
+        sect_pr = self._anchor()
+        if sect_pr is None:
+            return self._document._block_width
+        section = Section(sect_pr, self._document.part)
+        page_width = section.page_width or Inches(8.5)
+        left_margin = section.left_margin or Inches(1)
+        right_margin = section.right_margin or Inches(1)
+        return Emu(page_width - left_margin - right_margin)
+
+    def last_block(self) -> Optional[Any]:
+        """正文中最后一个块级元素（sectPr 之前），正文为空时返回 None"""
+        sect_pr = self._anchor()
+        if sect_pr is not None:
+            return sect_pr.getprevious()
+        return self._body[-1] if len(self._body) else None
+
+    def last_paragraph(self) -> Optional[Paragraph]:
+        """正文中最后一个段落，等价于 ``document.paragraphs[-1]``，没有段落时返回 None"""
+        element = self.last_block()
+        while element is not None and element.tag != _P:
+            element = element.getprevious()
+        return Paragraph(element, self._parent) if element is not None else None
+
+
+def get_body_writer(document: Document) -> BodyWriter:
+    """获取文档的正文写入器，首次调用时创建
+
+    写入器保存在文档部件上，同一个文档的所有 Document 代理对象共享。
+
+    Args:
+        document: 文档
+
+    Returns:
+        BodyWriter: 正文写入器
+    """
+    part = document.part
+    writer = getattr(part, '_body_writer', None)
+    if writer is None:
+        writer = part._body_writer = BodyWriter(document)
+    return writer
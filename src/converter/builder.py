@@ -0,0 +1,166 @@
+"""
+底层元素构建模块，直接生成 w:p、w:r、w:t 元素
+
+``paragraph.add_run(text)`` 之后再设置 ``run.bold``、``run.font.name`` 等属性，
+每一步都要创建代理对象，并用 XPath 查找或插入 rPr 的子元素；写入文本时
+python-docx 还要逐个字符检查制表符和换行。这里的函数直接用 lxml 生成元素：
+
+- 每种格式组合的 rPr 只构建一次作为模板，生成 run 时复制；
+- 不含制表符和换行的文本直接生成一个 w:t。
+
+生成的 XML 与 python-docx 相同。
+"""
+import copy
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from docx.oxml.ns import nsmap, qn
+from docx.oxml.parser import oxml_parser
+
+_W_NSMAP = {'w': nsmap['w']}
+
+_P = qn('w:p')
+_P_PR = qn('w:pPr')
+_P_STYLE = qn('w:pStyle')
+_R = qn('w:r')
+_R_PR = qn('w:rPr')
+_R_STYLE = qn('w:rStyle')
+_T = qn('w:t')
+_TAB = qn('w:tab')
+_BR = qn('w:br')
+_R_FONTS = qn('w:rFonts')
+_B = qn('w:b')
+_I = qn('w:i')
+_STRIKE = qn('w:strike')
+_COLOR = qn('w:color')
+_VAL = qn('w:val')
+_ASCII = qn('w:ascii')
+_H_ANSI = qn('w:hAnsi')
+_XML_SPACE = qn('xml:space')
+
+# 制表符和换行，与 python-docx 相同：\t 生成 w:tab，\r、\n 各生成一个 w:br
+_SPECIAL_CHARS = re.compile(r'([\t\r\n])')
+
+# 格式组合 -> rPr 模板
+_RPR_TEMPLATES: Dict[Tuple[Any, ...], Any] = {}
+
+
+def _element(tag: str) -> Any:
+    return oxml_parser.makeelement(tag, nsmap=_W_NSMAP)
+
+
+def run_properties(bold: bool = False, italic: bool = False, strike: bool = False,
+                   font: Optional[str] = None, color: Optional[str] = None,
+                   style: Optional[str] = None) -> Optional[Any]:
+    """获取格式组合对应的 rPr 模板
+
+    模板在所有 run 之间共享，不能修改，也不能直接插入文档，由 new_run 复制。
+
+    Args:
+        bold: 粗体
+        italic: 斜体
+        strike: 删除线
+        font: 字体名称（w:ascii 和 w:hAnsi）
+        color: 十六进制颜色，如 '333333'
+        style: 字符样式 ID（w:rStyle）
+
+    Returns:
+        Optional[Any]: rPr 模板，没有任何格式时返回 None
+    """
+    key = (bold, italic, strike, font, color, style)
+    try:
+        return _RPR_TEMPLATES[key]
+    except KeyError:
+        pass
+    rpr = None
+    if any(key):
+        # 子元素顺序遵循 CT_RPr 的定义
+        rpr = _element(_R_PR)
+        if style:
+            style_element = _element(_R_STYLE)
+            style_element.set(_VAL, style)
+            rpr.append(style_element)
+        if font:
+            fonts = _element(_R_FONTS)
+            fonts.set(_ASCII, font)
+            fonts.set(_H_ANSI, font)
+            rpr.append(fonts)
+        if bold:
+            rpr.append(_element(_B))
+        if italic:
+            rpr.append(_element(_I))
+        if strike:
+            rpr.append(_element(_STRIKE))
+        if color:
+            color_element = _element(_COLOR)
+            color_element.set(_VAL, color)
+            rpr.append(color_element)
+    _RPR_TEMPLATES[key] = rpr
+    return rpr
+
+
+def _add_t(r: Any, text: str) -> None:
+    t = _element(_T)
+    t.text = text
+    if text[0].isspace() or text[-1].isspace():
+        t.set(_XML_SPACE, 'preserve')
+    r.append(t)
+
+
+def append_text(r: Any, text: str) -> None:
+    """把文本追加到运行元素末尾，等价于 python-docx 写入 run 文本
+
+    Args:
+        r: w:r 元素
+        text: 文本，制表符生成 w:tab，换行生成 w:br
+    """
+    if not text:
+        return
+    if '\t' not in text and '\n' not in text and '\r' not in text:
+        _add_t(r, text)
+        return
+    for part in _SPECIAL_CHARS.split(text):
+        if not part:
+            continue
+        if part == '\t':
+            r.append(_element(_TAB))
+        elif part in '\r\n':
+            r.append(_element(_BR))
+        else:
+            _add_t(r, part)
+
+
+def new_run(text: str = '', rpr: Optional[Any] = None) -> Any:
+    """生成运行元素
+
+    Args:
+        text: 文本
+        rpr: run_properties 返回的 rPr 模板
+
+    Returns:
+        Any: 新的 w:r 元素（CT_R）
+    """
+    r = _element(_R)
+    if rpr is not None:
+        r.append(copy.deepcopy(rpr))
+    append_text(r, text)
+    return r
+
+
+def new_paragraph(style_id: Optional[str] = None) -> Any:
+    """生成段落元素
+
+    Args:
+        style_id: 段落样式 ID，None 表示默认样式
+
+    Returns:
+        Any: 新的 w:p 元素（CT_P）
+    """
+    p = _element(_P)
+    if style_id is not None:
+        ppr = _element(_P_PR)
+        style = _element(_P_STYLE)
+        style.set(_VAL, style_id)
+        ppr.append(style)
+        p.append(ppr)
+    return p
@@ -0,0 +1,264 @@
+"""
+块缓存模块，为增量转换缓存每个顶层块生成的 OOXML 片段
+
+每个顶层块按其标记内容和转换前的转换器状态（列表、编号等上下文）计算指纹。
+命中时直接把缓存的正文元素、新增编号定义、新增样式和关系回放到文档中，
+并恢复转换后的转换器状态，未改动的块无需重新转换。
+"""
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Any, List, Optional, Sequence, Tuple
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from lxml import etree
+from markdown_it.token import Token
+
+from .body import get_body_writer
+from .numbering import add_numbering_definition, count_definitions, definitions_since
+
+# 缓存格式版本，转换器输出变化时递增，使磁盘上的旧缓存失效
+CACHE_VERSION = 5
+
+# 默认最多缓存的块数
+DEFAULT_MAX_ENTRIES = 4096
+
+_R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_R_ATTRS = (f'{{{_R_NS}}}id', f'{{{_R_NS}}}embed', f'{{{_R_NS}}}link')
+
+
+class CachedBlock:
+    """一个顶层块的转换结果"""
+
+    __slots__ = ('elements', 'numbering', 'styles', 'rels', 'state')
+
+    def __init__(self, elements: List[bytes], numbering: List[bytes], styles: List[bytes],
+                 rels: List[Tuple[str, str, Optional[str], Optional[bytes]]], state: Any):
+        # 正文元素 XML（w:p / w:tbl 等）
+        self.elements = elements
+        # 新增的 w:abstractNum / w:num 定义
+        self.numbering = numbering
+        # 新增的 w:style 定义
+        self.styles = styles
+        # 引用的关系：(rId, 关系类型, 外部目标, 图片内容)
+        self.rels = rels
+        # 转换后的转换器状态
+        self.state = state
+
+
+class BlockCache:
+    """按指纹缓存顶层块片段的 LRU 缓存，可选持久化到磁盘
+
+    同一个缓存可以被多个文档、多次转换共享。远程图片按首次转换时的内容缓存，
+    远程内容变化不会使缓存失效。
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[str] = None):
+        """初始化缓存
+
+        Args:
+            max_entries: 最多缓存的块数
+            path: 持久化文件路径，存在时自动加载
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, CachedBlock]' = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedBlock]:
+        """查找缓存的块，命中时移到最近使用的位置"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedBlock) -> None:
+        """缓存块，超过容量时淘汰最久未使用的块"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def load(self, path: Optional[str] = None) -> None:
+        """从磁盘加载缓存，文件损坏或版本不符时忽略
+
+        Args:
+            path: 持久化文件路径，默认为初始化时的路径
+        """
+        path = path or self.path
+        try:
+            with open(path, 'rb') as f:
+                version, entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return
+        if version != CACHE_VERSION:
+            return
+        with self._lock:
+            self._entries = OrderedDict(entries)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """把缓存写入磁盘（先写临时文件再替换，避免留下半个文件）
+
+        Args:
+            path: 持久化文件路径，默认为初始化时的路径
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("未指定缓存文件路径")
+        with self._lock:
+            data = pickle.dumps((CACHE_VERSION, list(self._entries.items())),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def fingerprint(tokens: Sequence[Token], start: int, end: int, context: Any) -> str:
+    """计算顶层块 tokens[start:end] 在给定上下文中的指纹
+
+    Args:
+        tokens: 标记列表
+        start: 起始索引
+        end: 结束索引（不包含）
+        context: 转换前的转换器状态
+
+    Returns:
+        str: 指纹
+    """
+    digest = hashlib.blake2b(repr(context).encode('utf-8'), digest_size=20)
+    for token in tokens[start:end]:
+        digest.update(repr((token.type, token.tag, token.markup, token.info,
+                            token.content, token.attrs, token.level)).encode('utf-8'))
+        if token.children:
+            # 内联内容相同时，引用式链接的目标仍可能不同
+            for child in token.children:
+                if child.attrs:
+                    digest.update(repr((child.type, child.attrs)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class DocumentMark:
+    """记录转换一个块之前文档的位置，用于截取该块新增的内容"""
+
+    __slots__ = ('last', 'numbering', 'styles')
+
+    def __init__(self, document: Document, last: Any):
+        # 块之前的最后一个正文元素
+        self.last = last
+        # 抽象编号定义和编号实例的数量
+        self.numbering = count_definitions(document.part.numbering_part.element)
+        self.styles = len(document.styles.element)
+
+
+def capture(document: Document, mark: DocumentMark, state: Any) -> CachedBlock:
+    """截取自 mark 以来文档新增的内容
+
+    Args:
+        document: 文档
+        mark: 转换前的位置
+        state: 转换后的转换器状态
+
+    Returns:
+        CachedBlock: 块的转换结果
+    """
+    part = document.part
+    body = document.element.body
+    element = mark.last.getnext() if mark.last is not None else (body[0] if len(body) else None)
+    elements = []
+    rels = []
+    r_ids = set()
+    while element is not None and element.tag != qn('w:sectPr'):
+        elements.append(etree.tostring(element))
+        # 记录块内引用的全部关系：同一图片在文档中只保存一份，
+        # 块可能引用由之前的块建立的关系
+        for r_id in element.xpath('.//@r:id | .//@r:embed | .//@r:link'):
+            if r_id in r_ids:
+                continue
+            r_ids.add(r_id)
+            rel = part.rels.get(r_id)
+            if rel is None:
+                continue
+            if rel.is_external:
+                rels.append((r_id, rel.reltype, rel.target_ref, None))
+            elif rel.reltype == RT.IMAGE:
+                rels.append((r_id, rel.reltype, None, rel.target_part.blob))
+        element = element.getnext()
+
+    numbering = [etree.tostring(element)
+                 for element in definitions_since(part.numbering_part.element, mark.numbering)]
+    styles = [etree.tostring(element) for element in document.styles.element[mark.styles:]]
+
+    return CachedBlock(elements, numbering, styles, rels, state)
+
+
+def replay(document: Document, entry: CachedBlock) -> None:
+    """把缓存的块追加到文档末尾
+
+    编号定义和样式按原样添加（指纹已包含编号和样式上下文，ID 与重新转换时一致），
+    抽象编号定义插入到编号实例之前，
+    关系重新建立并改写引用，绘图对象 ID 重新分配。
+
+    Args:
+        document: 文档
+        entry: 缓存的块
+    """
+    part = document.part
+    if entry.numbering:
+        numbering = part.numbering_part.element
+        for xml in entry.numbering:
+            add_numbering_definition(numbering, parse_xml(xml))
+    if entry.styles:
+        styles = document.styles.element
+        for xml in entry.styles:
+            styles.append(parse_xml(xml))
+
+    rel_map = {}
+    for r_id, reltype, target, blob in entry.rels:
+        if blob is not None:
+            rel_map[r_id] = part.get_or_add_image(BytesIO(blob))[0]
+        else:
+            rel_map[r_id] = part.relate_to(target, reltype, is_external=True)
+
+    writer = get_body_writer(document)
+    for xml in entry.elements:
+        element = parse_xml(xml)
+        if rel_map:
+            for child in element.iter():
+                for attr in _R_ATTRS:
+                    value = child.get(attr)
+                    if value in rel_map:
+                        child.set(attr, rel_map[value])
+        doc_prs = list(element.iter(qn('wp:docPr')))
+        if doc_prs:
+            next_id = part.next_id
+            for doc_pr in doc_prs:
+                doc_pr.set('id', str(next_id))
+                next_id += 1
+        writer.append(element)
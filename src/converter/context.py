@@ -0,0 +1,127 @@
+"""
+转换上下文模块，保存一次文档转换的全部可变状态
+
+转换器对象（BaseConverter 和各元素转换器）只保存配置和跨文档的缓存，
+目标文档、块级节点、资源用量、统计以及元素转换器的文档级状态（列表编号、
+上一个块是否为代码块等）都保存在 ConversionContext 中。转换期间上下文通过
+contextvars 绑定到当前线程，同一组转换器可以在多个线程中同时转换不同的文档。
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from docx import Document
+from markdown_it.token import Token
+
+from .ir import Block
+from .limits import Limits, ResourceGovernor
+from .progress import ProgressMonitor
+from .stats import ConversionStats
+
+_current: ContextVar[Optional['ConversionContext']] = ContextVar('conversion_context', default=None)
+
+_MISSING = object()
+
+
+class ConversionContext:
+    """一次文档转换的状态"""
+
+    def __init__(self, document: Document, limits: Optional[Limits] = None):
+        """初始化转换上下文
+
+        Args:
+            document: 目标文档
+            limits: 资源限制，None 表示不限制
+        """
+        # 目标文档
+        self.document = document
+        # 资源用量，每次转换开始时重新计数
+        self.governor = ResourceGovernor(limits) if limits is not None else None
+        # 转换统计
+        self.stats = ConversionStats()
+        # 当前标记流的块级节点：开始标记索引 -> 块级节点
+        self.blocks: Dict[int, Block] = {}
+        # 当前所在的引用块开始标记栈，栈深即引用层级
+        self.quote_stack: List[Token] = []
+        # 进度报告和取消检查，只在 convert 期间存在
+        self.monitor: Optional[ProgressMonitor] = None
+        # 元素转换器的文档级状态：转换器 -> {属性名: 值}
+        self.states: Dict[Any, Dict[str, Any]] = {}
+
+    @contextmanager
+    def activate(self) -> Iterator['ConversionContext']:
+        """在当前线程（或协程）中绑定本上下文，可以嵌套"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+
+def current_context() -> Optional[ConversionContext]:
+    """当前绑定的转换上下文，不在转换中时为 None"""
+    return _current.get()
+
+
+class DocumentState:
+    """元素转换器的文档级属性
+
+    作为类属性声明。转换期间读写的是当前转换上下文中的值，每个文档各有一份，
+    首次访问时用 factory 创建；不在转换中（例如单独使用元素转换器）时读写实例自身的值。
+
+    Example:
+        class ListConverter(ElementConverter):
+            _current_lists = DocumentState(list)
+    """
+
+    def __init__(self, factory: Callable[[], Any] = lambda: None):
+        """初始化属性
+
+        Args:
+            factory: 创建初始值的函数
+        """
+        self.factory = factory
+        self.name = ''
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def _store(self, obj: Any) -> Dict[str, Any]:
+        context = _current.get()
+        if context is None:
+            return obj.__dict__
+        store = context.states.get(obj)
+        if store is None:
+            store = context.states[obj] = {}
+        return store
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        store = self._store(obj)
+        value = store.get(self.name, _MISSING)
+        if value is _MISSING:
+            value = store[self.name] = self.factory()
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self._store(obj)[self.name] = value
+
+
+class ContextDocument:
+    """元素转换器的 document 属性
+
+    转换期间返回当前转换上下文的目标文档；否则返回 set_document 设置的文档。
+    赋值总是设置后者。
+    """
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        context = _current.get()
+        if context is not None:
+            return context.document
+        return obj.__dict__.get('document')
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__['document'] = value
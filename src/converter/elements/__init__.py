@@ -1,18 +1,39 @@
 """
 元素转换器模块
 """
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import ElementConverter
-from .heading import HeadingConverter
-from .text import TextConverter
-from .blockquote import BlockquoteConverter
-from .list import ListConverter
-from .code import CodeConverter
-from .links import LinkConverter
-from .image import ImageConverter
-from .table import TableConverter
-from .hr import HRConverter
-from .task_list import TaskListConverter
-from .html import HtmlConverter
+
+if TYPE_CHECKING:
+    # 运行时不执行；静态导入让 PyInstaller 等打包工具和类型检查器发现各转换器模块
+    from .heading import HeadingConverter
+    from .text import TextConverter
+    from .blockquote import BlockquoteConverter
+    from .list import ListConverter
+    from .code import CodeConverter
+    from .links import LinkConverter
+    from .image import ImageConverter
+    from .table import TableConverter
+    from .hr import HRConverter
+    from .task_list import TaskListConverter
+    from .html import HtmlConverter
+
+# 转换器类名 -> 模块名：按需导入，导入包本身不会加载各转换器及其依赖
+_MODULES = {
+    'HeadingConverter': '.heading',
+    'TextConverter': '.text',
+    'BlockquoteConverter': '.blockquote',
+    'ListConverter': '.list',
+    'CodeConverter': '.code',
+    'LinkConverter': '.links',
+    'ImageConverter': '.image',
+    'TableConverter': '.table',
+    'HRConverter': '.hr',
+    'TaskListConverter': '.task_list',
+    'HtmlConverter': '.html',
+}
 
 __all__ = [
     'ElementConverter',
@@ -27,4 +48,14 @@ __all__ = [
     'HRConverter',
     'TaskListConverter',
     'HtmlConverter'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """首次访问转换器类时导入对应模块"""
+    module_name = _MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -4,9 +4,27 @@
 from typing import Any, Optional
 from docx import Document
 
+from ..body import BodyWriter, get_body_writer
+from ..context import ContextDocument
+from ..inline import render_inline
+from ..runs import PLAIN, RunFormat
+from ..stats import ConversionStats
+from ..styles import StyleIndex, get_style_index
+
 
 class ElementConverter:
-    """元素转换器基类"""
+    """元素转换器基类
+    
+    转换器实例可以被多个线程中的转换同时使用：目标文档在转换期间取自当前的
+    转换上下文，文档级的可变状态应声明为 DocumentState 类属性，不要直接
+    保存在实例上。
+    """
+    
+    # 跟踪事件的来源名称，注册到基础转换器时设置为元素类型
+    trace_source: Optional[str] = None
+    
+    # 目标文档：转换期间为当前转换上下文的文档，否则为 set_document 设置的文档
+    document = ContextDocument()
     
     def __init__(self, base_converter=None):
         """初始化元素转换器
@@ -14,7 +32,7 @@ class ElementConverter:
         Args:
             base_converter: 基础转换器实例
         """
-        self.document: Optional[Document] = None
+        self.document = None
         self.base_converter = base_converter
     
     def set_document(self, document: Document) -> None:
@@ -25,6 +43,105 @@ class ElementConverter:
         """
         self.document = document
     
+    def prepare_document(self, document: Document) -> None:
+        """在文档上预先创建本转换器需要的样式
+        
+        构建模板缓存时对模板文档调用一次，之后从模板克隆的文档都自带这些样式。
+        默认不做任何事，需要自定义样式的子类覆盖此方法。
+        
+        Args:
+            document: DOCX 文档实例
+        """
+        pass
+    
+    def reset(self) -> None:
+        """清除与单个文档相关的状态
+        
+        转换器被复用于下一个文档前调用。默认不做任何事，带有文档级状态的
+        子类覆盖此方法；跨文档有效的缓存（如图片数据）应有意保留。
+        """
+        pass
+    
+    @property
+    def body(self) -> BodyWriter:
+        """当前文档的正文写入器，添加段落和表格时使用，避免每次查找 sectPr"""
+        return get_body_writer(self.document)
+    
+    @property
+    def styles(self) -> StyleIndex:
+        """当前文档的样式索引，按名称查找和应用样式时使用，避免线性扫描 styles.xml"""
+        return get_style_index(self.document)
+    
+    @property
+    def stats(self) -> Optional[ConversionStats]:
+        """当前转换的统计，没有基础转换器时为 None"""
+        return getattr(self.base_converter, 'stats', None)
+    
+    def add_inline(self, paragraph: Any, content_token: Any, base_format: RunFormat = PLAIN) -> None:
+        """用行内渲染引擎把 inline 标记的内容追加到段落
+        
+        链接和图片交给基础转换器中注册的链接、图片转换器。
+        
+        Args:
+            paragraph: 目标段落
+            content_token: inline 标记
+            base_format: 基础格式
+        """
+        render_inline(paragraph, content_token.children,
+                      getattr(self.base_converter, 'converters', None), base_format)
+    
+    @property
+    def tracing(self) -> bool:
+        """是否记录本转换器的跟踪事件，用于在构造昂贵的参数前提前判断"""
+        tracer = getattr(self.base_converter, 'tracer', None)
+        return tracer is not None and tracer.enabled_for(self.trace_source or type(self).__name__)
+    
+    def trace(self, message: str, *args: Any) -> None:
+        """记录一条跟踪事件，格式化推迟到输出时
+        
+        Args:
+            message: str.format 风格的格式字符串
+            *args: 格式化参数
+        """
+        tracer = getattr(self.base_converter, 'tracer', None)
+        if tracer is not None and tracer.enabled:
+            tracer.event(self.trace_source or type(self).__name__, message, *args)
+    
+    def warn(self, message: str, *args: Any) -> None:
+        """记录一条警告到转换统计，同时记录为跟踪事件
+        
+        用于转换器容错处理、但输出可能与输入不一致的情况，例如图片获取失败。
+        
+        Args:
+            message: str.format 风格的格式字符串
+            *args: 格式化参数
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.add_warning(self.trace_source or type(self).__name__,
+                              message.format(*args) if args else message)
+        self.trace(message, *args)
+    
+    def get_state(self) -> Any:
+        """获取影响后续转换输出的跨块状态快照
+        
+        增量转换用它区分相同内容在不同上下文中的转换结果，并在复用缓存的
+        块之后恢复状态。返回值必须可以 pickle，且不与转换器共享可变对象。
+        默认返回 None，表示转换器没有跨块状态。
+        
+        Returns:
+            Any: 状态快照
+        """
+        return None
+    
+    def set_state(self, state: Any) -> None:
+        """恢复 get_state 返回的状态快照
+        
+        Args:
+            state: 状态快照
+        """
+        pass
+    
     def convert(self, element: Any) -> Any:
         """转换元素（需要子类实现）
         
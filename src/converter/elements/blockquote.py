@@ -2,23 +2,32 @@
 引用块转换器模块，处理引用块的转换
 """
 from typing import Any, Optional, Tuple
-from docx.shared import Pt, RGBColor
+from docx.shared import Emu, Pt, RGBColor
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from .base import ElementConverter
+from ..styles import get_style_index
 
 
 class BlockquoteConverter(ElementConverter):
     """处理引用块的转换器"""
     
+    # 每一层引用的左缩进（磅）
+    INDENT_PER_LEVEL = 30
+    # 模板中预先创建样式的引用层级数
+    PREBUILT_LEVELS = 3
+    
     def __init__(self, base_converter=None):
         super().__init__(base_converter)
     
-    def convert(self, tokens: Tuple[Any, Any]) -> None:
+    def convert(self, tokens: Tuple[Any, Any], level: Optional[int] = None) -> None:
         """转换引用块元素
         
         Args:
             tokens: (开始标记, 内容标记) 的元组
+            level: 引用层级，未提供时根据开始标记的 markup 推断
         """
         if not self.document:
             raise ValueError("Document not set")
@@ -26,87 +35,83 @@ class BlockquoteConverter(ElementConverter):
         quote_token, content_token = tokens
         
         # 获取引用块层级
-        level = len(quote_token.markup) if hasattr(quote_token, 'markup') else 1
+        if level is None:
+            level = len(quote_token.markup) if hasattr(quote_token, 'markup') else 1
         
         # 创建或获取引用块样式
         style_name = "Quote" if level == 1 else f"Quote{level}"
         self._ensure_quote_style(style_name, level)
         
         # 创建新段落
-        paragraph = self.document.add_paragraph()
-        paragraph.style = self.document.styles[style_name]
+        paragraph = self.body.add_paragraph()
+        self.styles.set_paragraph_style(paragraph, style_name)
         
         # 处理空引用块
         if not content_token:
             paragraph.add_run("")
             return
         
-        # 处理引用块内容
-        current_text = ""
-        current_style = {"bold": False, "italic": False, "strike": False}
-        
-        for child in content_token.children:
-            if child.type == 'text':
-                # 处理多行文本中的空格
-                text = child.content.replace('\n', ' ')
-                if text.endswith(' '):
-                    text = text[:-1]
-                current_text += text
-            elif child.type == 'strong_open':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["bold"] = True
-            elif child.type == 'strong_close':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["bold"] = False
-            elif child.type == 'em_open':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["italic"] = True
-            elif child.type == 'em_close':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["italic"] = False
-            elif child.type == 'softbreak':
-                current_text += " "
-        
-        # 添加剩余的文本
-        if current_text:
-            self._add_text_with_style(paragraph, current_text, current_style)
+        # 处理引用块内的文本、样式、链接和图片
+        self.add_inline(paragraph, content_token)
     
-    def _add_text_with_style(self, paragraph, text: str, style: dict) -> None:
-        """添加带样式的文本
-        
-        Args:
-            paragraph: 段落对象
-            text: 要添加的文本
-            style: 样式配置
-        """
-        run = paragraph.add_run(text)
-        run.bold = style["bold"]
-        run.italic = style["italic"]
+    def prepare_document(self, document) -> None:
+        """预先创建常用层级的引用块样式"""
+        for level in range(1, self.PREBUILT_LEVELS + 1):
+            style_name = "Quote" if level == 1 else f"Quote{level}"
+            self._ensure_quote_style(style_name, level, document)
     
-    def _ensure_quote_style(self, style_name: str, level: int) -> None:
+    def _ensure_quote_style(self, style_name: str, level: int, document=None) -> None:
         """确保引用块样式存在
         
         Args:
             style_name: 样式名称
             level: 引用块层级
+            document: 目标文档，默认为当前文档
         """
-        if style_name not in self.document.styles:
-            style = self.document.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+        styles = get_style_index(document or self.document)
+        if style_name not in styles:
+            style = styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
             # 设置基本样式
             style.font.size = Pt(12)
             style.font.color.rgb = RGBColor(102, 102, 102)  # 灰色
             # 根据层级设置左缩进
-            style.paragraph_format.left_indent = Pt(30 * level)
+            style.paragraph_format.left_indent = Pt(self.INDENT_PER_LEVEL * level)
             # 设置段落间距
             style.paragraph_format.space_before = Pt(6)
             style.paragraph_format.space_after = Pt(6)
             # 设置对齐方式
-            style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.LEFT 
\ No newline at end of file
+            style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.LEFT 
+    
+    def indent_block(self, element: Any, level: int) -> None:
+        """为引用块内由其他转换器生成的块级元素补上引用缩进
+        
+        已带缩进的元素（引用段落、内层引用已处理过的元素）保持不变。
+        
+        Args:
+            element: 块级元素（w:p 或 w:tbl）
+            level: 引用层级
+        """
+        indent = Pt(self.INDENT_PER_LEVEL * level)
+        if element.tag == qn('w:p'):
+            pPr = element.get_or_add_pPr()
+            if pPr.ind is not None:
+                return
+            style_id = pPr.pStyle.val if pPr.pStyle is not None else None
+            if style_id and style_id.startswith('Quote'):
+                return
+            # 保留段落样式自身的左缩进（如列表、代码块）
+            style_indent = 0
+            if style_id:
+                style = self.styles.get_by_id(style_id)
+                if style is not None and style.pPr is not None and style.pPr.ind_left is not None:
+                    style_indent = style.pPr.ind_left
+            pPr.ind_left = Emu(indent + style_indent)
+        elif element.tag == qn('w:tbl'):
+            tblPr = element.tblPr
+            if tblPr.find(qn('w:tblInd')) is not None:
+                return
+            tbl_ind = OxmlElement('w:tblInd')
+            tbl_ind.set(qn('w:w'), str(indent.twips))
+            tbl_ind.set(qn('w:type'), 'dxa')
+            tblPr.insert_element_before(
+                tbl_ind, 'w:tblBorders', 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook')
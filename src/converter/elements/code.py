@@ -1,11 +1,18 @@
-from docx.shared import RGBColor, Pt
+from docx.shared import Pt, RGBColor
 from docx.enum.style import WD_STYLE_TYPE
 from .base import ElementConverter
+from ..builder import new_run, run_properties
+from ..runs import CODE_COLOR, CODE_FONT, CODE_STYLE
+from ..context import DocumentState
+from ..styles import get_style_index
 
 
 class CodeConverter(ElementConverter):
     """代码块转换器"""
 
+    # 上一个块是否为代码块
+    _last_was_code = DocumentState(bool)
+
     def __init__(self, base_converter=None):
         super().__init__(base_converter)
         self.document = None
@@ -17,16 +24,37 @@ class CodeConverter(ElementConverter):
             
         self.document = document
         # 创建代码样式
-        if 'Code' not in self.document.styles:
-            style = self.document.styles.add_style('Code', WD_STYLE_TYPE.PARAGRAPH)
+        self.prepare_document(document)
+
+    def reset(self):
+        """清除上一个文档的代码块状态"""
+        self._last_was_code = False
+
+    def get_state(self):
+        """上一个块是否为代码块，决定是否插入空行"""
+        return self._last_was_code
+
+    def set_state(self, state):
+        self._last_was_code = state
+
+    def prepare_document(self, document):
+        """创建代码段落样式和代码字符样式"""
+        styles = get_style_index(document)
+        if 'Code' not in styles:
+            style = styles.add_style('Code', WD_STYLE_TYPE.PARAGRAPH)
             font = style.font
-            font.name = 'Consolas'  # 使用等宽字体
+            font.name = CODE_FONT  # 使用等宽字体
             font.size = Pt(10)
             # 设置段落格式
             style.paragraph_format.space_before = Pt(10)
             style.paragraph_format.space_after = Pt(10)
             style.paragraph_format.left_indent = Pt(32)  # 约0.5英寸
             style.paragraph_format.right_indent = Pt(32)  # 约0.5英寸
+        if CODE_STYLE not in styles:
+            # 代码块的每一行和行内代码引用此样式，不再逐个 run 设置字体和颜色
+            style = styles.add_style(CODE_STYLE, WD_STYLE_TYPE.CHARACTER)
+            style.font.name = CODE_FONT
+            style.font.color.rgb = RGBColor.from_string(CODE_COLOR)  # 深灰色
 
     def convert(self, token):
         """转换代码块
@@ -39,11 +67,11 @@ class CodeConverter(ElementConverter):
 
         # 如果上一个是代码块，添加空行
         if self._last_was_code:
-            self.document.add_paragraph()
+            self.body.add_paragraph()
 
         # 创建新段落
-        paragraph = self.document.add_paragraph()
-        paragraph.style = 'Code'
+        paragraph = self.body.add_paragraph()
+        self.styles.set_paragraph_style(paragraph, 'Code')
 
         # 获取代码内容
         code = token.content if hasattr(token, 'content') else ''
@@ -56,13 +84,13 @@ class CodeConverter(ElementConverter):
         # 分割并处理每一行，去掉末尾的空行
         lines = code.rstrip('\n').splitlines()
         
-        # 添加代码内容
+        # 添加代码内容，每行一个引用代码字符样式的 run，行之间用换行 run 分隔
+        p = paragraph._p
+        rpr = run_properties(style=self.styles.style_id(CODE_STYLE, WD_STYLE_TYPE.CHARACTER))
         for i, line in enumerate(lines):
             if i > 0:  # 不是第一行，添加换行符
-                paragraph.add_run('\n')
-            run = paragraph.add_run(line)
-            run.font.name = 'Consolas'
-            run.font.color.rgb = RGBColor(51, 51, 51)  # 深灰色
+                p.append(new_run('\n'))
+            p.append(new_run(line, rpr))
 
         # 更新状态
         self._last_was_code = True 
\ No newline at end of file
@@ -5,6 +5,7 @@ from typing import Any, Dict, Tuple
 from docx.shared import Pt
 from docx.enum.style import WD_STYLE_TYPE
 from .base import ElementConverter
+from ..styles import get_style_index
 
 
 class HeadingConverter(ElementConverter):
@@ -23,6 +24,25 @@ class HeadingConverter(ElementConverter):
     def __init__(self, base_converter=None):
         super().__init__(base_converter)
     
+    def set_document(self, document) -> None:
+        self.document = document
+        # 设置标题样式
+        self.prepare_document(document)
+    
+    def prepare_document(self, document) -> None:
+        """把字号和粗体写入各级标题样式，标题中的 run 不再逐个设置"""
+        styles = get_style_index(document)
+        for style_config in self.HEADING_STYLES.values():
+            style = styles.get(style_config["name"])
+            if style is None:
+                style = styles.add_style(style_config["name"], WD_STYLE_TYPE.PARAGRAPH, builtin=True)
+            font = style.font
+            size = Pt(style_config["size"])
+            if font.size != size:
+                font.size = size
+            if font.bold != style_config["bold"]:
+                font.bold = style_config["bold"]
+    
     def convert(self, tokens: Tuple[Any, Any]) -> None:
         """转换标题元素
         
@@ -40,16 +60,10 @@ class HeadingConverter(ElementConverter):
         if level not in self.HEADING_STYLES:
             raise ValueError(f"不支持的标题级别: {level}")
             
-        # 获取标题文本
-        text = content_token.content
-        
-        # 添加标题段落
-        paragraph = self.document.add_paragraph()
-        paragraph.style = self.document.styles[self.HEADING_STYLES[level]["name"]]
-        run = paragraph.add_run(text)
-        
-        # 应用样式
-        font = run.font
-        style = self.HEADING_STYLES[level]
-        font.size = Pt(style["size"])
-        font.bold = style["bold"] 
\ No newline at end of file
+        # 添加标题段落，字号和粗体来自标题样式
+        paragraph = self.body.add_paragraph()
+        self.styles.set_paragraph_style(paragraph, self.HEADING_STYLES[level]["name"])
+        if getattr(content_token, 'children', None):
+            self.add_inline(paragraph, content_token)
+        else:
+            paragraph.add_run(content_token.content)
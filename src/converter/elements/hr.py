@@ -35,11 +35,11 @@ class HRConverter(ElementConverter):
         if not self.document:
             raise ValueError("Document not set for HRConverter")
         
-        if self.debug:
-            print(f"处理分隔线: {token}")
+        if self.tracing:
+            self.trace("处理分隔线: {}", getattr(token, 'markup', ''))
         
         # 创建一个空段落
-        paragraph = self.document.add_paragraph()
+        paragraph = self.body.add_paragraph()
         paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
         
         # 添加水平线
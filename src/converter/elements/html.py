@@ -1,7 +1,7 @@
 """
 HTML转换器模块，处理Markdown中的HTML标签
 """
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 import os
 import tempfile
 import re
@@ -11,13 +11,18 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.shared import Pt, RGBColor
 
-try:
-    import html2docx
-    HTML2DOCX_AVAILABLE = True
-except ImportError:
-    HTML2DOCX_AVAILABLE = False
+from importlib.util import find_spec
 
 from .base import ElementConverter
+from ..lazy import LazyModule
+
+# html2docx 是可选依赖：只检查是否安装，真正用到时再导入
+HTML2DOCX_AVAILABLE = find_spec('html2docx') is not None
+if TYPE_CHECKING:
+    # 运行时不执行；静态导入让 PyInstaller 等打包工具发现并打包这个可选依赖
+    import html2docx
+else:
+    html2docx = LazyModule('html2docx')
 
 
 class HtmlConverter(ElementConverter):
@@ -46,35 +51,36 @@ class HtmlConverter(ElementConverter):
         if not self.document:
             raise ValueError("Document not set for HtmlConverter")
         
-        if self.debug:
-            print(f"处理HTML标签: {token.content if hasattr(token, 'content') else ''}")
+        if self.tracing:
+            self.trace("处理HTML标签: {}", token.content if hasattr(token, 'content') else '')
         
         # 获取HTML内容
         html_content = ""
         if hasattr(token, 'content'):
             html_content = token.content
         elif hasattr(token, 'children'):
-            for child in token.children:
-                if hasattr(child, 'content'):
-                    html_content += child.content
+            html_content = "".join(child.content for child in token.children if hasattr(child, 'content'))
         
         if not html_content:
-            if self.debug:
-                print("HTML内容为空")
+            if self.tracing:
+                self.trace("HTML内容为空")
             return None
         
         # 首先尝试使用自定义解析方法
         result = self._custom_html_convert(html_content)
         if result:
-            if self.debug:
-                print("使用自定义HTML解析成功")
+            if self.tracing:
+                self.trace("使用自定义HTML解析成功")
             return result
         
         # 如果自定义解析失败，尝试使用html2docx
         if HTML2DOCX_AVAILABLE:
+            stats = self.stats
+            if stats is not None:
+                stats.add_fallback('html2docx')
             try:
-                if self.debug:
-                    print("尝试使用html2docx转换")
+                if self.tracing:
+                    self.trace("尝试使用html2docx转换")
                 
                 # 创建完整的HTML文档
                 full_html = f"""
@@ -101,9 +107,9 @@ class HtmlConverter(ElementConverter):
                     f.write(full_html)
                     temp_html_path = f.name
                 
-                if self.debug:
-                    print(f"创建临时HTML文件: {temp_html_path}")
-                    print(f"HTML内容: {full_html[:100]}...")
+                if self.tracing:
+                    self.trace("创建临时HTML文件: {}", temp_html_path)
+                    self.trace("HTML内容: {}...", full_html[:100])
                 
                 # 创建临时DOCX文件路径
                 temp_docx_path = temp_html_path.replace('.html', '.docx')
@@ -111,25 +117,25 @@ class HtmlConverter(ElementConverter):
                 # 使用html2docx转换
                 html2docx.convert(temp_html_path, temp_docx_path)
                 
-                if self.debug:
-                    print(f"转换完成，临时DOCX文件: {temp_docx_path}")
+                if self.tracing:
+                    self.trace("转换完成，临时DOCX文件: {}", temp_docx_path)
                     if os.path.exists(temp_docx_path):
-                        print(f"临时DOCX文件大小: {os.path.getsize(temp_docx_path)} 字节")
+                        self.trace("临时DOCX文件大小: {} 字节", os.path.getsize(temp_docx_path))
                     else:
-                        print("临时DOCX文件不存在")
+                        self.trace("临时DOCX文件不存在")
                 
                 # 打开生成的DOCX文件
                 temp_doc = Document(temp_docx_path)
                 
-                if self.debug:
-                    print(f"临时文档包含 {len(temp_doc.paragraphs)} 个段落")
+                if self.tracing:
+                    self.trace("临时文档包含 {} 个段落", len(temp_doc.paragraphs))
                 
                 # 将临时文档的内容复制到当前文档
                 for paragraph in temp_doc.paragraphs:
                     if not paragraph.text.strip():
                         continue  # 跳过空段落
                         
-                    p = self.document.add_paragraph()
+                    p = self.body.add_paragraph()
                     for run in paragraph.runs:
                         r = p.add_run(run.text)
                         r.bold = run.bold
@@ -139,11 +145,11 @@ class HtmlConverter(ElementConverter):
                 
                 # 复制表格
                 for table in temp_doc.tables:
-                    if self.debug:
-                        print(f"复制表格: {len(table.rows)}行 x {len(table.columns)}列")
+                    if self.tracing:
+                        self.trace("复制表格: {}行 x {}列", len(table.rows), len(table.columns))
                     
-                    new_table = self.document.add_table(rows=len(table.rows), cols=len(table.columns))
-                    new_table.style = 'Table Grid'
+                    new_table = self.body.add_table(rows=len(table.rows), cols=len(table.columns))
+                    self.styles.set_table_style(new_table, 'Table Grid')
                     
                     # 复制单元格内容
                     for i, row in enumerate(table.rows):
@@ -155,27 +161,26 @@ class HtmlConverter(ElementConverter):
                 try:
                     os.remove(temp_html_path)
                     os.remove(temp_docx_path)
-                    if self.debug:
-                        print("临时文件已清理")
+                    if self.tracing:
+                        self.trace("临时文件已清理")
                 except Exception as e:
-                    if self.debug:
-                        print(f"清理临时文件失败: {e}")
+                    if self.tracing:
+                        self.trace("清理临时文件失败: {}", e)
                 
-                if self.debug:
-                    print(f"HTML转换完成，添加了{len(temp_doc.paragraphs)}个段落和{len(temp_doc.tables)}个表格")
+                if self.tracing:
+                    self.trace("HTML转换完成，添加了{}个段落和{}个表格", len(temp_doc.paragraphs), len(temp_doc.tables))
                 
                 # 返回最后一个添加的段落
-                return self.document.paragraphs[-1] if self.document.paragraphs else None
+                return self.body.last_paragraph()
                 
             except Exception as e:
-                if self.debug:
-                    print(f"HTML转换失败: {e}")
+                self.warn("html2docx 转换失败，按纯文本输出: {}", e)
                 # 失败时回退到基本转换
                 return self._fallback_convert(html_content)
         else:
             # html2docx不可用时回退到基本转换
-            if self.debug:
-                print("html2docx不可用，使用基本转换")
+            if self.tracing:
+                self.trace("html2docx不可用，使用基本转换")
             return self._fallback_convert(html_content)
     
     def _custom_html_convert(self, html_content: str) -> Optional[Paragraph]:
@@ -188,33 +193,33 @@ class HtmlConverter(ElementConverter):
             Optional[Paragraph]: 创建的段落，如果无法解析则返回None
         """
         try:
-            if self.debug:
-                print("使用自定义HTML解析")
+            if self.tracing:
+                self.trace("使用自定义HTML解析")
             
             # 简单的HTML标签解析
             # 处理简单的HTML段落
             if re.match(r'^\s*<p>(.*?)</p>\s*$', html_content, re.DOTALL):
                 content = re.sub(r'^\s*<p>(.*?)</p>\s*$', r'\1', html_content, flags=re.DOTALL)
-                paragraph = self.document.add_paragraph()
+                paragraph = self.body.add_paragraph()
                 
                 # 处理内部标签
                 content = self._process_inline_tags(content, paragraph)
                 
-                if self.debug:
-                    print(f"解析段落: {content}")
+                if self.tracing:
+                    self.trace("解析段落: {}", content)
                 
                 return paragraph
             
             # 处理简单的div
             if re.match(r'^\s*<div[^>]*>(.*?)</div>\s*$', html_content, re.DOTALL):
                 content = re.sub(r'^\s*<div[^>]*>(.*?)</div>\s*$', r'\1', html_content, flags=re.DOTALL)
-                paragraph = self.document.add_paragraph()
+                paragraph = self.body.add_paragraph()
                 
                 # 处理内部标签
                 content = self._process_inline_tags(content, paragraph)
                 
-                if self.debug:
-                    print(f"解析div: {content}")
+                if self.tracing:
+                    self.trace("解析div: {}", content)
                 
                 return paragraph
             
@@ -223,28 +228,30 @@ class HtmlConverter(ElementConverter):
                 list_content = re.sub(r'^\s*<ul[^>]*>(.*?)</ul>\s*$', r'\1', html_content, flags=re.DOTALL)
                 list_items = re.findall(r'<li[^>]*>(.*?)</li>', list_content, re.DOTALL)
                 
-                if self.debug:
-                    print(f"解析无序列表: {len(list_items)}项")
+                if self.tracing:
+                    self.trace("解析无序列表: {}项", len(list_items))
                 
                 for item in list_items:
-                    paragraph = self.document.add_paragraph(style='List Bullet')
+                    paragraph = self.body.add_paragraph()
+                    self.styles.set_paragraph_style(paragraph, 'List Bullet')
                     self._process_inline_tags(item, paragraph)
                 
-                return self.document.paragraphs[-1] if self.document.paragraphs else None
+                return self.body.last_paragraph()
             
             # 处理简单的有序列表
             if re.match(r'^\s*<ol[^>]*>(.*?)</ol>\s*$', html_content, re.DOTALL):
                 list_content = re.sub(r'^\s*<ol[^>]*>(.*?)</ol>\s*$', r'\1', html_content, flags=re.DOTALL)
                 list_items = re.findall(r'<li[^>]*>(.*?)</li>', list_content, re.DOTALL)
                 
-                if self.debug:
-                    print(f"解析有序列表: {len(list_items)}项")
+                if self.tracing:
+                    self.trace("解析有序列表: {}项", len(list_items))
                 
                 for item in list_items:
-                    paragraph = self.document.add_paragraph(style='List Number')
+                    paragraph = self.body.add_paragraph()
+                    self.styles.set_paragraph_style(paragraph, 'List Number')
                     self._process_inline_tags(item, paragraph)
                 
-                return self.document.paragraphs[-1] if self.document.paragraphs else None
+                return self.body.last_paragraph()
             
             # 处理简单的表格
             if re.match(r'^\s*<table[^>]*>(.*?)</table>\s*$', html_content, re.DOTALL):
@@ -256,8 +263,8 @@ class HtmlConverter(ElementConverter):
                 if not rows:
                     return None
                 
-                if self.debug:
-                    print(f"解析表格: {len(rows)}行")
+                if self.tracing:
+                    self.trace("解析表格: {}行", len(rows))
                 
                 # 计算列数
                 first_row = rows[0]
@@ -269,8 +276,8 @@ class HtmlConverter(ElementConverter):
                     return None
                 
                 # 创建表格
-                table = self.document.add_table(rows=len(rows), cols=cols)
-                table.style = 'Table Grid'
+                table = self.body.add_table(rows=len(rows), cols=cols)
+                self.styles.set_table_style(table, 'Table Grid')
                 
                 # 填充表格内容
                 for i, row_html in enumerate(rows):
@@ -288,13 +295,12 @@ class HtmlConverter(ElementConverter):
                             table.cell(i, j).text = clean_content.strip()
                 
                 # 添加一个空段落，以便返回
-                return self.document.add_paragraph()
+                return self.body.add_paragraph()
             
             # 无法解析，返回None
             return None
         except Exception as e:
-            if self.debug:
-                print(f"错误: 自定义HTML解析失败: {e}")
+            self.warn("自定义HTML解析失败: {}", e)
             return None
     
     def _process_inline_tags(self, content: str, paragraph: Paragraph) -> str:
@@ -386,19 +392,18 @@ class HtmlConverter(ElementConverter):
                             # 方法1：使用font属性
                             run.font.strike = True
                         except Exception as e:
-                            if self.debug:
-                                print(f"无法设置删除线(方法1): {e}")
+                            if self.tracing:
+                                self.trace("无法设置删除线(方法1): {}", e)
                             try:
                                 # 方法2：使用XML元素
                                 run._element.get_or_add_rPr().set(qn('w:strike'), 'true')
                             except Exception as e:
-                                if self.debug:
-                                    print(f"无法设置删除线(方法2): {e}")
+                                if self.tracing:
+                                    self.trace("无法设置删除线(方法2): {}", e)
             
             return content
         except Exception as e:
-            if self.debug:
-                print(f"错误: 处理内联标签失败: {e}")
+            self.warn("处理内联HTML标签失败，按纯文本输出: {}", e)
             # 简单处理，直接添加纯文本
             clean_text = re.sub(r'<[^>]*>', ' ', content)
             paragraph.add_run(clean_text.strip())
@@ -413,11 +418,14 @@ class HtmlConverter(ElementConverter):
         Returns:
             Paragraph: 创建的段落
         """
-        if self.debug:
-            print("使用基本HTML转换")
+        if self.tracing:
+            self.trace("使用基本HTML转换")
+        stats = self.stats
+        if stats is not None:
+            stats.add_fallback('html_text')
         
         # 创建新段落
-        paragraph = self.document.add_paragraph()
+        paragraph = self.body.add_paragraph()
         
         # 简单处理一些基本HTML标签
         # 这里只是一个非常基础的实现，无法处理复杂的HTML
@@ -3,12 +3,84 @@
 """
 import os
 import re
-import requests
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from io import BytesIO
-from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from .base import ElementConverter
+from ..errors import LimitExceededError
+from ..lazy import LazyModule
+
+# requests 导入较慢，只有在线图片才需要，首次下载时再导入
+if TYPE_CHECKING:
+    # 运行时不执行；静态导入让 PyInstaller 等打包工具发现并打包 requests
+    import requests
+else:
+    requests = LazyModule('requests')
+
+# 图片缓存默认最多保留的图片数和总字节数
+DEFAULT_IMAGE_CACHE_ENTRIES = 256
+DEFAULT_IMAGE_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class ImageCache(MutableMapping):
+    """图片路径或 URL -> 图片内容的 LRU 缓存，限制图片数和总字节数
+
+    转换器实例可能被多个线程（例如服务端的各个请求）共享，读写都在锁内进行；
+    超过任一限制时淘汰最久未使用的图片，单张超过总字节数的图片不缓存。
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_IMAGE_CACHE_ENTRIES,
+                 max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES):
+        """初始化缓存
+
+        Args:
+            max_entries: 最多缓存的图片数
+            max_bytes: 缓存图片的最大总字节数
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, src: str) -> bytes:
+        with self._lock:
+            data = self._entries[src]
+            self._entries.move_to_end(src)
+            return data
+
+    def __setitem__(self, src: str, data: bytes) -> None:
+        with self._lock:
+            old = self._entries.pop(src, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            if len(data) > self.max_bytes:
+                return
+            self._entries[src] = data
+            self.total_bytes += len(data)
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def __delitem__(self, src: str) -> None:
+        with self._lock:
+            self.total_bytes -= len(self._entries.pop(src))
+
+    def __contains__(self, src: object) -> bool:
+        # 只检查，不改变使用顺序
+        with self._lock:
+            return src in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class ImageConverter(ElementConverter):
@@ -17,8 +89,8 @@ class ImageConverter(ElementConverter):
     def __init__(self, base_converter=None):
         super().__init__(base_converter)
         self.document = None
-        # 图片缓存，避免重复下载
-        self._image_cache = {}
+        # 图片缓存，避免重复下载；跨文档保留，reset 时不清空，大小有上限
+        self._image_cache = ImageCache()
 
     def convert(self, tokens: Tuple[Any, Any]) -> None:
         """转换图片元素
@@ -47,17 +119,17 @@ class ImageConverter(ElementConverter):
             alt = content_token.content
         
         # 调试信息
-        debug = self.base_converter.debug if hasattr(self.base_converter, 'debug') else False
+        debug = self.tracing
         if debug:
-            print(f"处理图片: src={src}, alt={alt}, title={title}")
+            self.trace("处理图片: src={}, alt={}, title={}", src, alt, title)
         
         # 解析尺寸信息（如果有）
         width, height = self._parse_size(alt)
         if width and height and debug:
-            print(f"图片尺寸: {width}x{height}")
+            self.trace("图片尺寸: {}x{}", width, height)
         
         # 创建段落并设置居中对齐
-        paragraph = self.document.add_paragraph()
+        paragraph = self.body.add_paragraph()
         paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         # 添加图片
@@ -66,7 +138,7 @@ class ImageConverter(ElementConverter):
             image_data = self._get_image_data(src)
             if not image_data:
                 if debug:
-                    print(f"无法获取图片数据: {src}")
+                    self.trace("无法获取图片数据: {}", src)
                 return
             
             # 添加图片到文档
@@ -81,18 +153,20 @@ class ImageConverter(ElementConverter):
             
             # 添加图片标题（如果有）
             if title:
-                caption_paragraph = self.document.add_paragraph()
+                caption_paragraph = self.body.add_paragraph()
                 caption_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 caption_run = caption_paragraph.add_run(title)
                 caption_run.italic = True
                 caption_run.font.size = Pt(10)
             
             if debug:
-                print(f"图片添加成功: {src}")
+                self.trace("图片添加成功: {}", src)
                 
+        except LimitExceededError:
+            raise
         except Exception as e:
-            if debug:
-                print(f"添加图片失败: {str(e)}")
+            self._count_failure()
+            self.warn("添加图片失败: {}: {}", src, e)
     
     def convert_in_paragraph(self, paragraph, token, style=None):
         """在段落中转换图片
@@ -102,12 +176,12 @@ class ImageConverter(ElementConverter):
             token: 图片标记
             style: 样式信息
         """
-        debug = self.base_converter.debug if hasattr(self.base_converter, 'debug') else False
+        debug = self.tracing
         
         # 获取图片信息
         if not hasattr(token, 'attrs') or not token.attrs:
             if debug:
-                print("警告: 图片标记没有属性")
+                self.trace("警告: 图片标记没有属性")
             return
         
         # 获取图片URL和标题
@@ -119,12 +193,12 @@ class ImageConverter(ElementConverter):
             alt = token.content
         
         if debug:
-            print(f"处理段落内图片: src={src}, alt={alt}")
+            self.trace("处理段落内图片: src={}, alt={}", src, alt)
         
         # 解析尺寸信息（如果有）
         width, height = self._parse_size(alt)
         if width and height and debug:
-            print(f"图片尺寸: {width}x{height}")
+            self.trace("图片尺寸: {}x{}", width, height)
         
         # 添加图片
         try:
@@ -132,7 +206,7 @@ class ImageConverter(ElementConverter):
             image_data = self._get_image_data(src)
             if not image_data:
                 if debug:
-                    print(f"无法获取图片数据: {src}")
+                    self.trace("无法获取图片数据: {}", src)
                 return
             
             # 添加图片到段落
@@ -145,11 +219,13 @@ class ImageConverter(ElementConverter):
                 run.add_picture(image_data, width=Pt(100))
             
             if debug:
-                print(f"段落内图片添加成功: {src}")
+                self.trace("段落内图片添加成功: {}", src)
                 
+        except LimitExceededError:
+            raise
         except Exception as e:
-            if debug:
-                print(f"添加段落内图片失败: {str(e)}")
+            self._count_failure()
+            self.warn("添加段落内图片失败: {}: {}", src, e)
     
     def _get_image_data(self, src: str) -> Optional[BytesIO]:
         """获取图片数据
@@ -159,20 +235,75 @@ class ImageConverter(ElementConverter):
             
         Returns:
             BytesIO: 图片数据流
+            
+        Raises:
+            LimitExceededError: 超出图片数量、图片总大小或耗时限制
+        """
+        # 资源限制：在获取数据之前计数，避免下载超出数量的远程图片
+        governor = getattr(self.base_converter, 'governor', None)
+        if governor is not None:
+            governor.add_image()
+        
+        image_data = self._load_image_bytes(src, governor.remaining(10) if governor is not None else 10)
+        if image_data is None:
+            self._count_failure()
+            return None
+        if governor is not None:
+            governor.add_image_bytes(len(image_data))
+        stats = self.stats
+        if stats is not None:
+            stats.image_bytes += len(image_data)
+        return BytesIO(image_data)
+    
+    def _count_failure(self) -> None:
+        """记录一张获取或插入失败的图片"""
+        stats = self.stats
+        if stats is not None:
+            stats.images_failed += 1
+    
+    def _load_image_bytes(self, src: str, timeout: float) -> Optional[bytes]:
+        """读取本地图片或下载在线图片
+        
+        Args:
+            src: 图片路径或URL
+            timeout: 下载超时（秒）
+            
+        Returns:
+            Optional[bytes]: 图片内容，获取失败时为 None
         """
+        stats = self.stats
         # 检查缓存
-        if src in self._image_cache:
-            return BytesIO(self._image_cache[src])
+        image_data = self._image_cache.get(src)
+        if image_data is not None:
+            if stats is not None:
+                stats.images_cached += 1
+            return image_data
+        
+        image_data = self._fetch_image_bytes(src, timeout)
+        if image_data is not None and stats is not None:
+            stats.images_fetched += 1
+        return image_data
+    
+    def _fetch_image_bytes(self, src: str, timeout: float) -> Optional[bytes]:
+        """下载在线图片或读取本地图片，成功时加入缓存
         
+        Args:
+            src: 图片路径或URL
+            timeout: 下载超时（秒）
+            
+        Returns:
+            Optional[bytes]: 图片内容，获取失败时为 None
+        """
         try:
             # 处理在线图片
             if src.startswith(('http://', 'https://')):
-                response = requests.get(src, timeout=10)
+                response = requests.get(src, timeout=timeout)
                 if response.status_code == 200:
                     image_data = response.content
                     # 缓存图片数据
                     self._image_cache[src] = image_data
-                    return BytesIO(image_data)
+                    return image_data
+                self.warn("下载图片失败: {} (HTTP {})", src, response.status_code)
             # 处理本地图片
             else:
                 # 尝试从当前目录加载
@@ -181,7 +312,7 @@ class ImageConverter(ElementConverter):
                         image_data = f.read()
                         # 缓存图片数据
                         self._image_cache[src] = image_data
-                        return BytesIO(image_data)
+                        return image_data
                 
                 # 尝试从测试目录加载
                 test_path = os.path.join('tests', 'samples', 'basic', src)
@@ -190,11 +321,10 @@ class ImageConverter(ElementConverter):
                         image_data = f.read()
                         # 缓存图片数据
                         self._image_cache[src] = image_data
-                        return BytesIO(image_data)
+                        return image_data
+                self.warn("图片文件不存在: {}", src)
         except Exception as e:
-            debug = self.base_converter.debug if hasattr(self.base_converter, 'debug') else False
-            if debug:
-                print(f"获取图片数据失败: {str(e)}")
+            self.warn("获取图片数据失败: {}: {}", src, e)
         
         return None
     
@@ -209,7 +339,7 @@ class ImageConverter(ElementConverter):
         Returns:
             Tuple[Optional[int], Optional[int]]: (宽度, 高度)
         """
-        debug = self.base_converter.debug if hasattr(self.base_converter, 'debug') else False
+        debug = self.tracing
         
         if not alt:
             return None, None
@@ -227,7 +357,7 @@ class ImageConverter(ElementConverter):
                 width = int(match.group(1))
                 height = int(match.group(2))
                 if debug:
-                    print(f"解析到图片尺寸: {width}x{height}")
+                    self.trace("解析到图片尺寸: {}x{}", width, height)
                 return width, height
         
         return None, None 
\ No newline at end of file
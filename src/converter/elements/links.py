@@ -5,7 +5,11 @@ from docx.shared import RGBColor
 from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from lxml import etree
 from .base import ElementConverter
+from ..builder import append_text, new_run, run_properties
+from ..runs import RunBuffer
+from ..styles import get_style_index
 
 
 class LinkConverter(ElementConverter):
@@ -22,10 +26,19 @@ class LinkConverter(ElementConverter):
         # 创建链接样式
         self._ensure_hyperlink_style()
 
-    def _ensure_hyperlink_style(self):
-        """确保Hyperlink样式存在"""
-        if 'Hyperlink' not in self.document.styles:
-            style = self.document.styles.add_style('Hyperlink', WD_STYLE_TYPE.CHARACTER)
+    def prepare_document(self, document):
+        """创建链接样式"""
+        self._ensure_hyperlink_style(document)
+
+    def _ensure_hyperlink_style(self, document=None):
+        """确保Hyperlink样式存在
+
+        Args:
+            document: 目标文档，默认为当前文档
+        """
+        styles = get_style_index(document or self.document)
+        if 'Hyperlink' not in styles:
+            style = styles.add_style('Hyperlink', WD_STYLE_TYPE.CHARACTER)
             font = style.font
             font.color.rgb = RGBColor(0, 0, 255)  # 蓝色
             font.underline = True
@@ -58,10 +71,9 @@ class LinkConverter(ElementConverter):
             text = "(空链接)"
         
         # 获取当前段落或创建新段落
-        if self.document.paragraphs:
-            paragraph = self.document.paragraphs[-1]
-        else:
-            paragraph = self.document.add_paragraph()
+        paragraph = self.body.last_paragraph()
+        if paragraph is None:
+            paragraph = self.body.add_paragraph()
         
         # 创建超链接
         self._add_hyperlink(paragraph, text, url)
@@ -75,38 +87,36 @@ class LinkConverter(ElementConverter):
             style: 样式信息
             link_text: 链接文本，如果提供则使用此文本
         """
-        debug = self.base_converter.debug if hasattr(self.base_converter, 'debug') else False
+        debug = self.tracing
         if debug:
-            print(f"转换链接: token={token.type}, content={token.content if hasattr(token, 'content') else ''}")
-            print(f"链接样式: {style}")
+            self.trace("转换链接: token={}, content={}", token.type, token.content if hasattr(token, 'content') else '')
+            self.trace("链接样式: {}", style)
         
         if not hasattr(token, 'attrs') or not token.attrs:
             if debug:
-                print("警告: 链接标记没有属性")
+                self.trace("警告: 链接标记没有属性")
             return
             
         # 获取链接URL
         url = token.attrs.get('href', '')
         if debug:
-            print(f"链接URL: {url}")
+            self.trace("链接URL: {}", url)
         
         # 获取链接文本
         text = link_text or ""
         
         # 如果没有提供链接文本，尝试从token中获取
         if not text and hasattr(token, 'children') and token.children:
-            for child in token.children:
-                if child.type == 'text':
-                    text += child.content
+            text = "".join(child.content for child in token.children if child.type == 'text')
         
         if debug:
-            print(f"链接文本: {text}")
+            self.trace("链接文本: {}", text)
         
         # 如果没有文本，使用URL作为文本
         if not text:
             text = url
             if debug:
-                print(f"使用URL作为链接文本: {text}")
+                self.trace("使用URL作为链接文本: {}", text)
             
         # 添加带样式的超链接
         self._add_hyperlink_with_style(paragraph, text, url, style or {})
@@ -119,14 +129,8 @@ class LinkConverter(ElementConverter):
             text: 链接文本
             url: 链接地址
         """
-        # 创建超链接
-        run = paragraph.add_run(text)
-        
-        # 确保Hyperlink样式存在
-        self._ensure_hyperlink_style()
-        
-        # 应用超链接样式
-        run.style = 'Hyperlink'
+        # 创建引用 Hyperlink 样式的运行元素
+        r = self._new_hyperlink_run(paragraph, text, {})
         
         # 如果URL为空，不创建实际的超链接
         if not url:
@@ -136,27 +140,64 @@ class LinkConverter(ElementConverter):
         part = self.document.part
         r_id = part.relate_to(url, 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink', is_external=True)
         
-        # 获取XML元素
-        r_element = run._element
+        # 把运行元素放进超链接，紧邻的同目标超链接合并
+        self._wrap_in_hyperlink(r, r_id)
+    
+    def _new_hyperlink_run(self, paragraph, text, style):
+        """在段落末尾添加引用 Hyperlink 样式的运行元素
         
-        # 创建超链接XML元素
-        hyperlink = OxmlElement('w:hyperlink')
-        hyperlink.set(qn('r:id'), r_id)
+        颜色和下划线来自 Hyperlink 样式，run 只带样式引用和开启的粗体、斜体、删除线。
         
-        # 获取父元素
-        parent = r_element.getparent()
+        Args:
+            paragraph: 段落对象
+            text: 链接文本
+            style: 样式信息，包含bold、italic、strike
+            
+        Returns:
+            运行元素
+        """
+        # 确保Hyperlink样式存在
+        self._ensure_hyperlink_style()
+        style_id = self.styles.style_id('Hyperlink', WD_STYLE_TYPE.CHARACTER)
+        rpr = run_properties(bool(style.get("bold")), bool(style.get("italic")),
+                             bool(style.get("strike")), style=style_id)
+        r = new_run(text, rpr)
+        paragraph._p.append(r)
+        return r
+    
+    def _wrap_in_hyperlink(self, r_element, r_id: str) -> None:
+        """把运行元素放进指向 r_id 的超链接元素
         
-        # 获取运行元素的索引
-        index = parent.index(r_element)
+        前一个元素是指向同一目标的超链接时并入它，格式与它的最后一个 run
+        相同时直接合并文本，避免相邻的同目标链接生成多个超链接和 run。
         
-        # 从父元素中移除运行元素
-        parent.remove(r_element)
+        Args:
+            r_element: 刚添加到段落末尾的运行元素
+            r_id: 超链接关系 ID
+        """
+        previous = r_element.getprevious()
+        if (RunBuffer.coalesce and previous is not None and previous.tag == qn('w:hyperlink')
+                and previous.get(qn('r:id')) == r_id):
+            last = previous[-1] if len(previous) else None
+            if last is not None and last.tag == qn('w:r') and self._same_format(last, r_element):
+                append_text(last, r_element.text)
+                r_element.getparent().remove(r_element)
+            else:
+                previous.append(r_element)
+            return
         
-        # 将运行元素添加到超链接
+        hyperlink = OxmlElement('w:hyperlink')
+        hyperlink.set(qn('r:id'), r_id)
+        r_element.addprevious(hyperlink)
         hyperlink.append(r_element)
-        
-        # 将超链接插入到原来运行元素的位置
-        parent.insert(index, hyperlink)
+    
+    @staticmethod
+    def _same_format(a, b) -> bool:
+        """两个运行元素的 rPr 是否相同"""
+        a_pr, b_pr = a.rPr, b.rPr
+        if a_pr is None or b_pr is None:
+            return a_pr is b_pr
+        return etree.tostring(a_pr) == etree.tostring(b_pr)
     
     def _add_hyperlink_with_style(self, paragraph, text, url, style):
         """添加带样式的超链接到段落
@@ -167,67 +208,28 @@ class LinkConverter(ElementConverter):
             url: 链接地址
             style: 样式信息，包含bold、italic、strike
         """
-        debug = self.base_converter.debug if hasattr(self.base_converter, 'debug') else False
+        debug = self.tracing
         # 调试信息
         if debug:
-            print(f"添加带样式的超链接: text='{text}', url='{url}', style={style}")
+            self.trace("添加带样式的超链接: text='{}', url='{}', style={}", text, url, style)
         
         # 创建超链接
-        run = paragraph.add_run(text)
+        r = self._new_hyperlink_run(paragraph, text, style)
         if debug:
-            print(f"创建的run文本: '{run.text}'")
-        
-        # 应用样式
-        if style.get("bold"):
-            run.bold = True
-            if debug:
-                print("应用粗体样式")
-        if style.get("italic"):
-            run.italic = True
-            if debug:
-                print("应用斜体样式")
-        if style.get("strike"):
-            run.font.strike = True
-            if debug:
-                print("应用删除线样式")
-        
-        # 确保Hyperlink样式存在
-        self._ensure_hyperlink_style()
-        
-        # 应用超链接样式
-        run.style = 'Hyperlink'
+            self.trace("创建的run文本: '{}'", r.text)
         
         # 如果URL为空，不创建实际的超链接
         if not url:
             if debug:
-                print("URL为空，不创建实际的超链接")
+                self.trace("URL为空，不创建实际的超链接")
             return
         
         # 创建关系ID
         part = self.document.part
         r_id = part.relate_to(url, 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink', is_external=True)
         
-        # 获取XML元素
-        r_element = run._element
-        
-        # 创建超链接XML元素
-        hyperlink = OxmlElement('w:hyperlink')
-        hyperlink.set(qn('r:id'), r_id)
-        
-        # 获取父元素
-        parent = r_element.getparent()
-        
-        # 获取运行元素的索引
-        index = parent.index(r_element)
-        
-        # 从父元素中移除运行元素
-        parent.remove(r_element)
-        
-        # 将运行元素添加到超链接
-        hyperlink.append(r_element)
-        
-        # 将超链接插入到原来运行元素的位置
-        parent.insert(index, hyperlink)
+        # 把运行元素放进超链接，紧邻的同目标超链接合并
+        self._wrap_in_hyperlink(r, r_id)
         
         if debug:
-            print("超链接创建成功") 
\ No newline at end of file
+            self.trace("超链接创建成功") 
@@ -3,30 +3,60 @@
 """
 from typing import Any, Dict, Tuple, List, Optional
 from docx.shared import Pt, Inches
-from docx.text.run import Run
 from docx.text.paragraph import Paragraph
 from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import RGBColor
 from docx.oxml.shared import OxmlElement, qn
-from docx.oxml import ns
 from .base import ElementConverter
+from ..context import DocumentState
+from ..styles import get_style_index
+from ..ir import ListItem
+from ..numbering import add_numbering_definition
 
 
 class ListConverter(ElementConverter):
     """处理列表的转换器"""
     
+    # 模板中预先创建样式的列表层级数
+    PREBUILT_LEVELS = 6
+    
+    # 跟踪当前列表状态：[(层级, 是否有序, 编号ID)]
+    _current_lists = DocumentState(list)
+    # 缓存已创建的编号定义：(层级, 是否有序) -> 编号ID
+    _numbering_cache = DocumentState(dict)
+    # 跟踪每个层级的当前编号
+    _current_numbers = DocumentState(dict)
+    # 上一个处理的标记类型
+    _last_token_type = DocumentState()
+    
     def __init__(self, base_converter=None):
         super().__init__(base_converter)
-        # 跟踪当前列表状态：(层级, 是否有序, 编号ID)
+        self.reset()
+    
+    def reset(self) -> None:
+        """清除上一个文档的列表和编号状态"""
         self._current_lists: List[Tuple[int, bool, Optional[int]]] = []
-        # 缓存已创建的编号定义：(层级, 是否有序) -> 编号ID
         self._numbering_cache: Dict[Tuple[int, bool], int] = {}
-        # 跟踪每个层级的当前编号
         self._current_numbers: Dict[int, int] = {}
-        # 上一个处理的标记类型
         self._last_token_type: Optional[str] = None
     
+    def get_state(self) -> Tuple:
+        """列表、编号状态快照"""
+        return (list(self._current_lists), dict(self._numbering_cache),
+                dict(self._current_numbers), self._last_token_type)
+    
+    def set_state(self, state: Tuple) -> None:
+        """恢复列表、编号状态，并把变化的编号重新应用到列表样式上"""
+        current_lists, numbering_cache, current_numbers, self._last_token_type = state
+        # 列表样式上的编号始终与编号缓存一致，只需更新有变化的部分
+        for (level, is_ordered), numbering_id in numbering_cache.items():
+            if self._numbering_cache.get((level, is_ordered)) != numbering_id:
+                style = self._get_or_add_list_style(self.document, self._get_style_name(level, is_ordered), level)
+                self._apply_numbering(style, numbering_id, level)
+        self._current_lists = list(current_lists)
+        self._numbering_cache = dict(numbering_cache)
+        self._current_numbers = dict(current_numbers)
+    
     def convert(self, tokens: Tuple[Any, Any]) -> Paragraph:
         """转换列表元素
         
@@ -68,12 +98,8 @@ class ListConverter(ElementConverter):
         self._update_list_state(level, is_ordered, numbering_id)
         
         # 创建新段落
-        paragraph = self.document.add_paragraph()
-        paragraph.style = self.document.styles[style_name]
-        
-        # 处理列表项内的文本和样式
-        current_text = ""
-        current_style = {"bold": False, "italic": False, "strike": False}
+        paragraph = self.body.add_paragraph()
+        self.styles.set_paragraph_style(paragraph, style_name)
         
         # 处理空列表项
         if not content_token or not hasattr(content_token, 'children') or not content_token.children:
@@ -101,50 +127,8 @@ class ListConverter(ElementConverter):
                 # 只返回一个空段落，让任务列表转换器处理内容
                 return paragraph
         
-        # 处理列表项内的子元素
-        for child in content_token.children:
-            if child.type == 'text':
-                # 处理多行文本中的空格
-                text = child.content.replace('\n', ' ')
-                if text.endswith(' '):
-                    text = text[:-1]
-                current_text += text
-            elif child.type == 'strong_open':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["bold"] = True
-            elif child.type == 'strong_close':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["bold"] = False
-            elif child.type == 'em_open':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["italic"] = True
-            elif child.type == 'em_close':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["italic"] = False
-            elif child.type == 's_open':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["strike"] = True
-            elif child.type == 's_close':
-                if current_text:
-                    self._add_text_with_style(paragraph, current_text, current_style)
-                    current_text = ""
-                current_style["strike"] = False
-            elif child.type == 'softbreak':
-                current_text += " "
-        
-        # 添加剩余的文本
-        if current_text:
-            self._add_text_with_style(paragraph, current_text, current_style)
+        # 处理列表项内的文本、样式、链接和图片
+        self.add_inline(paragraph, content_token)
             
         return paragraph
     
@@ -206,23 +190,6 @@ class ListConverter(ElementConverter):
             # 否则添加新的列表状态
             self._current_lists.append((level, is_ordered, numbering_id))
     
-    def _add_text_with_style(self, paragraph: Paragraph, text: str, style: Dict[str, bool]) -> None:
-        """添加带样式的文本
-        
-        Args:
-            paragraph: 段落对象
-            text: 要添加的文本
-            style: 样式配置
-        """
-        run = paragraph.add_run(text)
-        run.bold = style["bold"]
-        run.italic = style["italic"]
-        if style["strike"]:
-            rPr = run._element.get_or_add_rPr()
-            strike = OxmlElement('w:strike')
-            strike.set(qn('w:val'), 'true')
-            rPr.append(strike)
-    
     def _get_list_info(self, token: Any) -> Tuple[int, bool]:
         """获取列表的层级和类型
         
@@ -232,6 +199,9 @@ class ListConverter(ElementConverter):
         Returns:
             Tuple[int, bool]: (层级, 是否为有序列表)
         """
+        if isinstance(token, ListItem):
+            return token.level, token.ordered
+        
         level = 1
         is_ordered = False
         
@@ -260,6 +230,41 @@ class ListConverter(ElementConverter):
         base_name = "List Number" if is_ordered else "List Bullet"
         return f"{base_name} {level}" if level > 1 else base_name
     
+    def prepare_document(self, document) -> None:
+        """预先创建常用层级的列表样式（不含编号定义，编号按文档分配）"""
+        for level in range(1, self.PREBUILT_LEVELS + 1):
+            for is_ordered in (False, True):
+                self._get_or_add_list_style(document, self._get_style_name(level, is_ordered), level)
+    
+    def _get_or_add_list_style(self, document, style_name: str, level: int):
+        """获取列表段落样式，不存在时创建
+        
+        Args:
+            document: 目标文档
+            style_name: 样式名称
+            level: 列表层级
+            
+        Returns:
+            列表段落样式
+        """
+        styles = get_style_index(document)
+        style = styles.get(style_name)
+        if style is not None:
+            return style
+        
+        style = styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
+        # 设置基本样式
+        style.font.size = Pt(12)
+        # 根据层级设置左缩进
+        style.paragraph_format.left_indent = Inches(0.5 * (level - 1))  # 修改缩进计算方式
+        style.paragraph_format.first_line_indent = Inches(-0.25)  # 悬挂缩进
+        # 设置段落间距
+        style.paragraph_format.space_before = Pt(6)
+        style.paragraph_format.space_after = Pt(6)
+        # 设置对齐方式
+        style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.LEFT
+        return style
+    
     def _ensure_list_style(self, style_name: str, level: int, is_ordered: bool, need_new_numbering: bool = False) -> Optional[int]:
         """确保列表样式存在
         
@@ -275,21 +280,7 @@ class ListConverter(ElementConverter):
         numbering_id = None
         
         # 检查样式是否已存在
-        style_exists = style_name in self.document.styles
-        if not style_exists:
-            style = self.document.styles.add_style(style_name, WD_STYLE_TYPE.PARAGRAPH)
-            # 设置基本样式
-            style.font.size = Pt(12)
-            # 根据层级设置左缩进
-            style.paragraph_format.left_indent = Inches(0.5 * (level - 1))  # 修改缩进计算方式
-            style.paragraph_format.first_line_indent = Inches(-0.25)  # 悬挂缩进
-            # 设置段落间距
-            style.paragraph_format.space_before = Pt(6)
-            style.paragraph_format.space_after = Pt(6)
-            # 设置对齐方式
-            style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        else:
-            style = self.document.styles[style_name]
+        style = self._get_or_add_list_style(self.document, style_name, level)
             
         # 处理编号
         # 获取缓存的编号定义
@@ -351,8 +342,8 @@ class ListConverter(ElementConverter):
                 # 添加级别定义
                 abstract_num.append(lvl)
             
-            # 添加抽象编号定义
-            numbering.append(abstract_num)
+            # 添加抽象编号定义，位于所有编号实例之前
+            add_numbering_definition(numbering, abstract_num)
             
             # 创建编号实例
             num = OxmlElement('w:num')
@@ -363,7 +354,7 @@ class ListConverter(ElementConverter):
             num.append(abstract_num_id_element)
             
             # 添加编号实例
-            numbering.append(num)
+            add_numbering_definition(numbering, num)
             numbering_id = int(num_id)
             
             # 缓存编号定义
@@ -371,7 +362,18 @@ class ListConverter(ElementConverter):
 
         # 应用编号定义到样式
         if numbering_id is not None:
-            style._element.get_or_add_pPr().get_or_add_numPr().get_or_add_numId().val = numbering_id
-            style._element.get_or_add_pPr().get_or_add_numPr().get_or_add_ilvl().val = level - 1
+            self._apply_numbering(style, numbering_id, level)
 
-        return numbering_id 
\ No newline at end of file
+        return numbering_id
+    
+    def _apply_numbering(self, style, numbering_id: int, level: int) -> None:
+        """把编号定义应用到列表样式
+        
+        Args:
+            style: 列表段落样式
+            numbering_id: 编号定义ID
+            level: 列表层级
+        """
+        num_pr = style._element.get_or_add_pPr().get_or_add_numPr()
+        num_pr.get_or_add_numId().val = numbering_id
+        num_pr.get_or_add_ilvl().val = level - 1 
\ No newline at end of file
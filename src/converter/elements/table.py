@@ -6,8 +6,12 @@ from docx.shared import Inches
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 
+from ..runs import PLAIN
 from .base import ElementConverter
 
+# 表头单元格的基础格式：粗体
+HEADER_FORMAT = (True, False, False, False)
+
 
 class TableConverter(ElementConverter):
     """表格转换器，处理Markdown表格到DOCX表格的转换"""
@@ -21,7 +25,6 @@ class TableConverter(ElementConverter):
         super().__init__()
         self.base_converter = base_converter
         self.debug = False
-        self.current_style = {}  # 当前样式
         if base_converter:
             self.debug = base_converter.debug
 
@@ -38,10 +41,10 @@ class TableConverter(ElementConverter):
         if not self.document:
             raise ValueError("Document not set for TableConverter")
         
-        if self.debug:
-            print(f"处理表格: {token}")
+        if self.tracing:
+            self.trace("处理表格: {}", token.type)
             if tokens:
-                print(f"表格tokens: {tokens}")
+                self.trace("表格标记数: {}", len(tokens))
         
         # 解析表格结构
         rows = self._parse_table_structure(token, tokens)
@@ -52,8 +55,8 @@ class TableConverter(ElementConverter):
         cols = len(rows[0]) if rows else 0
         
         # 创建表格
-        table = self.document.add_table(rows=len(rows), cols=cols)
-        table.style = 'Table Grid'
+        table = self.body.add_table(rows=len(rows), cols=cols)
+        self.styles.set_table_style(table, 'Table Grid')
         
         # 填充表格内容
         self._fill_table_content(table, rows)
@@ -84,10 +87,10 @@ class TableConverter(ElementConverter):
             return []
         
         # 调试输出
-        if self.debug:
-            print(f"解析表格结构，tokens长度: {len(tokens)}")
+        if self.tracing:
+            self.trace("解析表格结构，tokens长度: {}", len(tokens))
             for t in tokens:
-                print(f"  Token: {t.type}")
+                self.trace("  Token: {}", t.type)
         
         # 查找表格行
         tr_open_indices = []
@@ -102,8 +105,8 @@ class TableConverter(ElementConverter):
         
         # 确保找到了相同数量的开始和结束标记
         if len(tr_open_indices) != len(tr_close_indices):
-            if self.debug:
-                print(f"警告: 表格行的开始和结束标记数量不匹配: {len(tr_open_indices)} vs {len(tr_close_indices)}")
+            if self.tracing:
+                self.trace("警告: 表格行的开始和结束标记数量不匹配: {} vs {}", len(tr_open_indices), len(tr_close_indices))
             # 尝试修复
             if len(tr_open_indices) > len(tr_close_indices):
                 tr_close_indices.append(len(tokens) - 1)
@@ -217,10 +220,10 @@ class TableConverter(ElementConverter):
                         rows.append(row)
         
         # 调试输出
-        if self.debug:
-            print(f"解析到 {len(rows)} 行表格")
+        if self.tracing:
+            self.trace("解析到 {} 行表格", len(rows))
             for i, row in enumerate(rows):
-                print(f"  行 {i+1}: {len(row)} 个单元格")
+                self.trace("  行 {}: {} 个单元格", i+1, len(row))
         
         return rows
     
@@ -274,37 +277,10 @@ class TableConverter(ElementConverter):
                                 # 使用基础转换器处理内联内容
                                 if hasattr(self.base_converter, '_process_inline'):
                                     self.base_converter._process_inline(content_token, p)
-                                # 直接处理内联内容（如果基础转换器没有_process_inline方法）
-                                elif hasattr(content_token, 'children'):
-                                    for child in content_token.children:
-                                        if hasattr(child, 'type'):
-                                            if child.type == 'text':
-                                                run = p.add_run(child.content)
-                                                # 应用当前样式
-                                                if 'bold' in self.current_style:
-                                                    run.bold = self.current_style['bold']
-                                                if 'italic' in self.current_style:
-                                                    run.italic = self.current_style['italic']
-                                                if 'strike' in self.current_style:
-                                                    run.font.strike = self.current_style['strike']
-                                            elif child.type == 'strong_open':
-                                                # 开始加粗
-                                                self.current_style = {'bold': True}
-                                            elif child.type == 'strong_close':
-                                                # 结束加粗
-                                                self.current_style = {}
-                                            elif child.type == 'em_open':
-                                                # 开始斜体
-                                                self.current_style = {'italic': True}
-                                            elif child.type == 'em_close':
-                                                # 结束斜体
-                                                self.current_style = {}
-                                            elif child.type == 's_open':
-                                                # 开始删除线
-                                                self.current_style = {'strike': True}
-                                            elif child.type == 's_close':
-                                                # 结束删除线
-                                                self.current_style = {}
+                                # 使用行内渲染引擎，表头单元格以粗体为基础格式
+                                else:
+                                    self.add_inline(p, content_token,
+                                                    HEADER_FORMAT if cell_data['is_header'] else PLAIN)
                             elif hasattr(content_token, 'type') and content_token.type == 'text':
                                 p.add_run(content_token.content)
                             else:
@@ -318,8 +294,7 @@ class TableConverter(ElementConverter):
                                         if hasattr(content_token, 'content'):
                                             p.add_run(content_token.content)
                                 except Exception as e:
-                                    if self.debug:
-                                        print(f"处理单元格内容时出错: {e}")
+                                    self.warn("处理单元格内容时出错: {}", e)
                     else:
                         # 简单文本处理
                         text = self._get_text_from_tokens(cell_data['content'])
@@ -341,15 +316,15 @@ class TableConverter(ElementConverter):
         Returns:
             str: 提取的文本内容
         """
-        text = ""
+        parts = []
         for token in tokens:
             if hasattr(token, 'type') and token.type == 'text':
-                text += token.content
+                parts.append(token.content)
             elif hasattr(token, 'content'):
-                text += token.content
+                parts.append(token.content)
             elif hasattr(token, 'children'):
-                text += self._get_text_from_tokens(token.children)
-        return text
+                parts.append(self._get_text_from_tokens(token.children))
+        return "".join(parts)
     
     def _set_cell_alignment(self, cell, align):
         """设置单元格水平对齐方式
@@ -8,6 +8,7 @@ import re
 
 from .base import ElementConverter
 from .list import ListConverter
+from ..ir import Inline
 
 
 class TaskListConverter(ElementConverter):
@@ -42,8 +43,8 @@ class TaskListConverter(ElementConverter):
         if not self.document:
             raise ValueError("Document not set for TaskListConverter")
         
-        if self.debug:
-            print(f"处理任务列表: {tokens}")
+        if self.tracing:
+            self.trace("处理任务列表: {}", getattr(tokens[1], 'content', ''))
         
         # 解析token
         list_token, content_token = tokens
@@ -69,6 +70,7 @@ class TaskListConverter(ElementConverter):
                 # 处理 content 不是字符串的情况
                 task_text = str(content) if content is not None else ""
         elif hasattr(content_token, 'children'):
+            parts = []
             for child in content_token.children:
                 if hasattr(child, 'type') and child.type == 'checkbox_input':
                     is_checked = child.attrs.get('checked', False) if hasattr(child, 'attrs') else False
@@ -79,10 +81,11 @@ class TaskListConverter(ElementConverter):
                         match = task_pattern.match(child_content)
                         if match:
                             child_content = task_pattern.sub('', child_content)
-                        task_text += child_content
+                        parts.append(child_content)
                     except TypeError:
                         # 处理 child.content 不是字符串的情况
-                        task_text += str(child.content) if child.content is not None else ""
+                        parts.append(str(child.content) if child.content is not None else "")
+            task_text = "".join(parts)
         
         # 使用符号替代复选框
         checkbox_symbol = "√ " if is_checked else "× "
@@ -95,11 +98,7 @@ class TaskListConverter(ElementConverter):
         if self.list_converter:
             try:
                 # 创建一个新的内容token，只包含任务文本（不包含符号）
-                new_content_token = type('InlineToken', (), {
-                    'type': 'inline',
-                    'content': task_text,  # 不包含符号，以便列表转换器正常处理
-                    'children': []
-                })
+                new_content_token = Inline(task_text)  # 不包含符号，以便列表转换器正常处理
                 
                 # 使用列表转换器创建段落
                 paragraph = self.list_converter.convert((list_token, new_content_token))
@@ -117,11 +116,13 @@ class TaskListConverter(ElementConverter):
                 
                 return paragraph
             except Exception as e:
-                if self.debug:
-                    print(f"使用列表转换器创建段落时出错: {e}")
+                self.warn("使用列表转换器创建段落时出错，按普通段落输出: {}", e)
+                stats = self.stats
+                if stats is not None:
+                    stats.add_fallback('task_list_paragraph')
         
         # 如果列表转换器失败或不存在，创建一个简单的段落
-        paragraph = self.document.add_paragraph()
+        paragraph = self.body.add_paragraph()
         paragraph.add_run(task_text_with_symbol)
         return paragraph
 
@@ -134,8 +135,8 @@ class TaskListConverter(ElementConverter):
         """
         # 检查段落是否为None
         if paragraph is None:
-            if self.debug:
-                print("警告: 尝试向None段落添加复选框")
+            if self.tracing:
+                self.trace("警告: 尝试向None段落添加复选框")
             return
             
         # 获取段落的第一个run
@@ -0,0 +1,50 @@
+"""
+异常模块，定义转换过程中使用的异常类型
+"""
+
+
+class MD2DocxError(Exception):
+    """基础异常类"""
+    pass
+
+
+class ParseError(MD2DocxError):
+    """解析错误"""
+    pass
+
+
+class ConvertError(MD2DocxError):
+    """转换错误"""
+    pass
+
+
+class LimitExceededError(ConvertError):
+    """超出资源限制
+
+    构造参数保存在 args 中，异常可以被 pickle，从并行转换的工作进程传回主进程。
+
+    Attributes:
+        limit: 超出的限制名称，与 Limits 的属性名一致
+        value: 实际值
+        maximum: 限制值
+    """
+
+    def __init__(self, limit: str, value, maximum):
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+        super().__init__(limit, value, maximum)
+
+    def __str__(self) -> str:
+        return f"超出资源限制 {self.limit}: {self.value} > {self.maximum}"
+
+
+class ConversionCancelled(ConvertError):
+    """转换被 CancellationToken 取消"""
+
+    def __init__(self):
+        # 不带参数，以便 pickle 时按 ConversionCancelled() 重建
+        super().__init__()
+
+    def __str__(self) -> str:
+        return "转换已取消"
@@ -0,0 +1,213 @@
+"""
+行内渲染引擎，把 inline 标记的子标记渲染到段落中
+
+段落、标题、列表项、引用块和表格单元格共用这一个引擎。按子标记类型查分派表，
+强调、删除线等格式用显式的格式栈维护（开始标记压栈，结束标记出栈），
+文本经 RunBuffer 合并后生成 run；链接和图片交给已注册的链接、图片转换器。
+
+转换器需要支持新的行内标记时，调用 register_inline_handler 注册处理函数。
+"""
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from docx.text.paragraph import Paragraph
+
+from .runs import PLAIN, RunBuffer, RunFormat, style_dict
+
+# 格式在 RunFormat 中的位置
+BOLD, ITALIC, STRIKE, CODE = range(4)
+
+# 中文等语境下强调定界符紧贴链接时 markdown-it 不识别为强调（如 ``文字**[链接](url)**``），
+# 文本末尾的定界符 -> 对应格式，按长度从长到短检查
+LINK_MARKERS = (('**', BOLD), ('~~', STRIKE), ('*', ITALIC))
+
+
+class InlineState:
+    """一次行内渲染的状态"""
+
+    __slots__ = ('paragraph', 'children', 'buffer', 'stack', 'converters',
+                 'link_marker', 'skip_prefix')
+
+    def __init__(self, paragraph: Paragraph, children: Sequence[Any],
+                 converters: Mapping[str, Any], base_format: RunFormat):
+        self.paragraph = paragraph
+        self.children = children
+        self.buffer = RunBuffer(paragraph)
+        # 格式栈，栈顶为当前格式
+        self.stack: List[RunFormat] = [base_format]
+        # 元素类型 -> 转换器，用于链接和图片
+        self.converters = converters
+        # 紧贴链接的强调定界符，链接之后的文本以它开头时结束该格式
+        self.link_marker: Optional[str] = None
+        # 下一个文本开头需要去掉的字符数（链接之后的结束定界符）
+        self.skip_prefix = 0
+
+    @property
+    def format(self) -> RunFormat:
+        """当前格式"""
+        return self.stack[-1]
+
+    def push(self, index: int) -> None:
+        """开启一种格式"""
+        fmt = list(self.stack[-1])
+        fmt[index] = True
+        self.stack.append(tuple(fmt))
+
+    def pop(self) -> None:
+        """结束最近开启的格式，多余的结束标记忽略"""
+        if len(self.stack) > 1:
+            self.stack.pop()
+
+
+InlineHandler = Callable[[InlineState, int], int]
+
+
+def _closes_after_link(children: Sequence[Any], i: int, marker: str) -> bool:
+    """从 link_open（索引 i）开始的链接之后，紧跟的文本是否以同一定界符开头"""
+    end = i + 1
+    while end < len(children) and children[end].type != 'link_close':
+        end += 1
+    following = children[end + 1] if end + 1 < len(children) else None
+    return (following is not None and following.type == 'text' and following.content.startswith(marker)
+            and not (marker == '*' and following.content.startswith('**')))
+
+
+def _text(state: InlineState, i: int) -> int:
+    """文本"""
+    children = state.children
+    text = children[i].content
+    if state.skip_prefix:
+        text = text[state.skip_prefix:]
+        state.skip_prefix = 0
+    if i + 1 < len(children) and children[i + 1].type == 'link_open':
+        for marker, index in LINK_MARKERS:
+            if text.endswith(marker):
+                # 链接之后没有对应的结束定界符时按原文输出
+                if _closes_after_link(children, i + 1, marker):
+                    state.buffer.add(text[:-len(marker)], state.format)
+                    state.push(index)
+                    state.link_marker = marker
+                    return i + 1
+                break
+    state.buffer.add(text, state.format)
+    return i + 1
+
+
+def _softbreak(state: InlineState, i: int) -> int:
+    """软换行，输出为空格"""
+    state.buffer.add(' ', state.format)
+    return i + 1
+
+
+def _hardbreak(state: InlineState, i: int) -> int:
+    """硬换行，输出为 w:br"""
+    state.buffer.add('\n', state.format)
+    return i + 1
+
+
+def _code_inline(state: InlineState, i: int) -> int:
+    """行内代码，使用等宽字体"""
+    fmt = state.format
+    state.buffer.add(state.children[i].content, fmt[:CODE] + (True,))
+    return i + 1
+
+
+def _opener(index: int) -> InlineHandler:
+    def handler(state: InlineState, i: int) -> int:
+        state.push(index)
+        return i + 1
+    return handler
+
+
+def _closer(state: InlineState, i: int) -> int:
+    state.pop()
+    return i + 1
+
+
+def _link(state: InlineState, i: int) -> int:
+    """链接：收集到 link_close 为止的文本，交给链接转换器"""
+    children = state.children
+    end = i + 1
+    parts = []
+    while end < len(children) and children[end].type != 'link_close':
+        if children[end].type in ('text', 'code_inline'):
+            parts.append(children[end].content)
+        end += 1
+    text = ''.join(parts)
+
+    link_converter = state.converters.get('link')
+    if link_converter is not None:
+        state.buffer.flush()
+        link_converter.convert_in_paragraph(paragraph=state.paragraph, token=children[i],
+                                            style=style_dict(state.format), link_text=text or None)
+    else:
+        state.buffer.add(text, state.format)
+
+    # 结束紧贴链接的强调，并去掉链接之后文本开头的结束定界符
+    marker = state.link_marker
+    if marker is not None:
+        state.link_marker = None
+        state.pop()
+        state.skip_prefix = len(marker)
+    return end + 1
+
+
+def _image(state: InlineState, i: int) -> int:
+    """图片，交给图片转换器"""
+    image_converter = state.converters.get('image')
+    if image_converter is not None:
+        state.buffer.flush()
+        image_converter.convert_in_paragraph(state.paragraph, state.children[i], style_dict(state.format))
+    return i + 1
+
+
+def _skip(state: InlineState, i: int) -> int:
+    return i + 1
+
+
+# 行内分派表：子标记类型 -> 处理函数，返回下一个要处理的索引
+INLINE_HANDLERS: Dict[str, InlineHandler] = {
+    'text': _text,
+    'softbreak': _softbreak,
+    'hardbreak': _hardbreak,
+    'code_inline': _code_inline,
+    'strong_open': _opener(BOLD),
+    'strong_close': _closer,
+    'em_open': _opener(ITALIC),
+    'em_close': _closer,
+    's_open': _opener(STRIKE),
+    's_close': _closer,
+    'link_open': _link,
+    'link_close': _skip,
+    'image': _image,
+}
+
+
+def register_inline_handler(token_type: str, handler: InlineHandler) -> None:
+    """注册或替换行内标记的处理函数
+
+    Args:
+        token_type: 子标记类型
+        handler: 处理函数 ``handler(state, i) -> 下一个索引``
+    """
+    INLINE_HANDLERS[token_type] = handler
+
+
+def render_inline(paragraph: Paragraph, children: Sequence[Any],
+                  converters: Optional[Mapping[str, Any]] = None,
+                  base_format: RunFormat = PLAIN) -> None:
+    """把行内子标记渲染到段落末尾
+
+    Args:
+        paragraph: 目标段落
+        children: inline 标记的子标记
+        converters: 元素类型 -> 转换器，提供 'link'、'image' 时生成超链接和图片
+        base_format: 基础格式，例如表头单元格为粗体
+    """
+    state = InlineState(paragraph, children, converters or {}, base_format)
+    handlers = INLINE_HANDLERS
+    i = 0
+    count = len(children)
+    while i < count:
+        handler = handlers.get(children[i].type)
+        i = handler(state, i) if handler else i + 1
+    state.buffer.flush()
@@ -0,0 +1,84 @@
+"""
+中间表示模块，从 markdown-it 标记流一次性构建紧凑的节点
+"""
+from typing import Dict, List, Optional, Sequence
+
+from markdown_it.token import Token
+
+
+class Block:
+    """成对块级节点，记录开始和结束标记在标记流中的位置"""
+
+    __slots__ = ('type', 'start', 'end', 'item')
+
+    def __init__(self, type: str, start: int, end: int, item: Optional['ListItem'] = None):
+        self.type = type
+        self.start = start
+        self.end = end
+        # 列表项节点（仅 list_item_open 有）
+        self.item = item
+
+
+class ListItem:
+    """列表项节点，供列表和任务列表转换器使用
+
+    type 与列表开始标记一致（bullet_list_open / ordered_list_open），
+    content 为按层级计算的缩进，兼容按标记读取列表信息的转换器。
+    """
+
+    __slots__ = ('type', 'content', 'level', 'ordered')
+
+    def __init__(self, ordered: bool = False, level: int = 1):
+        self.type = 'ordered_list_open' if ordered else 'bullet_list_open'
+        self.content = '  ' * (level - 1)
+        self.level = level
+        self.ordered = ordered
+
+
+class Inline:
+    """内联节点，替代 markdown-it 的 inline 标记"""
+
+    __slots__ = ('type', 'content', 'children')
+
+    def __init__(self, content: str = '', children: Sequence = ()):
+        self.type = 'inline'
+        self.content = content
+        self.children = children
+
+
+# 共享的空内联节点（空列表项等）
+EMPTY_INLINE = Inline()
+
+
+def build_ir(tokens: List[Token]) -> Dict[int, Block]:
+    """一次遍历标记流，建立所有成对块级节点
+
+    Args:
+        tokens: 标记列表
+
+    Returns:
+        Dict[int, Block]: 开始标记索引到块级节点的映射
+    """
+    blocks: Dict[int, Block] = {}
+    stack: List[int] = []
+    lists: List[bool] = []  # 列表栈：是否为有序列表
+    items: Dict[int, ListItem] = {}
+
+    for index, token in enumerate(tokens):
+        nesting = token.nesting
+        if nesting == 1:
+            stack.append(index)
+            token_type = token.type
+            if token_type == 'bullet_list_open' or token_type == 'ordered_list_open':
+                lists.append(token_type == 'ordered_list_open')
+            elif token_type == 'list_item_open':
+                ordered = lists[-1] if lists else False
+                items[index] = ListItem(ordered, len(lists) or 1)
+        elif nesting == -1 and stack:
+            start = stack.pop()
+            blocks[start] = Block(tokens[start].type, start, index, items.pop(start, None))
+            if token.type == 'bullet_list_close' or token.type == 'ordered_list_close':
+                if lists:
+                    lists.pop()
+
+    return blocks
@@ -0,0 +1,37 @@
+"""
+延迟导入模块，推迟加载只有部分文档才用到的第三方依赖
+"""
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """首次访问属性时才导入的模块代理
+
+    用于 requests 等导入开销大、但只有部分输入（例如在线图片）才需要的依赖。
+    代理上可以像模块一样打补丁（unittest.mock.patch），补丁优先于真实属性。
+    """
+
+    def __init__(self, name: str):
+        """初始化模块代理
+
+        Args:
+            name: 模块的完整名称
+        """
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self) -> ModuleType:
+        """导入并缓存真实模块"""
+        module: Optional[ModuleType] = self.__dict__['_module']
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
@@ -0,0 +1,142 @@
+"""
+资源限制模块，限制单次转换的输入规模、图片和耗时
+
+Limits 描述限制值，ResourceGovernor 在一次转换中累计用量并在超出时抛出
+LimitExceededError。耗时限制是协作式的：分派循环在处理每个块级标记前检查截止时间，
+远程图片的下载超时也不会超过剩余时间。
+"""
+import time
+from typing import Optional
+
+from .errors import LimitExceededError
+
+
+class Limits:
+    """单次转换的资源限制，None 表示不限制"""
+
+    __slots__ = ('max_input_bytes', 'max_tokens', 'max_depth', 'max_table_cells',
+                 'max_images', 'max_image_bytes', 'timeout')
+
+    def __init__(self, max_input_bytes: Optional[int] = None, max_tokens: Optional[int] = None,
+                 max_depth: Optional[int] = None, max_table_cells: Optional[int] = None,
+                 max_images: Optional[int] = None, max_image_bytes: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        """初始化资源限制
+
+        Args:
+            max_input_bytes: 输入 Markdown 的最大 UTF-8 字节数
+            max_tokens: 最大标记数（不含内联子标记）
+            max_depth: 块级标记的最大嵌套深度（引用、列表嵌套）
+            max_table_cells: 所有表格的单元格总数上限
+            max_images: 图片数量上限
+            max_image_bytes: 嵌入图片的总字节数上限
+            timeout: 单次转换的最长耗时（秒）
+        """
+        self.max_input_bytes = max_input_bytes
+        self.max_tokens = max_tokens
+        self.max_depth = max_depth
+        self.max_table_cells = max_table_cells
+        self.max_images = max_images
+        self.max_image_bytes = max_image_bytes
+        self.timeout = timeout
+
+
+# 面向不受信任输入（例如 HTTP 上传）的默认限制
+SERVER_LIMITS = Limits(
+    max_input_bytes=10 * 1024 * 1024,
+    max_tokens=1_000_000,
+    max_depth=64,
+    max_table_cells=100_000,
+    max_images=500,
+    max_image_bytes=100 * 1024 * 1024,
+    timeout=120.0,
+)
+
+
+def _check(limit: str, value, maximum) -> None:
+    """value 超过 maximum 时抛出 LimitExceededError"""
+    if maximum is not None and value > maximum:
+        raise LimitExceededError(limit, value, maximum)
+
+
+class ResourceGovernor:
+    """在一次转换中累计资源用量并检查限制"""
+
+    def __init__(self, limits: Limits):
+        """初始化资源管理器
+
+        Args:
+            limits: 资源限制
+        """
+        self.limits = limits
+        self.start()
+
+    def start(self) -> None:
+        """开始一次新的转换：清零用量并重新计算截止时间"""
+        self.input_bytes = 0
+        self.tokens = 0
+        self.table_cells = 0
+        self.images = 0
+        self.image_bytes = 0
+        timeout = self.limits.timeout
+        # 截止时间（time.monotonic），None 表示不限时
+        self.deadline: Optional[float] = time.monotonic() + timeout if timeout is not None else None
+
+    def add_input(self, text: str) -> None:
+        """累计输入文本的字节数"""
+        maximum = self.limits.max_input_bytes
+        if maximum is None:
+            return
+        # 超过限制时不必编码：每个字符至少占 1 字节
+        if len(text) > maximum:
+            size = len(text)
+        else:
+            size = len(text.encode('utf-8'))
+        self.input_bytes += size
+        _check('max_input_bytes', self.input_bytes, maximum)
+
+    def add_tokens(self, count: int) -> None:
+        """累计标记数"""
+        self.tokens += count
+        _check('max_tokens', self.tokens, self.limits.max_tokens)
+
+    def check_depth(self, depth: int) -> None:
+        """检查嵌套深度"""
+        _check('max_depth', depth, self.limits.max_depth)
+
+    def add_table_cells(self, count: int) -> None:
+        """累计表格单元格数"""
+        self.table_cells += count
+        _check('max_table_cells', self.table_cells, self.limits.max_table_cells)
+
+    def add_image(self) -> None:
+        """累计图片数，在获取图片数据之前调用"""
+        self.images += 1
+        _check('max_images', self.images, self.limits.max_images)
+
+    def add_image_bytes(self, size: int) -> None:
+        """累计嵌入图片的字节数"""
+        self.image_bytes += size
+        _check('max_image_bytes', self.image_bytes, self.limits.max_image_bytes)
+
+    def check_deadline(self) -> None:
+        """超过截止时间时抛出 LimitExceededError"""
+        if self.deadline is not None:
+            now = time.monotonic()
+            if now > self.deadline:
+                elapsed = now - self.deadline + self.limits.timeout
+                raise LimitExceededError('timeout', round(elapsed, 3), self.limits.timeout)
+
+    def remaining(self, default: float) -> float:
+        """剩余时间与 default 中较小的一个，用作网络请求等阻塞操作的超时
+
+        Args:
+            default: 不限时时使用的超时
+
+        Returns:
+            float: 超时秒数
+        """
+        if self.deadline is None:
+            return default
+        self.check_deadline()
+        return max(0.001, min(default, self.deadline - time.monotonic()))
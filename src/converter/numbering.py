@@ -0,0 +1,55 @@
+"""
+编号定义模块，按 numbering.xml 的元素顺序添加编号定义
+
+架构要求所有 w:abstractNum 位于第一个 w:num 之前，直接追加到末尾的抽象编号
+定义会让 Word 报告文档损坏。列表转换、块缓存回放和并行合并都通过这里添加。
+"""
+from typing import Any, List, Tuple
+
+from docx.oxml.ns import qn
+
+_ABSTRACT_NUM = qn('w:abstractNum')
+_NUM = qn('w:num')
+
+
+def add_numbering_definition(numbering: Any, element: Any) -> Any:
+    """把 w:abstractNum 或 w:num 添加到编号部件中
+
+    抽象编号定义插入到第一个编号实例之前（即所有抽象编号定义之后），
+    编号实例追加到末尾。
+
+    Args:
+        numbering: w:numbering 元素
+        element: w:abstractNum 或 w:num 元素
+
+    Returns:
+        Any: 传入的元素
+    """
+    if element.tag == _ABSTRACT_NUM:
+        first_num = numbering.find(_NUM)
+        if first_num is not None:
+            first_num.addprevious(element)
+            return element
+    numbering.append(element)
+    return element
+
+
+def count_definitions(numbering: Any) -> Tuple[int, int]:
+    """统计抽象编号定义和编号实例的数量，用于之后截取新增的定义"""
+    return len(numbering.findall(_ABSTRACT_NUM)), len(numbering.findall(_NUM))
+
+
+def definitions_since(numbering: Any, counts: Tuple[int, int]) -> List[Any]:
+    """获取 count_definitions 之后新增的定义，抽象编号定义在前
+
+    新增的抽象编号定义总在已有的之后、编号实例之前，新增的编号实例总在末尾。
+
+    Args:
+        numbering: w:numbering 元素
+        counts: count_definitions 的返回值
+
+    Returns:
+        List[Any]: 新增的 w:abstractNum 和 w:num 元素
+    """
+    abstract_count, num_count = counts
+    return numbering.findall(_ABSTRACT_NUM)[abstract_count:] + numbering.findall(_NUM)[num_count:]
@@ -0,0 +1,299 @@
+"""
+并行转换模块，按一级/二级标题切分文档，在子进程中分别转换后合并
+
+每个工作进程把自己负责的章节转换为可序列化的片段：正文 XML、
+新增的关系（图片、外部链接）、新增的编号定义以及相对模板有变化的样式。
+主进程按原顺序合并片段，并重新分配关系 ID、编号 ID 和绘图对象 ID。
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from lxml import etree
+
+from .body import get_body_writer
+from .limits import Limits
+from .numbering import add_numbering_definition, count_definitions, definitions_since
+from .stats import ConversionStats
+from .parser import get_parser
+from .template import new_document
+
+# 切分章节的标题级别
+SECTION_TAGS: Tuple[str, ...] = ('h1', 'h2')
+
+_R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_R_ATTRS = (f'{{{_R_NS}}}id', f'{{{_R_NS}}}embed', f'{{{_R_NS}}}link')
+
+# 每个进程缓存一次模板的基线：样式 ID -> 样式 XML、模板关系 ID、编号定义数量
+_baseline: Optional[Tuple[Dict[str, bytes], frozenset, Tuple[int, int]]] = None
+
+
+class Fragment:
+    """一个章节的转换结果，可在进程间传递"""
+
+    __slots__ = ('body', 'rels', 'numbering', 'styles', 'stats')
+
+    def __init__(self, body: bytes, rels: List[Tuple[str, str, Optional[str], Optional[bytes]]],
+                 numbering: List[bytes], styles: List[bytes],
+                 stats: Optional[ConversionStats] = None):
+        # 正文 XML（w:body，不含 sectPr）
+        self.body = body
+        # 新增关系：(rId, 关系类型, 外部目标, 内部部件内容)
+        self.rels = rels
+        # 新增的 w:abstractNum / w:num 定义
+        self.numbering = numbering
+        # 新增或被修改的 w:style 定义
+        self.styles = styles
+        # 章节的转换统计
+        self.stats = stats if stats is not None else ConversionStats()
+
+
+def split_sections(md_text: str, tags: Sequence[str] = SECTION_TAGS) -> List[str]:
+    """在顶层标题处切分 Markdown 文本
+
+    只在不属于引用、列表的顶层标题所在行切分，切分点之前的块都已结束，
+    因此各章节可以独立解析。引用式链接定义只在其所在章节内生效。
+
+    Args:
+        md_text: Markdown 文本
+        tags: 作为切分点的标题级别
+
+    Returns:
+        List[str]: 按顺序排列的章节文本
+    """
+    lines = md_text.splitlines(keepends=True)
+    cuts = [token.map[0] for token in get_parser().parse(md_text)
+            if token.type == 'heading_open' and token.level == 0
+            and token.tag in tags and token.map and token.map[0] > 0]
+
+    sections = []
+    start = 0
+    for cut in cuts:
+        sections.append(''.join(lines[start:cut]))
+        start = cut
+    sections.append(''.join(lines[start:]))
+    return [section for section in sections if section]
+
+
+def _get_baseline() -> Tuple[Dict[str, bytes], frozenset, Tuple[int, int]]:
+    """获取模板文档的样式、关系和编号基线"""
+    global _baseline
+    if _baseline is None:
+        document = new_document()
+        styles = {style.get(qn('w:styleId')): etree.tostring(style)
+                  for style in document.styles.element.iterchildren(qn('w:style'))}
+        rel_ids = frozenset(document.part.rels)
+        numbering = count_definitions(document.part.numbering_part.element)
+        _baseline = (styles, rel_ids, numbering)
+    return _baseline
+
+
+def follows_code(sections: Sequence[str]) -> List[bool]:
+    """判断每个章节之前是否已经出现过代码块
+
+    顺序转换时，代码块转换器在第一个代码块之后的每个代码块前插入空行，
+    这一状态不会被其他块清除。章节各自转换前需要知道这一状态，才能与顺序转换一致。
+
+    Args:
+        sections: split_sections 返回的章节文本
+
+    Returns:
+        List[bool]: 每个章节对应一个值，之前的章节中有代码块时为 True
+    """
+    flags = []
+    seen = False
+    for section in sections:
+        flags.append(seen)
+        # 出现代码块之后的章节不必再解析
+        if not seen:
+            seen = any(token.type == 'fence' for token in get_parser().parse(section))
+    return flags
+
+
+def convert_section(md_text: str, debug: bool = False, limits: Optional[Limits] = None,
+                    after_code: bool = False, profile: bool = False) -> Fragment:
+    """在当前进程中转换一个章节，返回可序列化的片段
+
+    Args:
+        md_text: 章节的 Markdown 文本
+        debug: 是否显示调试信息
+        limits: 章节的资源限制
+        after_code: 之前的章节中是否有代码块，见 follows_code
+        profile: 是否按元素转换器统计耗时和输出
+
+    Returns:
+        Fragment: 章节片段
+    """
+    # 避免与 base 模块循环导入
+    from .base import BaseConverter
+
+    base_styles, base_rels, base_numbering = _get_baseline()
+    converter = BaseConverter(debug=debug, limits=limits, profile=profile)
+    context = converter.context
+    code_converter = converter.converters.get('code')
+    if after_code and code_converter is not None:
+        with context.activate():
+            code_converter.set_state(True)
+    document = converter.convert(md_text, context=context)
+
+    # 章节文档用完即弃，直接去掉 sectPr 后序列化正文
+    body = document.element.body
+    sect_pr = body.find(qn('w:sectPr'))
+    if sect_pr is not None:
+        body.remove(sect_pr)
+
+    rels = []
+    for rel in document.part.rels.values():
+        if rel.rId in base_rels:
+            continue
+        if rel.is_external:
+            rels.append((rel.rId, rel.reltype, rel.target_ref, None))
+        elif rel.reltype == RT.IMAGE:
+            rels.append((rel.rId, rel.reltype, None, rel.target_part.blob))
+
+    numbering = [etree.tostring(element)
+                 for element in definitions_since(document.part.numbering_part.element, base_numbering)]
+
+    styles = []
+    for style in document.styles.element.iterchildren(qn('w:style')):
+        xml = etree.tostring(style)
+        if base_styles.get(style.get(qn('w:styleId'))) != xml:
+            styles.append(xml)
+
+    return Fragment(etree.tostring(body), rels, numbering, styles, converter.stats)
+
+
+def _max_id(elements: Iterable, attr: str) -> int:
+    """获取元素中整数 ID 属性的最大值"""
+    ids = [int(value) for value in (element.get(attr) for element in elements)
+           if value is not None and value.isdigit()]
+    return max(ids, default=0)
+
+
+def merge_fragments(document: Document, fragments: Iterable[Fragment]) -> Document:
+    """按顺序把片段合并到文档末尾
+
+    Args:
+        document: 目标文档
+        fragments: 片段
+
+    Returns:
+        Document: 目标文档
+    """
+    part = document.part
+    writer = get_body_writer(document)
+    numbering = part.numbering_part.element
+    styles = document.styles.element
+    # 绘图对象 ID 在整个文档中唯一，从当前最大值开始继续分配
+    next_shape_id = part.next_id
+
+    for fragment in fragments:
+        # 关系：图片按内容去重后重新关联，外部链接直接重新关联
+        rel_map = {}
+        for r_id, reltype, target, blob in fragment.rels:
+            if blob is not None:
+                rel_map[r_id] = part.get_or_add_image(BytesIO(blob))[0]
+            else:
+                rel_map[r_id] = part.relate_to(target, reltype, is_external=True)
+
+        # 编号：在现有最大 ID 之后重新编号，先处理抽象编号定义再处理编号实例
+        elements = [parse_xml(xml) for xml in fragment.numbering]
+        abstract_map = {}
+        abstract_offset = _max_id(numbering.iterchildren(qn('w:abstractNum')), qn('w:abstractNumId')) + 1
+        for element in elements:
+            if element.tag == qn('w:abstractNum'):
+                old = element.get(qn('w:abstractNumId'))
+                element.set(qn('w:abstractNumId'),
+                            abstract_map.setdefault(old, str(abstract_offset + len(abstract_map))))
+                # 抽象编号定义必须位于所有编号实例之前
+                add_numbering_definition(numbering, element)
+        num_map = {}
+        num_offset = _max_id(numbering.iterchildren(qn('w:num')), qn('w:numId')) + 1
+        for element in elements:
+            if element.tag == qn('w:num'):
+                old = element.get(qn('w:numId'))
+                element.set(qn('w:numId'), num_map.setdefault(old, str(num_offset + len(num_map))))
+                abstract_id = element.find(qn('w:abstractNumId'))
+                if abstract_id is not None and abstract_id.get(qn('w:val')) in abstract_map:
+                    abstract_id.set(qn('w:val'), abstract_map[abstract_id.get(qn('w:val'))])
+                add_numbering_definition(numbering, element)
+
+        # 样式：新增的追加，被修改的（例如列表样式上的编号）替换
+        for xml in fragment.styles:
+            style = parse_xml(xml)
+            _remap_num_ids(style, num_map)
+            existing = styles.get_by_id(style.get(qn('w:styleId')))
+            if existing is not None:
+                existing.getparent().replace(existing, style)
+            else:
+                styles.append(style)
+
+        # 正文：重映射关系、编号和绘图 ID 后插入到 sectPr 之前
+        fragment_body = parse_xml(fragment.body)
+        if rel_map:
+            for element in fragment_body.iter():
+                for attr in _R_ATTRS:
+                    value = element.get(attr)
+                    if value in rel_map:
+                        element.set(attr, rel_map[value])
+        _remap_num_ids(fragment_body, num_map)
+        for doc_pr in fragment_body.iter(qn('wp:docPr')):
+            doc_pr.set('id', str(next_shape_id))
+            next_shape_id += 1
+
+        writer.extend(list(fragment_body))
+
+    return document
+
+
+def _remap_num_ids(element, num_map: Dict[str, str]) -> None:
+    """把元素内引用的编号 ID 替换为合并后的 ID"""
+    if not num_map:
+        return
+    for num_id in element.iter(qn('w:numId')):
+        value = num_id.get(qn('w:val'))
+        if value in num_map:
+            num_id.set(qn('w:val'), num_map[value])
+
+
+def convert_parallel(document: Document, md_text: str, max_workers: Optional[int] = None,
+                     executor: Optional[Executor] = None, debug: bool = False,
+                     limits: Optional[Limits] = None, stats: Optional[ConversionStats] = None,
+                     profile: bool = False) -> Document:
+    """按章节并行转换 Markdown 文本并合并到文档
+
+    Args:
+        document: 目标文档
+        md_text: Markdown 文本
+        max_workers: 工作进程数，默认为 CPU 核心数
+        executor: 复用的执行器，提供时忽略 max_workers
+        debug: 是否显示调试信息
+        limits: 每个章节的资源限制
+        stats: 累加各章节元素数量、图片统计、各转换器统计和警告的转换统计
+        profile: 是否在各章节中按元素转换器统计耗时和输出
+
+    Returns:
+        Document: 目标文档
+    """
+    sections = split_sections(md_text)
+    debug_flags = [debug] * len(sections)
+    section_limits = [limits] * len(sections)
+    code_flags = follows_code(sections)
+    profile_flags = [profile] * len(sections)
+    args = (sections, debug_flags, section_limits, code_flags, profile_flags)
+    if len(sections) < 2:
+        # 只有一个章节时不值得启动工作进程
+        fragments = list(map(convert_section, *args))
+    elif executor is not None:
+        fragments = list(executor.map(convert_section, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            fragments = list(pool.map(convert_section, *args))
+    if stats is not None:
+        for fragment in fragments:
+            stats.merge(fragment.stats)
+    return merge_fragments(document, fragments)
@@ -0,0 +1,64 @@
+"""
+Markdown 解析器池模块，缓存预先配置好的 MarkdownIt 实例
+"""
+import threading
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from markdown_it import MarkdownIt
+
+# 默认解析选项
+DEFAULT_PRESET = 'commonmark'
+DEFAULT_OPTIONS: Mapping[str, Any] = {'breaks': True, 'html': True}  # 启用HTML支持
+DEFAULT_RULES: Tuple[str, ...] = ('strikethrough', 'emphasis', 'table')  # 启用删除线、强调和表格
+
+# 每个线程各自持有解析器副本：MarkdownIt 的规则链可被 enable/disable 修改，
+# 按线程隔离可避免并发转换之间互相影响
+_local = threading.local()
+
+ParserKey = Tuple[str, Tuple[Tuple[str, Any], ...], Tuple[str, ...]]
+
+
+def _make_key(preset: str, options: Optional[Mapping[str, Any]],
+              rules: Iterable[str]) -> ParserKey:
+    """根据选项生成缓存键"""
+    options = DEFAULT_OPTIONS if options is None else options
+    return preset, tuple(sorted(options.items())), tuple(rules)
+
+
+def _create_parser(key: ParserKey) -> MarkdownIt:
+    """按缓存键创建并配置解析器"""
+    preset, options, rules = key
+    parser = MarkdownIt(preset, dict(options))
+    for rule in rules:
+        parser.enable(rule)
+    return parser
+
+
+def get_parser(preset: str = DEFAULT_PRESET,
+               options: Optional[Mapping[str, Any]] = None,
+               rules: Iterable[str] = DEFAULT_RULES) -> MarkdownIt:
+    """获取当前线程中按选项缓存的解析器
+
+    返回的实例为共享实例，调用方只应调用 parse()，不要再 enable/disable 规则。
+
+    Args:
+        preset: markdown-it 预设名称
+        options: 解析选项，默认启用换行和 HTML
+        rules: 需要启用的规则
+
+    Returns:
+        MarkdownIt: 配置好的解析器
+    """
+    key = _make_key(preset, options, rules)
+    parsers: Optional[Dict[ParserKey, MarkdownIt]] = getattr(_local, 'parsers', None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    parser = parsers.get(key)
+    if parser is None:
+        parser = parsers[key] = _create_parser(key)
+    return parser
+
+
+def clear_parsers() -> None:
+    """清空当前线程的解析器缓存"""
+    _local.parsers = {}
@@ -0,0 +1,82 @@
+"""
+进度模块，提供转换进度回调和协作式取消
+
+转换循环在处理每个块级标记前调用 ProgressMonitor.update：先检查取消令牌，
+再按时间间隔节流地调用进度回调，避免回调（例如跨线程发送 GUI 信号）本身拖慢转换。
+"""
+import threading
+import time
+from typing import Callable, Optional
+
+from .errors import ConversionCancelled
+
+# 进度回调：callback(已处理的标记数, 标记总数)
+ProgressCallback = Callable[[int, int], None]
+
+# 默认的进度回调最小间隔（秒）
+DEFAULT_INTERVAL = 0.1
+
+
+class CancellationToken:
+    """取消令牌，可以在其他线程中调用 cancel 取消正在进行的转换"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """请求取消，转换在处理下一个块之前停止"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """已请求取消时抛出 ConversionCancelled"""
+        if self._event.is_set():
+            raise ConversionCancelled()
+
+
+class ProgressMonitor:
+    """一次转换的进度报告和取消检查"""
+
+    def __init__(self, total: int, callback: Optional[ProgressCallback] = None,
+                 cancel: Optional[CancellationToken] = None, interval: float = DEFAULT_INTERVAL):
+        """初始化进度监视器
+
+        Args:
+            total: 标记总数
+            callback: 进度回调
+            cancel: 取消令牌
+            interval: 两次进度回调的最小间隔（秒）
+        """
+        self.total = total
+        self.callback = callback
+        self.cancel = cancel
+        self.interval = interval
+        self._last = time.monotonic()
+        if callback is not None:
+            callback(0, total)
+
+    def update(self, done: int) -> None:
+        """报告已处理的标记数，距上次回调超过间隔时才调用回调
+
+        Args:
+            done: 已处理的标记数
+
+        Raises:
+            ConversionCancelled: 已请求取消
+        """
+        if self.cancel is not None:
+            self.cancel.raise_if_cancelled()
+        if self.callback is not None:
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                self._last = now
+                self.callback(done, self.total)
+
+    def finish(self) -> None:
+        """转换完成，总是报告一次 total/total"""
+        if self.callback is not None:
+            self.callback(self.total, self.total)
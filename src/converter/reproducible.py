@@ -0,0 +1,163 @@
+"""
+可复现输出模块，保证相同输入和选项生成逐字节相同的 DOCX 文件
+
+python-docx 保存时 zip 条目使用当前时间，部件顺序取决于关系图的遍历顺序，
+关系 ID 和图片部件名取决于添加顺序（增量转换、并行合并时可能不同）。
+这里在保存前把这些内容规范化：
+
+- 核心属性的创建/修改时间固定，修订号固定为 1；
+- 主文档的关系 ID 按正文中首次引用的顺序重新编号；
+- 图片部件按正文中首次引用的顺序重新命名为 image1、image2 ...；
+- zip 条目按部件名排序，时间戳、文件属性固定。
+
+编号 ID 和绘图对象 ID 由转换器按输入顺序分配，本身已经是确定的。
+"""
+import os
+import zipfile
+from datetime import datetime, timezone
+from typing import IO, Dict, List, Optional, Tuple, Union
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from docx.opc.pkgwriter import _ContentTypesItem
+
+_R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+# zip 格式能表示的最早时间，未设置 SOURCE_DATE_EPOCH 时使用
+DEFAULT_TIMESTAMP = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+
+def get_timestamp() -> datetime:
+    """获取固定的时间戳
+
+    遵循可复现构建的约定，优先使用环境变量 SOURCE_DATE_EPOCH（Unix 时间戳）。
+
+    Returns:
+        datetime: UTC 时间
+    """
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        try:
+            return max(DEFAULT_TIMESTAMP, datetime.fromtimestamp(int(epoch), timezone.utc))
+        except (ValueError, OverflowError, OSError):
+            pass
+    return DEFAULT_TIMESTAMP
+
+
+def normalize(document: Document, timestamp: Optional[datetime] = None) -> None:
+    """规范化文档中与生成过程有关的内容
+
+    Args:
+        document: 文档
+        timestamp: 核心属性使用的时间，默认为 get_timestamp()
+    """
+    timestamp = timestamp or get_timestamp()
+    core = document.core_properties
+    core.created = timestamp.replace(tzinfo=None)
+    core.modified = timestamp.replace(tzinfo=None)
+    core.revision = 1
+    core.last_modified_by = ''
+
+    part = document.part
+    referenced = _referenced_rids(document.element)
+    _rename_images(part, referenced)
+    _renumber_rels(document, referenced)
+
+
+def _referenced_rids(element) -> List[str]:
+    """按首次出现的顺序收集元素中引用的关系 ID（r:id、r:embed、r:link 等）"""
+    seen: Dict[str, None] = {}
+    for child in element.iter():
+        for name, value in child.attrib.items():
+            if name.startswith(_R_NS) and value not in seen:
+                seen[value] = None
+    return list(seen)
+
+
+def _rename_images(part, referenced: List[str]) -> None:
+    """按正文中首次引用的顺序重新命名图片部件"""
+    images = []
+    for r_id in referenced:
+        rel = part.rels.get(r_id)
+        if rel is not None and not rel.is_external and rel.reltype == RT.IMAGE:
+            if rel.target_part not in images:
+                images.append(rel.target_part)
+    # 未被正文引用的图片（例如页眉中的图片）排在后面
+    for image in sorted(part.package.image_parts, key=lambda image: image.partname):
+        if image not in images:
+            images.append(image)
+    for number, image in enumerate(images, 1):
+        image.partname = PackURI(f'/word/media/image{number}.{image.partname.ext}')
+
+
+def _renumber_rels(document: Document, referenced: List[str]) -> None:
+    """重新编号主文档的关系 ID 并改写正文中的引用
+
+    未被正文引用的关系（样式、编号、设置等，按类型查找）保持原有顺序排在前面，
+    被引用的关系按首次引用的顺序排在后面。
+    """
+    rels = document.part.rels
+    referenced_set = set(referenced)
+    order = [r_id for r_id in sorted(rels, key=_rid_number) if r_id not in referenced_set]
+    order += [r_id for r_id in referenced if r_id in rels]
+    mapping = {r_id: f'rId{number}' for number, r_id in enumerate(order, 1)}
+    if all(old == new for old, new in mapping.items()) and list(rels) == order:
+        return
+
+    for child in document.element.iter():
+        for name, value in child.attrib.items():
+            if name.startswith(_R_NS) and value in mapping:
+                child.set(name, mapping[value])
+
+    items = [(mapping[r_id], rels[r_id]) for r_id in order]
+    rels.clear()
+    rels._target_parts_by_rId.clear()
+    for r_id, rel in items:
+        rel._rId = r_id
+        rels[r_id] = rel
+        if not rel.is_external:
+            rels._target_parts_by_rId[r_id] = rel.target_part
+
+
+def _rid_number(r_id: str) -> Tuple[int, str]:
+    """关系 ID 的排序键：rId10 排在 rId9 之后"""
+    digits = r_id[3:] if r_id.startswith('rId') else ''
+    return (int(digits), r_id) if digits.isdigit() else (0, r_id)
+
+
+def save_reproducible(document: Document, path_or_stream: Union[str, IO[bytes]],
+                      timestamp: Optional[datetime] = None) -> None:
+    """规范化文档并以固定的条目顺序和时间戳保存
+
+    Args:
+        document: 文档
+        path_or_stream: 文件路径或可写的文件对象
+        timestamp: 核心属性和 zip 条目使用的时间，默认为 get_timestamp()
+    """
+    timestamp = timestamp or get_timestamp()
+    normalize(document, timestamp)
+
+    package = document.part.package
+    parts = sorted(package.iter_parts(), key=lambda part: part.partname)
+    for part in parts:
+        part.before_marshal()
+
+    entries = [
+        (CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob),
+        (PACKAGE_URI.rels_uri.membername, package.rels.xml),
+    ]
+    for part in parts:
+        entries.append((part.partname.membername, part.blob))
+        if len(part.rels):
+            entries.append((part.partname.rels_uri.membername, part.rels.xml))
+
+    date_time = timestamp.astimezone(timezone.utc).timetuple()[:6]
+    with zipfile.ZipFile(path_or_stream, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for name, blob in entries:
+            info = zipfile.ZipInfo(name, date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            # 固定创建系统和文件属性，不随平台变化
+            info.create_system = 0
+            info.external_attr = 0
+            zip_file.writestr(info, blob)
@@ -0,0 +1,61 @@
+"""
+转换结果模块，把生成的文档和本次转换的统计一起返回
+
+元素转换器对图片获取失败、HTML 无法解析等问题做容错处理，转换本身不会失败。
+调用方通过 ConversionResult 检查这些问题和各阶段耗时，不需要解析日志。
+"""
+from typing import Any, Dict, List
+
+from docx import Document
+
+from .stats import ConversionStats, ConversionWarning
+
+
+class ConversionResult:
+    """一次转换的结果"""
+
+    def __init__(self, document: Document, stats: ConversionStats):
+        """初始化转换结果
+
+        Args:
+            document: 生成的文档
+            stats: 转换统计
+        """
+        self.document = document
+        self.stats = stats
+
+    @property
+    def element_counts(self) -> Dict[str, int]:
+        """元素类型 -> 输入中的数量"""
+        return self.stats.element_counts
+
+    @property
+    def warnings(self) -> List[ConversionWarning]:
+        """转换过程中的警告"""
+        return self.stats.warnings
+
+    @property
+    def fallbacks(self) -> Dict[str, int]:
+        """回退处理名称 -> 次数"""
+        return self.stats.fallbacks
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """各阶段耗时（秒）"""
+        return {
+            'parse': self.stats.parse_time,
+            'convert': self.stats.convert_time,
+            'save': self.stats.save_time,
+        }
+
+    @property
+    def degraded(self) -> bool:
+        """是否有图片失败、回退处理或警告，即输出可能与输入不完全一致"""
+        stats = self.stats
+        return bool(stats.images_failed or stats.fallbacks or stats.warnings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可以序列化为 JSON 的字典，不包含文档"""
+        data = self.stats.to_dict()
+        data['degraded'] = self.degraded
+        return data
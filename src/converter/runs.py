@@ -0,0 +1,148 @@
+"""
+行内 run 合并模块，相邻的同格式文本只生成一个 w:r
+
+逐个行内标记生成 run 时，每次格式切换（包括没有产生文本的切换）都会开始
+一个新的 run，每个 run 都带着自己的 rPr。RunBuffer 按格式累积文本，格式
+真正变化、插入链接或图片、或者段落结束时才生成 run：
+
+- 格式相同的相邻文本合并为一个 run，之前生成的 run 仍在段落末尾时直接追加；
+- 只含空白的文本与当前文本只差粗体、斜体时沿用当前格式（空白上的粗体、
+  斜体不可见；删除线和等宽字体可见，不合并）；
+- run 只写入开启的格式，不写 ``<w:b w:val="0"/>`` 这类关闭项。
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+from .builder import append_text, new_run, run_properties
+from .styles import get_style_index
+
+# (粗体, 斜体, 删除线, 行内代码)
+RunFormat = Tuple[bool, bool, bool, bool]
+
+PLAIN: RunFormat = (False, False, False, False)
+
+# 代码块和行内代码使用的字符样式，由代码块转换器的 prepare_document 创建
+CODE_STYLE = 'Code Char'
+CODE_FONT = 'Consolas'
+CODE_COLOR = '333333'
+
+
+def run_format(style: Dict[str, bool]) -> RunFormat:
+    """把转换器的样式字典转换为 RunFormat"""
+    return (bool(style.get('bold')), bool(style.get('italic')), bool(style.get('strike')),
+            bool(style.get('code')))
+
+
+def style_dict(fmt: RunFormat) -> Dict[str, bool]:
+    """把 RunFormat 转换为链接、图片转换器使用的样式字典"""
+    bold, italic, strike, code = fmt
+    return {'bold': bold, 'italic': italic, 'strike': strike, 'code': code}
+
+
+def code_style_id(document: Document) -> Optional[str]:
+    """获取文档中代码字符样式的 ID，样式不存在时返回 None"""
+    style = get_style_index(document).get_element(CODE_STYLE)
+    if style is None or style.type != WD_STYLE_TYPE.CHARACTER:
+        return None
+    return style.styleId
+
+
+def format_properties(fmt: RunFormat, code_style: Optional[str] = None) -> Optional[Any]:
+    """获取格式对应的 rPr 模板，普通文本返回 None
+
+    Args:
+        fmt: 格式
+        code_style: 代码字符样式 ID，为空时行内代码直接设置等宽字体
+
+    Returns:
+        Optional[Any]: rPr 模板
+    """
+    bold, italic, strike, code = fmt
+    if code and code_style:
+        return run_properties(bold, italic, strike, style=code_style)
+    return run_properties(bold, italic, strike, CODE_FONT if code else None)
+
+
+def add_formatted_run(paragraph: Paragraph, text: str, fmt: RunFormat) -> Run:
+    """在段落末尾添加 run，只设置开启的格式
+
+    Args:
+        paragraph: 段落
+        text: 文本
+        fmt: 格式
+
+    Returns:
+        Run: 新的 run
+    """
+    code_style = code_style_id(paragraph.part.document) if fmt[3] else None
+    r = new_run(text, format_properties(fmt, code_style))
+    paragraph._p.append(r)
+    return Run(r, paragraph)
+
+
+class RunBuffer:
+    """一个段落的行内文本缓冲"""
+
+    # 是否合并相邻的同格式文本，基准测试关闭它来对比 run 数量
+    coalesce = True
+
+    def __init__(self, paragraph: Paragraph):
+        """初始化缓冲
+
+        Args:
+            paragraph: 目标段落
+        """
+        self.paragraph = paragraph
+        # 尚未生成 run 的文本片段及其格式
+        self._parts: List[str] = []
+        self._format: Optional[RunFormat] = None
+        # 最近生成的运行元素及其格式
+        self._r: Optional[Any] = None
+        self._run_format: Optional[RunFormat] = None
+        # 代码字符样式 ID，第一次遇到行内代码时查找，空串表示文档中没有该样式
+        self._code_style: Optional[str] = None
+
+    def add(self, text: str, fmt: RunFormat) -> None:
+        """追加一段文本
+
+        Args:
+            text: 文本，换行符生成换行（w:br）
+            fmt: 格式
+        """
+        if not text:
+            return
+        current = self._format
+        if fmt != current:
+            if not self.coalesce:
+                self.flush()
+            elif self._parts and fmt[2:] == current[2:] and text.isspace():
+                # 空白沿用当前格式
+                fmt = current
+            else:
+                self.flush()
+            self._format = fmt
+        self._parts.append(text)
+        if not self.coalesce:
+            self.flush()
+
+    def flush(self) -> None:
+        """为累积的文本生成 run，插入链接、图片等非文本内容之前和段落结束时调用"""
+        if not self._parts:
+            return
+        text = ''.join(self._parts)
+        self._parts = []
+        r = self._r
+        p = self.paragraph._p
+        if self.coalesce and r is not None and self._run_format == self._format and p[-1] is r:
+            append_text(r, text)
+        else:
+            fmt = self._format
+            if fmt[3] and self._code_style is None:
+                self._code_style = code_style_id(self.paragraph.part.document) or ''
+            r = self._r = new_run(text, format_properties(fmt, self._code_style))
+            p.append(r)
+            self._run_format = self._format
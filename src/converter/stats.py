@@ -0,0 +1,203 @@
+"""
+转换统计模块，记录解析、各元素转换器和保存的耗时，以及元素数量、
+图片获取情况、回退处理和警告
+"""
+import json
+from typing import Any, Dict, List, Sequence
+
+from markdown_it.token import Token
+
+# 计入元素数量的标记类型 -> 元素类型
+ELEMENT_TYPES: Dict[str, str] = {
+    'heading_open': 'heading',
+    'paragraph_open': 'paragraph',
+    'blockquote_open': 'blockquote',
+    'bullet_list_open': 'list',
+    'ordered_list_open': 'list',
+    'list_item_open': 'list_item',
+    'fence': 'code',
+    'code_block': 'code',
+    'table_open': 'table',
+    'hr': 'hr',
+    'html_block': 'html',
+    'image': 'image',
+    'link_open': 'link',
+}
+
+
+class ConverterStats:
+    """单个元素转换器的统计"""
+
+    __slots__ = ('calls', 'time', 'elements', 'output_bytes')
+
+    def __init__(self):
+        # 调用次数
+        self.calls = 0
+        # 独占耗时（秒），不含它调用的其他转换器
+        self.time = 0.0
+        # 生成的正文块级元素数
+        self.elements = 0
+        # 生成的正文 XML 字节数
+        self.output_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ConversionWarning:
+    """转换过程中被容错处理的问题，例如图片获取失败"""
+
+    __slots__ = ('source', 'message')
+
+    def __init__(self, source: str, message: str):
+        # 产生警告的元素转换器
+        self.source = source
+        # 警告内容
+        self.message = message
+
+    def __str__(self) -> str:
+        return f"{self.source}: {self.message}"
+
+    def __repr__(self) -> str:
+        return f"ConversionWarning({self.source!r}, {self.message!r})"
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'source': self.source, 'message': self.message}
+
+
+class ConversionStats:
+    """一个文档的转换统计
+
+    耗时、元素数量、图片、回退和警告总是记录；各元素转换器的统计只在
+    BaseConverter(profile=True) 时记录。输出大小只计入最外层的转换器调用，
+    避免嵌套调用（例如任务列表调用列表转换器）重复计算。
+    增量转换中从缓存回放的块不经过元素转换器，不计入图片统计和警告。
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """清空统计"""
+        # Markdown 解析耗时（秒）
+        self.parse_time = 0.0
+        # 转换耗时（秒），包含分派和所有转换器
+        self.convert_time = 0.0
+        # 保存文档耗时（秒）
+        self.save_time = 0.0
+        # 元素类型 -> 输入中的数量
+        self.element_counts: Dict[str, int] = {}
+        # 下载或读取的图片数
+        self.images_fetched = 0
+        # 命中图片缓存的图片数
+        self.images_cached = 0
+        # 获取或插入失败的图片数
+        self.images_failed = 0
+        # 嵌入文档的图片字节数
+        self.image_bytes = 0
+        # 回退处理名称 -> 次数，例如 HTML 无法解析时按纯文本输出
+        self.fallbacks: Dict[str, int] = {}
+        # 警告
+        self.warnings: List[ConversionWarning] = []
+        # 元素类型 -> 统计
+        self.converters: Dict[str, ConverterStats] = {}
+        # 正在执行的转换器调用中，子调用累计的耗时
+        self._child_times: List[float] = []
+
+    def converter(self, name: str) -> ConverterStats:
+        """获取元素转换器的统计，不存在时创建"""
+        stats = self.converters.get(name)
+        if stats is None:
+            stats = self.converters[name] = ConverterStats()
+        return stats
+
+    def count_elements(self, tokens: Sequence[Token]) -> None:
+        """统计标记流中的元素数量，包括行内的图片和链接
+
+        Args:
+            tokens: 标记列表
+        """
+        counts = self.element_counts
+        for token in tokens:
+            element_type = ELEMENT_TYPES.get(token.type)
+            if element_type is not None:
+                counts[element_type] = counts.get(element_type, 0) + 1
+            elif token.children:
+                for child in token.children:
+                    element_type = ELEMENT_TYPES.get(child.type)
+                    if element_type is not None:
+                        counts[element_type] = counts.get(element_type, 0) + 1
+
+    def add_fallback(self, name: str) -> None:
+        """记录一次回退处理"""
+        self.fallbacks[name] = self.fallbacks.get(name, 0) + 1
+
+    def add_warning(self, source: str, message: str) -> None:
+        """记录一条警告"""
+        self.warnings.append(ConversionWarning(source, message))
+
+    def merge(self, other: 'ConversionStats') -> None:
+        """累加另一个转换（例如并行转换的章节）的解析耗时、数量、各转换器统计和警告
+
+        Args:
+            other: 另一个转换的统计
+        """
+        self.parse_time += other.parse_time
+        for name, other_stats in other.converters.items():
+            stats = self.converter(name)
+            for attr in ConverterStats.__slots__:
+                setattr(stats, attr, getattr(stats, attr) + getattr(other_stats, attr))
+        for name, count in other.element_counts.items():
+            self.element_counts[name] = self.element_counts.get(name, 0) + count
+        self.images_fetched += other.images_fetched
+        self.images_cached += other.images_cached
+        self.images_failed += other.images_failed
+        self.image_bytes += other.image_bytes
+        for name, count in other.fallbacks.items():
+            self.fallbacks[name] = self.fallbacks.get(name, 0) + count
+        self.warnings.extend(other.warnings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可以序列化为 JSON 的字典"""
+        return {
+            'parse_time': self.parse_time,
+            'convert_time': self.convert_time,
+            'save_time': self.save_time,
+            'element_counts': dict(self.element_counts),
+            'images': {
+                'fetched': self.images_fetched,
+                'cached': self.images_cached,
+                'failed': self.images_failed,
+                'bytes': self.image_bytes,
+            },
+            'fallbacks': dict(self.fallbacks),
+            'warnings': [warning.to_dict() for warning in self.warnings],
+            'converters': {name: stats.to_dict() for name, stats in self.converters.items()},
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        """序列化为 JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def format(self) -> str:
+        """格式化为文本表格，转换器按耗时降序排列"""
+        lines = [
+            f"解析: {self.parse_time * 1000:.1f} ms",
+            f"转换: {self.convert_time * 1000:.1f} ms",
+            f"保存: {self.save_time * 1000:.1f} ms",
+        ]
+        if self.element_counts:
+            lines.append("元素: " + ", ".join(f"{name} {count}" for name, count in sorted(self.element_counts.items())))
+        if self.images_fetched or self.images_cached or self.images_failed:
+            lines.append(f"图片: 获取 {self.images_fetched}, 缓存 {self.images_cached}, "
+                         f"失败 {self.images_failed}, {self.image_bytes / 1024:.1f} KB")
+        if self.fallbacks:
+            lines.append("回退: " + ", ".join(f"{name} {count}" for name, count in sorted(self.fallbacks.items())))
+        for warning in self.warnings:
+            lines.append(f"警告: {warning}")
+        if self.converters:
+            lines.append(f"{'转换器':<12}{'调用':>8}{'耗时(ms)':>12}{'元素':>8}{'输出(KB)':>12}")
+            for name, stats in sorted(self.converters.items(), key=lambda item: -item[1].time):
+                lines.append(f"{name:<12}{stats.calls:>8}{stats.time * 1000:>12.1f}"
+                             f"{stats.elements:>8}{stats.output_bytes / 1024:>12.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,112 @@
+"""
+流式分块模块，按安全的块边界切分 Markdown 输入
+"""
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from markdown_it import MarkdownIt
+
+# 默认分块大小（字符数）
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# 围栏代码块开始/结束：最多 3 个空格缩进，3 个以上的 ` 或 ~
+_FENCE_RE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+# 列表项标记
+_LIST_ITEM_RE = re.compile(r'^ {0,3}(?:[-+*]|\d{1,9}[.)])(?:[ \t]|$)')
+# 可以包含空行的原始 HTML 块：开始标记 -> 结束标记
+_RAW_HTML_RE = re.compile(r'^ {0,3}<(script|pre|style|textarea)(?:[\s>]|$)', re.IGNORECASE)
+# 与 markdown-it 的 normalize 规则相同的换行规范化
+_NEWLINES_RE = re.compile(r'\r\n?|\n')
+
+
+def iter_chunks(lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """将 Markdown 文本行切分为可以独立解析的分块
+
+    只在满足以下条件的空行处切分：不在围栏代码块或原始 HTML 块内，
+    且空行之后不是上一个列表的延续（新的列表项或缩进的续行）。
+    分块各自解析，引用式链接定义需要用 scan_references 预先收集。
+
+    Args:
+        lines: 文本行（保留行尾换行符）
+        chunk_size: 分块的目标字符数，达到后在下一个安全边界切分
+
+    Yields:
+        str: 分块文本
+    """
+    buffer: List[str] = []
+    size = 0
+    fence: Optional[str] = None        # 当前围栏代码块的开始标记
+    raw_end: Optional[str] = None      # 当前原始 HTML 块的结束标记
+    after_blank = False                # 上一行是否为空行
+    block_is_list = False              # 当前块是否以列表项开始
+    boundary = False                   # 是否已到达可以切分的大小
+
+    for line in lines:
+        stripped = line.strip()
+
+        if fence is not None:
+            # 围栏代码块内：只检查结束标记
+            match = _FENCE_RE.match(line)
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence) \
+                    and not line[match.end():].strip():
+                fence = None
+        elif raw_end is not None:
+            if raw_end in line.lower():
+                raw_end = None
+        elif not stripped:
+            after_blank = True
+            boundary = size >= chunk_size
+        else:
+            is_list_item = _LIST_ITEM_RE.match(line) is not None
+            if after_blank:
+                continues_list = block_is_list and (is_list_item or line[0] in ' \t')
+                if boundary and not continues_list and buffer:
+                    yield ''.join(buffer)
+                    buffer = []
+                    size = 0
+                if not continues_list:
+                    block_is_list = is_list_item
+                after_blank = False
+                boundary = False
+            elif not buffer:
+                block_is_list = is_list_item
+
+            match = _FENCE_RE.match(line)
+            if match:
+                fence = match.group(1)
+            else:
+                html = _RAW_HTML_RE.match(line)
+                if html:
+                    end_tag = f'</{html.group(1).lower()}>'
+                    if end_tag not in line.lower()[html.end():]:
+                        raw_end = end_tag
+                elif stripped.startswith('<!--') and '-->' not in stripped[4:]:
+                    raw_end = '-->'
+
+        buffer.append(line)
+        size += len(line)
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def scan_references(lines: Iterable[str], parser: MarkdownIt,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """预先扫描全部分块，收集引用式链接定义
+
+    只运行块级规则，不解析行内内容，也不保留标记。同一标签以第一次定义为准，
+    与整篇解析相同。
+
+    Args:
+        lines: 文本行（保留行尾换行符）
+        parser: 转换时使用的解析器
+        chunk_size: 分块的目标字符数
+
+    Returns:
+        Dict[str, Any]: 规范化标签 -> 定义，可放入解析环境的 ``references``
+    """
+    env: Dict[str, Any] = {}
+    for chunk in iter_chunks(lines, chunk_size):
+        src = _NEWLINES_RE.sub('\n', chunk).replace('\0', '\ufffd')
+        parser.block.parse(src, parser, env, [])
+    return env.get('references', {})
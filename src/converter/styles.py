@@ -0,0 +1,144 @@
+"""
+样式索引模块，按名称和 ID 查找文档样式
+
+python-docx 的 ``name in styles``、``styles[name]`` 和 ``paragraph.style = name``
+每次都用 XPath 在 styles.xml 中线性查找。StyleIndex 为每个文档建立一次
+名称/ID -> 样式元素的字典，通过它新增样式时同步更新；其他途径新增或替换的样式
+（缓存回放、并行合并）在查找未命中或命中已被移除的元素时重建索引发现。
+"""
+from typing import Any, Dict, Optional
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.styles import BabelFish
+from docx.styles.style import BaseStyle, StyleFactory
+
+
+class StyleIndex:
+    """一个文档的样式索引"""
+
+    def __init__(self, document: Document):
+        """初始化样式索引
+
+        Args:
+            document: 文档
+        """
+        self._styles = document.styles
+        self._element = self._styles.element
+        # 内部样式名（w:name）-> 样式元素
+        self._by_name: Dict[str, Any] = {}
+        # 样式 ID（w:styleId）-> 样式元素
+        self._by_id: Dict[str, Any] = {}
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """重新扫描 styles.xml"""
+        by_name = {}
+        by_id = {}
+        for style in self._element.style_lst:
+            name = style.name_val
+            if name is not None and name not in by_name:
+                by_name[name] = style
+            style_id = style.styleId
+            if style_id is not None and style_id not in by_id:
+                by_id[style_id] = style
+        self._by_name = by_name
+        self._by_id = by_id
+
+    def _lookup(self, table: str, key: str) -> Optional[Any]:
+        """在索引中查找，未命中或元素已被移除时重建索引后再查一次"""
+        style = getattr(self, table).get(key)
+        if style is None or style.getparent() is not self._element:
+            self._rebuild()
+            style = getattr(self, table).get(key)
+        return style
+
+    def get_element(self, name: str) -> Optional[Any]:
+        """按界面名称（如 'Heading 1'）查找样式元素，不存在时返回 None"""
+        return self._lookup('_by_name', BabelFish.ui2internal(name))
+
+    def get_by_id(self, style_id: str) -> Optional[Any]:
+        """按样式 ID 查找样式元素，不存在时返回 None"""
+        return self._lookup('_by_id', style_id)
+
+    def get(self, name: str) -> Optional[BaseStyle]:
+        """按名称查找样式对象，不存在时返回 None"""
+        style = self.get_element(name)
+        return StyleFactory(style) if style is not None else None
+
+    def __contains__(self, name: str) -> bool:
+        return self.get_element(name) is not None
+
+    def __getitem__(self, name: str) -> BaseStyle:
+        style = self.get(name)
+        if style is None:
+            raise KeyError(f"no style with name '{name}'")
+        return style
+
+    def add_style(self, name: str, style_type: WD_STYLE_TYPE, builtin: bool = False) -> BaseStyle:
+        """新增样式并加入索引
+
+        Args:
+            name: 样式名称
+            style_type: 样式类型
+            builtin: 是否为内置样式
+
+        Returns:
+            BaseStyle: 新样式
+        """
+        style = self._styles.add_style(name, style_type, builtin)
+        element = style.element
+        self._by_name.setdefault(element.name_val, element)
+        self._by_id.setdefault(element.styleId, element)
+        return style
+
+    def style_id(self, name: str, style_type: WD_STYLE_TYPE) -> Optional[str]:
+        """获取引用样式时使用的 ID，与 python-docx 相同：默认样式返回 None
+
+        Args:
+            name: 样式名称
+            style_type: 期望的样式类型
+
+        Returns:
+            Optional[str]: 样式 ID
+
+        Raises:
+            KeyError: 样式不存在
+            ValueError: 样式类型不符
+        """
+        style = self.get_element(name)
+        if style is None:
+            raise KeyError(f"no style with name '{name}'")
+        if style.type != style_type:
+            raise ValueError(f"assigned style is type {style.type} ({style_type} expected)")
+        return None if style.default else style.styleId
+
+    def set_paragraph_style(self, paragraph: Any, name: str) -> None:
+        """设置段落样式，等价于 ``paragraph.style = name``"""
+        paragraph._p.style = self.style_id(name, WD_STYLE_TYPE.PARAGRAPH)
+
+    def set_run_style(self, run: Any, name: str) -> None:
+        """设置字符样式，等价于 ``run.style = name``"""
+        run._r.style = self.style_id(name, WD_STYLE_TYPE.CHARACTER)
+
+    def set_table_style(self, table: Any, name: str) -> None:
+        """设置表格样式，等价于 ``table.style = name``"""
+        table._tbl.tblStyle_val = self.style_id(name, WD_STYLE_TYPE.TABLE)
+
+
+def get_style_index(document: Document) -> StyleIndex:
+    """获取文档的样式索引，首次调用时建立
+
+    索引保存在文档部件上，同一个文档的所有 Document 代理对象共享。
+
+    Args:
+        document: 文档
+
+    Returns:
+        StyleIndex: 样式索引
+    """
+    part = document.part
+    index = getattr(part, '_style_index', None)
+    if index is None:
+        index = part._style_index = StyleIndex(document)
+    return index
@@ -0,0 +1,106 @@
+"""
+文档模板缓存模块
+
+首次使用时基于 python-docx 默认模板构建一次带有全部转换器样式的模板文档，
+之后每次转换都从缓存的模板克隆新文档：XML 部件做 lxml 深拷贝，
+二进制部件直接共享不可变的字节串，避免重复解压和解析 styles.xml。
+"""
+import copy
+import threading
+from typing import Dict, Optional
+
+from docx import Document
+from docx.opc.part import Part, XmlPart
+from docx.package import Package
+
+from . import elements
+
+# 参与构建模板的转换器，各自通过 prepare_document 写入样式
+TEMPLATE_CONVERTERS = (
+    'HeadingConverter',
+    'TextConverter',
+    'BlockquoteConverter',
+    'ListConverter',
+    'CodeConverter',
+    'LinkConverter',
+    'ImageConverter',
+    'TableConverter',
+    'HRConverter',
+    'TaskListConverter',
+    'HtmlConverter',
+)
+
+_lock = threading.Lock()
+_template: Optional[Package] = None
+
+
+def build_template() -> Document:
+    """构建带有全部转换器样式的模板文档
+
+    Returns:
+        Document: 模板文档
+    """
+    document = Document()
+    for name in TEMPLATE_CONVERTERS:
+        getattr(elements, name)().prepare_document(document)
+    return document
+
+
+def _get_template() -> Package:
+    """获取缓存的模板包，首次调用时构建"""
+    global _template
+    if _template is None:
+        with _lock:
+            if _template is None:
+                _template = build_template().part.package
+    return _template
+
+
+def _clone_package(template: Package) -> Package:
+    """克隆模板包中的所有部件和关系
+
+    Args:
+        template: 模板包
+
+    Returns:
+        Package: 新的包
+    """
+    package = Package()
+    parts: Dict[str, Part] = {}
+    for part in template.iter_parts():
+        if isinstance(part, XmlPart):
+            parts[part.partname] = type(part)(
+                part.partname, part.content_type, copy.deepcopy(part.element), package)
+        else:
+            parts[part.partname] = type(part).load(
+                part.partname, part.content_type, part.blob, package)
+
+    def clone_rels(source, target):
+        for rel in source.rels.values():
+            target_ref = rel.target_ref if rel.is_external else parts[rel.target_part.partname]
+            target.load_rel(rel.reltype, target_ref, rel.rId, rel.is_external)
+
+    clone_rels(template, package)
+    for part in template.iter_parts():
+        clone_rels(part, parts[part.partname])
+
+    for part in parts.values():
+        part.after_unmarshal()
+    package.after_unmarshal()
+    return package
+
+
+def new_document() -> Document:
+    """从模板缓存克隆一个新文档
+
+    Returns:
+        Document: 已包含全部转换器样式的新文档
+    """
+    return _clone_package(_get_template()).main_document_part.document
+
+
+def clear_template_cache() -> None:
+    """清空模板缓存，下次调用 new_document 时重新构建"""
+    global _template
+    with _lock:
+        _template = None
@@ -0,0 +1,149 @@
+"""
+跟踪模块，把转换过程中的调试事件记录到有界的环形缓冲区
+
+事件只保存格式字符串和参数快照，真正格式化推迟到输出时进行。记录时参数被
+转换为标量或截断的短字符串，缓冲区不会让标记列表、文档等大对象在转换
+结束后继续存活，输出时也不会看到它们之后被修改的状态；
+支持按来源（转换器名称）过滤和按比例采样，开销足够低，可以在生产环境常开，
+出错时再把最近的事件输出出来。
+"""
+import random
+import reprlib
+import sys
+import time
+from collections import deque
+from typing import Any, Iterable, List, Optional, TextIO
+
+# 默认保留的事件数
+DEFAULT_CAPACITY = 10000
+
+# 单个参数快照的最大长度
+MAX_ARG_LENGTH = 200
+
+_NUMBERS = (bool, int, float)
+_CONTAINERS = (list, tuple, dict, set, frozenset)
+
+# 容器只取前几项生成 repr，开销与容器大小无关
+_repr = reprlib.Repr()
+_repr.maxstring = MAX_ARG_LENGTH
+_repr.maxother = MAX_ARG_LENGTH
+
+
+def _truncate(text: str) -> str:
+    return text if len(text) <= MAX_ARG_LENGTH else text[:MAX_ARG_LENGTH] + '...'
+
+
+def snapshot_arg(arg: Any) -> Any:
+    """把格式化参数转换为快照：数字和 None 原样保留，其他对象转换为截断的字符串
+
+    Args:
+        arg: 格式化参数
+
+    Returns:
+        Any: 不引用原对象的快照
+    """
+    if arg is None or isinstance(arg, _NUMBERS):
+        return arg
+    if isinstance(arg, str):
+        return _truncate(arg)
+    if isinstance(arg, _CONTAINERS):
+        return _repr.repr(arg)
+    try:
+        return _truncate(format(arg))
+    except Exception:
+        return _truncate(object.__repr__(arg))
+
+
+class TraceEvent:
+    """一条跟踪事件"""
+
+    __slots__ = ('time', 'source', 'message', 'args')
+
+    def __init__(self, time: float, source: str, message: str, args: tuple):
+        self.time = time
+        # 事件来源，通常为转换器名称
+        self.source = source
+        # str.format 风格的格式字符串
+        self.message = message
+        # 格式化参数快照，输出时才格式化
+        self.args = args
+
+    def format(self) -> str:
+        """格式化事件内容"""
+        try:
+            text = self.message.format(*self.args) if self.args else self.message
+        except Exception as e:
+            text = f"{self.message} {self.args!r} (格式化失败: {e})"
+        return f"[{self.source}] {text}"
+
+
+class Tracer:
+    """有界环形缓冲区跟踪器"""
+
+    def __init__(self, enabled: bool = True, capacity: int = DEFAULT_CAPACITY,
+                 sample_rate: float = 1.0, sources: Optional[Iterable[str]] = None,
+                 echo: bool = False, dump_on_error: bool = True,
+                 stream: Optional[TextIO] = None):
+        """初始化跟踪器
+
+        Args:
+            enabled: 是否记录事件
+            capacity: 环形缓冲区容量，超过后丢弃最早的事件
+            sample_rate: 采样比例（0~1），1 表示记录全部事件
+            sources: 只记录这些来源的事件，None 表示全部
+            echo: 是否在记录时立即输出（调试模式）
+            dump_on_error: 转换出错时是否输出缓冲区中的事件
+            stream: 输出目标，默认为标准错误，不会混入写到标准输出的文档
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.sources = frozenset(sources) if sources is not None else None
+        self.echo = echo
+        self.dump_on_error = dump_on_error
+        self.stream = stream
+        self.dropped = 0
+        self._events: deque = deque(maxlen=capacity)
+        self._random = random.Random(0)
+
+    def enabled_for(self, source: str) -> bool:
+        """是否记录来自 source 的事件，可用于在构造昂贵参数之前提前判断"""
+        return self.enabled and (self.sources is None or source in self.sources)
+
+    def event(self, source: str, message: str, *args: Any) -> None:
+        """记录一条事件
+
+        Args:
+            source: 事件来源
+            message: str.format 风格的格式字符串
+            *args: 格式化参数，记录时转换为快照
+        """
+        if not self.enabled or (self.sources is not None and source not in self.sources):
+            return
+        if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+            self.dropped += 1
+            return
+        if args:
+            args = tuple(snapshot_arg(arg) for arg in args)
+        event = TraceEvent(time.perf_counter(), source, message, args)
+        self._events.append(event)
+        if self.echo:
+            print(event.format(), file=self.stream or sys.stderr)
+
+    def events(self) -> List[TraceEvent]:
+        """缓冲区中的事件，按时间顺序"""
+        return list(self._events)
+
+    def dump(self, stream: Optional[TextIO] = None) -> None:
+        """格式化并输出缓冲区中的全部事件
+
+        Args:
+            stream: 输出目标，默认为初始化时的 stream 或标准错误
+        """
+        stream = stream or self.stream or sys.stderr
+        for event in self._events:
+            print(event.format(), file=stream)
+
+    def clear(self) -> None:
+        """清空缓冲区"""
+        self._events.clear()
+        self.dropped = 0
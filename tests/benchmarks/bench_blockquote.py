@@ -0,0 +1,35 @@
+"""
+引用块转换基准测试
+
+用法: python tests/benchmarks/bench_blockquote.py
+
+生成包含 N 个引用段落的文档并计时，输出每段平均耗时，
+用于确认引用块转换随段落数线性增长（每段耗时保持平稳）。
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.converter import BaseConverter
+
+
+def build_quoted_document(paragraphs: int) -> str:
+    """生成一个包含多个引用段落的长引用块"""
+    return "\n>\n".join(f"> 第 {i} 行引用的 **邮件** 内容" for i in range(paragraphs))
+
+
+def run(sizes=(1000, 2500, 5000, 10000)) -> None:
+    print(f"{'段落数':>8} {'总耗时(s)':>10} {'每段(us)':>10}")
+    for size in sizes:
+        md_text = build_quoted_document(size)
+        start = time.perf_counter()
+        doc = BaseConverter().convert(md_text)
+        elapsed = time.perf_counter() - start
+        assert len(doc.paragraphs) == size
+        print(f"{size:>8} {elapsed:>10.3f} {elapsed / size * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,35 @@
+"""
+正文写入基准测试
+
+用法: python tests/benchmarks/bench_body.py
+
+生成包含 N 个普通段落的文档并计时，输出每段平均耗时，
+用于确认添加段落的开销不随正文长度增长（每段耗时保持平稳）。
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.converter import BaseConverter
+
+
+def build_document(paragraphs: int) -> str:
+    """生成一个包含多个短段落的文档"""
+    return "\n\n".join(f"第 {i} 段" for i in range(paragraphs))
+
+
+def run(sizes=(10000, 25000, 50000, 100000)) -> None:
+    print(f"{'段落数':>8} {'总耗时(s)':>10} {'每段(us)':>10}")
+    for size in sizes:
+        md_text = build_document(size)
+        start = time.perf_counter()
+        doc = BaseConverter().convert(md_text)
+        elapsed = time.perf_counter() - start
+        assert len(doc.paragraphs) == size
+        print(f"{size:>8} {elapsed:>10.3f} {elapsed / size * 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,115 @@
+"""
+底层元素构建基准测试
+
+用法: python tests/benchmarks/bench_builder.py
+
+分别用 python-docx 代理对象（add_run 后设置属性）和 builder 模块生成同样的
+格式化 run 与代码行，输出耗时；再转换一个文字密集的文档，输出转换耗时。
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from docx import Document
+from docx.shared import RGBColor
+
+from src.converter import BaseConverter
+from src.converter.body import get_body_writer
+from src.converter.builder import new_run, run_properties
+
+# (粗体, 斜体, 删除线, 等宽字体)
+FORMATS = [
+    (False, False, False, None),
+    (True, False, False, None),
+    (False, True, False, None),
+    (True, True, False, None),
+    (False, False, True, None),
+    (False, False, False, 'Consolas'),
+]
+
+# 每个段落（代码块）中的 run（代码行）数
+RUNS_PER_PARAGRAPH = 20
+
+
+def with_proxies(runs: int) -> float:
+    body = get_body_writer(Document())
+    start = time.perf_counter()
+    for i in range(runs):
+        if i % RUNS_PER_PARAGRAPH == 0:
+            paragraph = body.add_paragraph()
+        bold, italic, strike, font = FORMATS[i % len(FORMATS)]
+        run = paragraph.add_run(f"文字 {i} ")
+        if bold:
+            run.bold = True
+        if italic:
+            run.italic = True
+        if strike:
+            run.font.strike = True
+        if font:
+            run.font.name = font
+    return time.perf_counter() - start
+
+
+def with_builder(runs: int) -> float:
+    body = get_body_writer(Document())
+    start = time.perf_counter()
+    for i in range(runs):
+        if i % RUNS_PER_PARAGRAPH == 0:
+            p = body.add_paragraph()._p
+        bold, italic, strike, font = FORMATS[i % len(FORMATS)]
+        p.append(new_run(f"文字 {i} ", run_properties(bold, italic, strike, font)))
+    return time.perf_counter() - start
+
+
+def code_with_proxies(lines: int) -> float:
+    body = get_body_writer(Document())
+    start = time.perf_counter()
+    for i in range(lines):
+        if i % RUNS_PER_PARAGRAPH == 0:
+            paragraph = body.add_paragraph()
+        else:
+            paragraph.add_run('\n')
+        run = paragraph.add_run(f"    value_{i} = compute({i})")
+        run.font.name = 'Consolas'
+        run.font.color.rgb = RGBColor(51, 51, 51)
+    return time.perf_counter() - start
+
+
+def code_with_builder(lines: int) -> float:
+    body = get_body_writer(Document())
+    rpr = run_properties(font='Consolas', color='333333')
+    start = time.perf_counter()
+    for i in range(lines):
+        if i % RUNS_PER_PARAGRAPH == 0:
+            p = body.add_paragraph()._p
+        else:
+            p.append(new_run('\n'))
+        p.append(new_run(f"    value_{i} = compute({i})", rpr))
+    return time.perf_counter() - start
+
+
+def build_document(paragraphs: int) -> str:
+    """生成文字密集的文档：每段包含多种格式和行内代码"""
+    return "\n\n".join(
+        f"第 {i} 段普通文字 **粗体** 普通 *斜体* 普通 ~~删除~~ 普通 `code_{i}` "
+        f"***粗斜体*** 结尾文字" for i in range(paragraphs))
+
+
+def run(runs: int = 100000, paragraphs: int = 10000) -> None:
+    print(f"{'场景':<16} {'代理对象(s)':>12} {'builder(s)':>12} {'加速':>8}")
+    for name, proxies, builder in (('格式化 run', with_proxies, with_builder),
+                                   ('代码行', code_with_proxies, code_with_builder)):
+        a = proxies(runs)
+        b = builder(runs)
+        print(f"{name:<16} {a:>12.3f} {b:>12.3f} {a / b:>7.1f}x")
+
+    md_text = build_document(paragraphs)
+    start = time.perf_counter()
+    BaseConverter().convert(md_text)
+    print(f"转换 {paragraphs} 个文字密集段落: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    run()
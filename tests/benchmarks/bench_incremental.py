@@ -0,0 +1,40 @@
+"""
+增量转换基准测试
+
+用法: python tests/benchmarks/bench_incremental.py [章节数]
+
+生成多章节手册，分别计时：不使用缓存、冷缓存首次转换、
+修改一个段落后的增量转换。
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.converter import BaseConverter
+from src.converter.cache import BlockCache
+from tests.benchmarks.bench_parallel import build_manual
+
+
+def timed(converter: BaseConverter, md_text: str) -> float:
+    start = time.perf_counter()
+    converter.convert(md_text)
+    return time.perf_counter() - start
+
+
+def run(chapters: int = 20) -> None:
+    md_text = build_manual(chapters)
+    edited = md_text.replace("段落", "修改后的段落", 1)
+    cache = BlockCache(max_entries=1 << 16)
+
+    plain = timed(BaseConverter(), md_text)
+    cold = timed(BaseConverter(block_cache=cache), md_text)
+    cache.hits = cache.misses = 0
+    warm = timed(BaseConverter(block_cache=cache), edited)
+    print(f"{chapters} 章: 无缓存 {plain:.2f}s, 冷缓存 {cold:.2f}s, "
+          f"修改一段后 {warm:.2f}s (命中 {cache.hits}, 未命中 {cache.misses})")
+
+
+if __name__ == '__main__':
+    run(*(int(arg) for arg in sys.argv[1:]))
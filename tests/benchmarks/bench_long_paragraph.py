@@ -0,0 +1,57 @@
+"""
+超长段落基准测试
+
+用法: python tests/benchmarks/bench_long_paragraph.py
+
+生成由软换行连接的日志行组成的单个段落（以及同样内容的引用块、带粗体的
+段落），大小从 125KB 翻倍到 1MB，输出转换耗时、每 MB 耗时和 run 数量。
+行内引擎按格式区间收集文本片段、每个区间只拼接一次，每 MB 耗时应基本不变。
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from docx.oxml.ns import qn
+
+from src.converter import BaseConverter
+
+LINE = "2024-01-01 12:00:00 INFO request handled in 12ms status=200 path=/api/v1/items"
+
+SCENARIOS = {
+    '段落': lambda i: f"{LINE} #{i}",
+    '引用块': lambda i: f"> {LINE} #{i}",
+    '粗体交替': lambda i: f"{LINE} **#{i}**",
+}
+
+
+def build_paragraph(size: int, line) -> str:
+    """生成约 size 字节、由软换行连接的单个段落"""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        text = line(i)
+        lines.append(text)
+        total += len(text.encode('utf-8')) + 1
+        i += 1
+    return "\n".join(lines) + "\n"
+
+
+def run(sizes=(125_000, 250_000, 500_000, 1_000_000)) -> None:
+    print(f"{'场景':<8} {'大小(KB)':>10} {'转换(s)':>10} {'每MB(s)':>10} {'run 数':>8}")
+    for name, line in SCENARIOS.items():
+        for size in sizes:
+            md_text = build_paragraph(size, line)
+            converter = BaseConverter()
+            start = time.perf_counter()
+            document = converter.convert(md_text)
+            elapsed = time.perf_counter() - start
+            runs = sum(1 for _ in document.element.body.iter(qn('w:r')))
+            print(f"{name:<8} {size / 1000:>10.0f} {elapsed:>10.3f} "
+                  f"{elapsed / (size / 1_000_000):>10.3f} {runs:>8}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,45 @@
+"""
+并行转换基准测试
+
+用法: python tests/benchmarks/bench_parallel.py [章节数] [进程数]
+
+生成多章节手册，分别计时顺序转换和按章节并行转换（含片段合并）。
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.converter import BaseConverter
+
+
+def build_manual(chapters: int) -> str:
+    """生成多章节手册"""
+    section = "\n\n".join(
+        ["段落 **粗体** 与 *斜体* [链接](http://example.com)"] * 20
+        + ["1. 步骤一\n2. 步骤二\n   - 细节"] * 5
+        + ["| 列 | 值 |\n|---|---|\n| a | 1 |\n| b | 2 |"] * 2
+    )
+    return "\n\n".join(f"# 第 {i} 章\n\n{section}" for i in range(chapters))
+
+
+def run(chapters: int = 50, workers: int = 0) -> None:
+    md_text = build_manual(chapters)
+
+    start = time.perf_counter()
+    sequential = BaseConverter().convert(md_text)
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = BaseConverter().convert_parallel(md_text, max_workers=workers or None)
+    parallel_time = time.perf_counter() - start
+
+    assert len(parallel.paragraphs) == len(sequential.paragraphs)
+    print(f"{chapters} 章: 顺序 {sequential_time:.2f}s, 并行 {parallel_time:.2f}s, "
+          f"加速比 {sequential_time / parallel_time:.2f}x")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,60 @@
+"""
+行内 run 合并基准测试
+
+用法: python tests/benchmarks/bench_runs.py
+
+生成强调密集的文档（换行分开的强调、相邻的同目标链接），分别在关闭和开启
+run 合并时转换并保存，输出 run 数量、document.xml 大小和保存耗时。
+"""
+import sys
+import time
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from docx.oxml.ns import qn
+
+from src.converter import BaseConverter
+from src.converter.runs import RunBuffer
+
+
+def build_document(paragraphs: int) -> str:
+    """生成强调密集的段落、列表项和引用"""
+    blocks = []
+    for i in range(paragraphs):
+        blocks.append(f"**第 {i} 段**\n**粗体续行**\n*斜体*\n*斜体续行* 普通 "
+                      f"[链接](http://example.com/{i})[续](http://example.com/{i})")
+        blocks.append(f"- **列表 {i}**\n  **续行**")
+        blocks.append(f"> *引用 {i}*\n> *续行*")
+    return "\n\n".join(blocks)
+
+
+def measure(md_text: str, coalesce: bool):
+    RunBuffer.coalesce = coalesce
+    converter = BaseConverter()
+    document = converter.convert(md_text)
+    runs = sum(1 for _ in document.element.body.iter(qn('w:r')))
+    buffer = BytesIO()
+    start = time.perf_counter()
+    converter.save(buffer)
+    save_time = time.perf_counter() - start
+    with zipfile.ZipFile(buffer) as package:
+        xml_size = package.getinfo('word/document.xml').file_size
+    return runs, xml_size, save_time
+
+
+def run(paragraphs: int = 5000) -> None:
+    md_text = build_document(paragraphs)
+    print(f"{'合并':>6} {'run 数':>10} {'document.xml(KB)':>18} {'保存(s)':>10}")
+    try:
+        for coalesce in (False, True):
+            runs, xml_size, save_time = measure(md_text, coalesce)
+            print(f"{'开' if coalesce else '关':>6} {runs:>10} {xml_size / 1024:>18.1f} {save_time:>10.3f}")
+    finally:
+        RunBuffer.coalesce = True
+
+
+if __name__ == '__main__':
+    run()
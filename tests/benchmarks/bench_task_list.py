@@ -0,0 +1,46 @@
+"""
+任务列表转换基准测试
+
+用法: python tests/benchmarks/bench_task_list.py [条目数 ...]
+
+生成大型任务清单并计时，同时用 cProfile 统计列表项节点创建的耗时占比。
+默认规模为 10000 条，可在命令行传入 100000 测试十万条清单。
+"""
+import cProfile
+import pstats
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.converter import BaseConverter
+
+
+def build_checklist(items: int) -> str:
+    """生成任务清单"""
+    return "\n".join(f"- [{'x' if i % 3 == 0 else ' '}] 任务 {i}" for i in range(items))
+
+
+def run(sizes=(10000,)) -> None:
+    for size in sizes:
+        md_text = build_checklist(size)
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        doc = BaseConverter().convert(md_text)
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        assert len(doc.paragraphs) == size
+
+        stats = pstats.Stats(profiler)
+        total = stats.total_tt or 1
+        ir_time = sum(
+            row[2] for func, row in stats.stats.items()
+            if func[0].endswith('ir.py') or func[2] == 'type'
+        )
+        print(f"{size} 条: {elapsed:.2f}s, 节点创建占比 {ir_time / total:.2%}")
+
+
+if __name__ == '__main__':
+    run(tuple(int(arg) for arg in sys.argv[1:]) or (10000,))
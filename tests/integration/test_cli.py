@@ -0,0 +1,42 @@
+"""
+命令行工具的集成测试
+"""
+import subprocess
+import sys
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+CLI = Path(__file__).resolve().parents[2] / 'src' / 'cli.py'
+
+MD_TEXT = """# 第一章
+
+段落 **粗体**
+
+```
+code
+```
+
+# 第二章
+
+| 列 | 值 |
+|---|---|
+| a | 1 |
+"""
+
+
+@pytest.mark.parametrize('options', [[], ['--jobs', '2']])
+def test_debug_output_to_stdout_is_valid_docx(tmp_path, options):
+    """测试写入标准输出时调试信息不混入文档"""
+    input_file = tmp_path / 'input.md'
+    input_file.write_text(MD_TEXT, encoding='utf-8')
+    result = subprocess.run([sys.executable, str(CLI),
+                             str(input_file), '-', '--debug', *options],
+                            capture_output=True, check=True)
+
+    assert zipfile.is_zipfile(BytesIO(result.stdout))
+    assert Document(BytesIO(result.stdout)).paragraphs[0].text == '第一章'
+    assert b'[tokens]' in result.stderr
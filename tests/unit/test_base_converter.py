@@ -0,0 +1,159 @@
+"""
+基础转换器测试模块
+"""
+import pytest
+from markdown_it import MarkdownIt
+from src.converter.base import BaseConverter
+from src.converter.elements.base import ElementConverter
+from src.converter.ir import build_ir
+
+
+def test_block_index():
+    """测试成对块级节点索引"""
+    tokens = MarkdownIt('commonmark').parse("> 引用\n\n- 列表项\n  1. 有序子项\n")
+    blocks = build_ir(tokens)
+
+    for start, block in blocks.items():
+        assert block.start == start
+        assert tokens[start].nesting == 1
+        assert tokens[block.end].nesting == -1
+        assert tokens[start].type.replace('_open', '') == tokens[block.end].type.replace('_close', '')
+
+    # blockquote_open 对应最外层的 blockquote_close
+    assert blocks[0].end == next(i for i, t in enumerate(tokens) if t.type == 'blockquote_close')
+
+    # 列表项节点记录列表类型和层级
+    items = [blocks[start].item for start in sorted(blocks) if blocks[start].item is not None]
+    assert [(item.level, item.ordered) for item in items] == [(1, False), (2, True)]
+    assert items[1].type == 'ordered_list_open'
+
+
+def test_default_handlers_registered():
+    """测试默认分派表"""
+    converter = BaseConverter()
+    for token_type in ('heading_open', 'paragraph_open', 'blockquote_open',
+                       'list_item_open', 'fence', 'table_open', 'hr', 'html_block'):
+        assert token_type in converter.handlers
+
+
+def test_register_converter_with_token_types():
+    """测试新转换器通过分派表注册"""
+    class FenceCollector(ElementConverter):
+        def __init__(self):
+            super().__init__()
+            self.seen = []
+
+        def convert(self, token, tokens=None):
+            self.seen.append((token.type, len(tokens) if tokens else 0))
+
+    converter = BaseConverter()
+    collector = FenceCollector()
+    converter.register_converter('collector', collector, token_types=('fence', 'blockquote_open'))
+
+    converter.convert("```\ncode\n```\n\n> 引用\n")
+    assert collector.seen[0] == ('fence', 0)
+    assert collector.seen[1][0] == 'blockquote_open'
+    assert collector.seen[1][1] == 5  # blockquote_open ... blockquote_close
+    assert collector.document is converter.document
+
+
+def test_nested_list_items_are_kept():
+    """测试嵌套列表项不会丢失"""
+    doc = BaseConverter().convert("* 第一级\n  * 第二级\n* 回到第一级\n")
+
+    assert [p.text for p in doc.paragraphs] == ["第一级", "第二级", "回到第一级"]
+    assert doc.paragraphs[1].style.name == "List Bullet 2"
+
+
+def test_missing_converter_does_not_hang():
+    """测试缺少转换器时不会卡在同一个标记上"""
+    converter = BaseConverter()
+    del converter.converters['heading']
+    del converter.converters['blockquote']
+
+    doc = converter.convert("# 标题\n\n> 引用\n")
+    assert [p.text for p in doc.paragraphs] == ["引用"]
+
+
+def test_linear_token_scan():
+    """测试大文档按标记线性转换"""
+    md_text = "\n".join(f"- 项目 {i}" for i in range(2000))
+    doc = BaseConverter().convert(md_text)
+    assert len(doc.paragraphs) == 2000
+
+
+def test_reset_starts_new_document():
+    """测试 reset 后转换到新文档且不遗留状态"""
+    converter = BaseConverter()
+    first = converter.convert("```\nfirst\n```\n\n1. 第一项\n2. 第二项")
+
+    second = converter.reset()
+    assert second is not first
+    assert converter.converters['text'].document is second
+
+    doc = converter.convert("```\nsecond\n```")
+    assert doc is second
+    # 上一个文档的代码块状态不应该在新文档中插入空行
+    assert [p.text for p in doc.paragraphs] == ["second"]
+    assert converter.converters['list']._numbering_cache == {}
+    assert len(first.paragraphs) == 3
+
+
+def test_reset_keeps_warm_caches():
+    """测试 reset 保留跨文档缓存"""
+    converter = BaseConverter()
+    converter.converters['image']._image_cache['logo.png'] = b'data'
+    parser = converter.md
+
+    converter.reset()
+    assert converter.converters['image']._image_cache == {'logo.png': b'data'}
+    assert converter.md is parser
+
+
+def test_reset_with_given_document():
+    """测试 reset 使用调用方提供的文档"""
+    from docx import Document
+    document = Document()
+    converter = BaseConverter()
+
+    assert converter.reset(document) is document
+    assert converter.convert("段落") is document
+    assert document.paragraphs[-1].text == "段落"
+
+
+class _WriteOnlyStream:
+    """只支持 write 的输出流，模拟套接字或 HTTP 响应"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def test_convert_to_bytes():
+    """测试直接生成 DOCX 文件内容"""
+    from io import BytesIO
+    from docx import Document
+
+    data = BaseConverter().convert_to_bytes("# 标题\n\n段落")
+
+    assert data[:2] == b'PK'
+    document = Document(BytesIO(data))
+    assert [p.text for p in document.paragraphs] == ['标题', '段落']
+
+
+def test_convert_to_stream_without_seek():
+    """测试写入不可定位的输出流"""
+    from io import BytesIO
+    from docx import Document
+
+    stream = _WriteOnlyStream()
+    BaseConverter().convert_to_stream("- 列表项\n\n**粗体**", stream)
+
+    document = Document(BytesIO(b''.join(stream.chunks)))
+    assert [p.text for p in document.paragraphs] == ['列表项', '粗体']
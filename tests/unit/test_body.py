@@ -0,0 +1,85 @@
+"""
+正文写入器测试模块
+"""
+from docx import Document
+from docx.oxml.ns import qn
+from docx.oxml.xmlchemy import BaseOxmlElement
+
+from src.converter.base import BaseConverter
+from src.converter.body import get_body_writer
+
+
+def test_matches_python_docx():
+    """测试添加的段落和表格与 python-docx 的结果相同"""
+    expected = Document()
+    expected.add_paragraph('文字', 'Heading 1')
+    expected.add_paragraph()
+    expected.add_table(rows=2, cols=3)
+    expected.add_table(rows=1, cols=1, style='Table Grid')
+
+    document = Document()
+    writer = get_body_writer(document)
+    paragraph = writer.add_paragraph('文字', 'Heading 1')
+    writer.add_paragraph()
+    writer.add_table(rows=2, cols=3)
+    table = writer.add_table(rows=1, cols=1, style='Table Grid')
+
+    assert document.element.body.xml == expected.element.body.xml
+    assert paragraph.text == '文字'
+    assert paragraph.part is document.part
+    assert table.style.name == 'Table Grid'
+    assert document.element.body[-1].tag == qn('w:sectPr')
+
+
+def test_last_block_and_paragraph():
+    """测试查找最后的块和段落"""
+    document = Document()
+    writer = get_body_writer(document)
+    assert writer.last_block() is None
+    assert writer.last_paragraph() is None
+
+    paragraph = writer.add_paragraph('一')
+    table = writer.add_table(rows=1, cols=1)
+    assert writer.last_block() is table._tbl
+    assert writer.last_paragraph()._p is paragraph._p
+
+
+def test_sect_pr_lookup_is_cached(monkeypatch):
+    """测试添加块时不再在正文的子元素中查找 sectPr"""
+    document = Document()
+    writer = get_body_writer(document)
+    writer.add_paragraph()
+
+    calls = []
+    original = BaseOxmlElement.first_child_found_in
+
+    def first_child_found_in(self, *tagnames):
+        if self.tag == qn('w:body'):
+            calls.append(tagnames)
+        return original(self, *tagnames)
+
+    monkeypatch.setattr(BaseOxmlElement, 'first_child_found_in', first_child_found_in)
+    md_text = "# 标题\n\n段落\n\n> 引用\n\n- 列表\n\n```\ncode\n```\n\n---\n\n| a |\n|---|\n| 1 |\n"
+    converter = BaseConverter()
+    converter.convert(md_text * 20)
+    writer.add_paragraph()
+
+    assert calls == []
+
+
+def test_sect_pr_replaced():
+    """测试 sectPr 被移除或替换后重新定位"""
+    document = Document()
+    writer = get_body_writer(document)
+    writer.add_paragraph('一')
+
+    body = document.element.body
+    sect_pr = body[-1]
+    body.remove(sect_pr)
+    writer.add_paragraph('二')
+    assert [p.text for p in document.paragraphs] == ['一', '二']
+
+    body.append(sect_pr)
+    writer.add_paragraph('三')
+    assert body[-1] is sect_pr
+    assert [p.text for p in document.paragraphs] == ['一', '二', '三']
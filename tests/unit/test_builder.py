@@ -0,0 +1,42 @@
+"""
+底层元素构建测试模块
+"""
+import pytest
+from docx import Document
+from docx.shared import RGBColor
+from lxml import etree
+
+from src.converter.builder import new_paragraph, new_run, run_properties
+
+
+@pytest.mark.parametrize('text', ['文字', ' 前后空白 ', '制表\t符', '换\n行\r\n', ''])
+def test_run_matches_python_docx(text):
+    """测试生成的 run 与 python-docx 生成的相同"""
+    run = Document().add_paragraph().add_run(text)
+    run.bold = True
+    run.italic = True
+    run.font.strike = True
+    run.font.name = 'Consolas'
+    run.font.color.rgb = RGBColor(51, 51, 51)
+    r = new_run(text, run_properties(True, True, True, 'Consolas', '333333'))
+    # 放进同一个段落，使两者序列化时的命名空间声明相同
+    run._parent._p.append(r)
+    assert etree.tostring(r) == etree.tostring(run._r)
+
+
+def test_templates_are_shared_and_copied():
+    """测试同一格式组合只构建一个模板，生成的 run 使用副本"""
+    rpr = run_properties(bold=True)
+    assert run_properties(bold=True) is rpr
+    assert run_properties() is None
+    r = new_run('粗体', rpr)
+    assert r.rPr is not rpr
+    assert r.rPr.getparent() is r
+    assert rpr.getparent() is None
+
+
+def test_new_paragraph_with_style():
+    """测试生成带样式的段落"""
+    p = new_paragraph('Code')
+    assert p.style == 'Code'
+    assert new_paragraph().pPr is None
@@ -0,0 +1,159 @@
+"""
+增量转换块缓存测试模块
+"""
+import pickle
+import struct
+import zlib
+
+from lxml import etree
+from docx.oxml.ns import qn
+from src.converter.base import BaseConverter
+from src.converter.cache import BlockCache, CachedBlock
+
+
+MD_TEXT = """# 标题
+
+第一段 **粗体** [链接](http://example.com)
+
+1. 第一项
+2. 第二项
+   - 嵌套项
+
+```python
+print("a")
+```
+
+```python
+print("b")
+```
+
+> 引用
+
+| 列 | 值 |
+|---|---|
+| a | 1 |
+
+1. 新列表
+"""
+
+
+def _png(path):
+    """写入一个 1x1 的 PNG 图片"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    path.write_bytes(b'\x89PNG\r\n\x1a\n'
+                     + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+                     + chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff'))
+                     + chunk(b'IEND', b''))
+    return path
+
+
+def snapshot(document):
+    """文档正文、编号定义和列表样式的 XML"""
+    styles = [etree.tostring(document.styles[name]._element)
+              for name in ('List Number', 'List Bullet 2')]
+    return (etree.tostring(document.element.body),
+            etree.tostring(document.part.numbering_part.element), styles)
+
+
+def test_second_conversion_hits_every_block():
+    """测试重复转换时全部顶层块命中缓存，结果与首次一致"""
+    cache = BlockCache()
+    first = BaseConverter(block_cache=cache).convert(MD_TEXT)
+    assert cache.hits == 0
+    blocks = cache.misses
+
+    second = BaseConverter(block_cache=cache).convert(MD_TEXT)
+    assert cache.hits == blocks
+    assert snapshot(second) == snapshot(first)
+    assert snapshot(first) == snapshot(BaseConverter().convert(MD_TEXT))
+
+
+def test_edit_reconverts_only_changed_block():
+    """测试只重新转换改动的块"""
+    cache = BlockCache()
+    BaseConverter(block_cache=cache).convert(MD_TEXT)
+    blocks = cache.misses
+
+    edited = MD_TEXT.replace("第一段", "改过的第一段")
+    cache.hits = cache.misses = 0
+    document = BaseConverter(block_cache=cache).convert(edited)
+    assert (cache.hits, cache.misses) == (blocks - 1, 1)
+    assert snapshot(document) == snapshot(BaseConverter().convert(edited))
+
+
+def test_context_changes_invalidate_blocks():
+    """测试前面的列表变化后，依赖编号上下文的块重新转换"""
+    cache = BlockCache()
+    BaseConverter(block_cache=cache).convert(MD_TEXT)
+
+    edited = MD_TEXT.replace("1. 第一项\n2. 第二项\n   - 嵌套项\n", "- 无序项\n")
+    document = BaseConverter(block_cache=cache).convert(edited)
+    assert snapshot(document) == snapshot(BaseConverter().convert(edited))
+
+
+def test_replayed_numbering_keeps_schema_order():
+    """测试新建列表之后回放缓存的列表，抽象编号定义仍在所有编号实例之前"""
+    md_text = "1. 第一项\n\n段落\n\n- 无序项\n\n段落\n\n1. 新列表\n"
+    cache = BlockCache()
+    BaseConverter(block_cache=cache).convert(md_text)
+
+    # 只改动第一个列表的文字，它重新转换，后面的列表命中缓存
+    edited = md_text.replace("第一项", "改过的第一项")
+    cache.hits = cache.misses = 0
+    document = BaseConverter(block_cache=cache).convert(edited)
+    assert cache.misses == 1 and cache.hits > 0
+
+    tags = [child.tag for child in document.part.numbering_part.element]
+    first_num = tags.index(qn('w:num'))
+    assert qn('w:abstractNum') not in tags[first_num:]
+    assert snapshot(document) == snapshot(BaseConverter().convert(edited))
+
+
+def test_shared_image_relationship(tmp_path):
+    """测试复用的块重新建立它引用的图片关系"""
+    image = _png(tmp_path / 'dot.png')
+    cache = BlockCache()
+    BaseConverter(block_cache=cache).convert(f"![一]({image})\n\n段落\n\n![二]({image})\n")
+
+    # 第一张图片所在的块被删除后，第二个块仍需要图片关系
+    document = BaseConverter(block_cache=cache).convert(f"段落\n\n![二]({image})\n")
+    assert cache.hits == 2
+    blip = document.element.body.find('.//' + qn('a:blip'))
+    assert document.part.rels[blip.get(qn('r:embed'))].target_part.blob == image.read_bytes()
+
+
+def test_lru_eviction():
+    """测试超过容量时淘汰最久未使用的块"""
+    cache = BlockCache(max_entries=2)
+    entry = CachedBlock([], [], [], [], None)
+    cache.put('a', entry)
+    cache.put('b', entry)
+    assert cache.get('a') is entry
+    cache.put('c', entry)
+    assert cache.get('b') is None
+    assert len(cache) == 2
+
+
+def test_persistence(tmp_path):
+    """测试缓存保存到磁盘后可以加载复用"""
+    path = str(tmp_path / 'blocks.cache')
+    cache = BlockCache(path=path)
+    BaseConverter(block_cache=cache).convert(MD_TEXT)
+    cache.save()
+
+    loaded = BlockCache(path=path)
+    assert len(loaded) == len(cache)
+    document = BaseConverter(block_cache=loaded).convert(MD_TEXT)
+    assert loaded.misses == 0
+    assert snapshot(document) == snapshot(BaseConverter().convert(MD_TEXT))
+
+
+def test_load_ignores_other_versions(tmp_path):
+    """测试忽略版本不符或损坏的缓存文件"""
+    path = tmp_path / 'blocks.cache'
+    path.write_bytes(pickle.dumps((-1, [('key', CachedBlock([], [], [], [], None))])))
+    assert len(BlockCache(path=str(path))) == 0
+
+    path.write_bytes(b'not a pickle')
+    assert len(BlockCache(path=str(path))) == 0
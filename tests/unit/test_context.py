@@ -0,0 +1,95 @@
+"""
+转换上下文测试模块
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from docx import Document
+from lxml import etree
+
+from src.converter.base import BaseConverter
+from src.converter.context import ConversionContext, DocumentState, current_context
+from src.converter.elements.base import ElementConverter
+
+
+def sample(n):
+    """不同文档使用不同的列表、代码和引用组合"""
+    parts = [f"# 文档 {n}"]
+    for i in range(n % 4 + 2):
+        parts.append(f"{i + 1}. 有序 {n}.{i}\n   - 嵌套 {i}")
+        parts.append(f"```\ncode {n}\n```")
+        parts.append(f"> 引用 **{n}**\n>\n> - 引用中的列表")
+        parts.append(f"| a | b |\n|---|---|\n| {n} | *{i}* |")
+    return "\n\n".join(parts)
+
+
+def body_xml(document):
+    return etree.tostring(document.element.body)
+
+
+def test_shared_converter_across_threads():
+    """测试同一个转换器在多个线程中并发转换，结果与单独转换一致"""
+    inputs = [sample(n) for n in range(8)]
+    expected = [body_xml(BaseConverter().convert(text)) for text in inputs]
+
+    converter = BaseConverter()
+
+    def convert(text):
+        context = converter.new_context()
+        return body_xml(converter.convert(text, context=context))
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(convert, inputs * 2))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert results == expected * 2
+
+
+def test_convert_to_bytes_uses_new_context():
+    """测试 convert_to_bytes 不影响默认上下文"""
+    converter = BaseConverter()
+    converter.convert("段落")
+    converter.convert_to_bytes("1. 有序")
+
+    assert [p.text for p in converter.document.paragraphs] == ['段落']
+
+
+def test_contexts_are_isolated():
+    """测试列表编号等文档级状态不在上下文之间共享"""
+    converter = BaseConverter()
+    first = converter.new_context()
+    second = converter.new_context()
+
+    converter.convert("1. 一\n2. 二", context=first)
+    converter.convert("段落", context=second)
+    converter.convert("3. 三", context=first)
+
+    list_converter = converter.converters['list']
+    with first.activate():
+        assert list_converter._current_numbers
+    with second.activate():
+        assert list_converter._current_numbers == {}
+    assert current_context() is None
+
+
+class _Counter(ElementConverter):
+    count = DocumentState(int)
+
+
+def test_document_state_falls_back_to_instance():
+    """测试不在转换中时文档级属性保存在实例上"""
+    counter = _Counter()
+    counter.count += 1
+    assert counter.count == 1
+
+    context = ConversionContext(Document())
+    with context.activate():
+        assert counter.count == 0
+        counter.count = 5
+        assert counter.document is context.document
+    assert counter.count == 1
+    assert context.states[counter] == {'count': 5}
@@ -4,6 +4,8 @@
 import pytest
 from docx import Document
 from markdown_it import MarkdownIt
+from docx.shared import Pt
+from docx.oxml.ns import qn
 from src.converter.base import BaseConverter
 from src.converter.elements import BlockquoteConverter, TextConverter
 
@@ -80,4 +82,47 @@ def test_empty_blockquote():
     
     doc = converter.convert(md_text)
     assert len(doc.paragraphs) == 1
-    assert doc.paragraphs[0].text == "" 
\ No newline at end of file
+    assert doc.paragraphs[0].text == "" 
+
+def test_blockquote_with_block_content():
+    """测试引用块内的列表、代码和表格"""
+    md_text = """> 引用段落
+> - 列表项
+>
+> ```
+> code
+> ```
+>
+> | a | b |
+> |---|---|
+> | 1 | 2 |"""
+
+    doc = BaseConverter().convert(md_text)
+    texts = [p.text for p in doc.paragraphs]
+    assert texts == ["引用段落", "列表项", "code"]
+    assert doc.paragraphs[0].style.name == "Quote"
+    assert doc.paragraphs[1].style.name == "List Bullet"
+    assert doc.paragraphs[1].paragraph_format.left_indent == Pt(30)
+    # 代码块保留自身的缩进，再加上引用缩进
+    assert doc.paragraphs[2].paragraph_format.left_indent == Pt(32 + 30)
+    assert len(doc.tables) == 1
+    tbl_ind = doc.tables[0]._tbl.tblPr.find(qn('w:tblInd'))
+    assert tbl_ind is not None and tbl_ind.get(qn('w:w')) == str(Pt(30).twips)
+
+
+def test_sibling_blockquotes_keep_level():
+    """测试相邻的引用块不会累加层级"""
+    md_text = "> 第一个引用\n\n> 第二个引用\n\n> 第三个引用"
+
+    doc = BaseConverter().convert(md_text)
+    assert [p.style.name for p in doc.paragraphs] == ["Quote", "Quote", "Quote"]
+
+
+def test_nested_blockquote_inner_blocks():
+    """测试嵌套引用块内的子块使用内层缩进"""
+    md_text = "> 外层\n> > - 内层列表"
+
+    doc = BaseConverter().convert(md_text)
+    assert doc.paragraphs[0].style.name == "Quote"
+    assert doc.paragraphs[1].text == "内层列表"
+    assert doc.paragraphs[1].paragraph_format.left_indent == Pt(60)
@@ -78,4 +78,16 @@ def special_chars():
     doc = base_converter.convert(markdown)
     paragraphs = doc.paragraphs
     assert len(paragraphs) == 1
-    assert paragraphs[0].text == 'def special_chars():\n    # 这是一个注释\n    print("特殊字符：!@#$%^&*()")' 
\ No newline at end of file
+    assert paragraphs[0].text == 'def special_chars():\n    # 这是一个注释\n    print("特殊字符：!@#$%^&*()")' 
+
+def test_code_lines_reference_character_style(base_converter):
+    """测试代码行只引用代码字符样式，字体和颜色来自样式"""
+    doc = base_converter.convert("```\na = 1\nb = 2\n```")
+    runs = [run for run in doc.paragraphs[0].runs if run.text != '\n']
+    assert [run.text for run in runs] == ['a = 1', 'b = 2']
+    for run in runs:
+        assert run.style.name == 'Code Char'
+        assert len(run._r.rPr) == 1
+    style = runs[0].style
+    assert style.font.name == 'Consolas'
+    assert style.font.color.rgb == RGBColor(0x33, 0x33, 0x33)
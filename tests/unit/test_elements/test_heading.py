@@ -3,6 +3,7 @@
 """
 import pytest
 from docx import Document
+from docx.shared import Pt
 from markdown_it import MarkdownIt
 from src.converter.base import BaseConverter
 from src.converter.elements.heading import HeadingConverter
@@ -65,4 +66,15 @@ def test_document_not_set():
     tokens = MarkdownIt().parse("# 测试")
     
     with pytest.raises(ValueError, match="Document not set"):
-        converter.convert((tokens[0], tokens[1])) 
\ No newline at end of file
+        converter.convert((tokens[0], tokens[1])) 
+
+def test_heading_format_comes_from_styles():
+    """测试标题的字号和粗体写在标题样式中，run 不带直接格式"""
+    doc = BaseConverter().convert("# 一级标题\n\n###### 六级标题")
+    first, sixth = doc.paragraphs
+    assert first.style.font.size == Pt(24)
+    assert first.style.font.bold is True
+    assert sixth.style.font.size == Pt(12)
+    assert sixth.style.font.bold is False
+    for paragraph in (first, sixth):
+        assert all(run._r.rPr is None for run in paragraph.runs)
@@ -11,7 +11,8 @@ from docx.text.run import Run
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 from markdown_it import MarkdownIt
-from src.converter.elements.image import ImageConverter
+from src.converter.base import BaseConverter
+from src.converter.elements.image import ImageCache, ImageConverter
 
 
 class TestImageConverter:
@@ -239,4 +240,37 @@ class TestImageConverter:
         # 验证解析结果
         assert tokens[1].children[1].type == 'image'
         assert tokens[1].children[1].attrs['src'] == 'test.png'
-        assert tokens[1].children[1].content == '内联图片' 
\ No newline at end of file
+        assert tokens[1].children[1].content == '内联图片' 
+
+def test_image_cache_evicts_by_count_and_bytes():
+    """测试图片缓存超过图片数或总字节数时淘汰最久未使用的图片"""
+    cache = ImageCache(max_entries=3, max_bytes=10)
+    cache['a'] = b'1234'
+    cache['b'] = b'1234'
+    assert cache['a'] == b'1234'
+    cache['c'] = b'1234'
+    # 总字节数超出，淘汰最久未使用的 b
+    assert list(cache) == ['a', 'c']
+    assert cache.total_bytes == 8
+    cache['d'] = b'1'
+    cache['e'] = b'1'
+    assert list(cache) == ['c', 'd', 'e']
+    # 单张超过上限的图片不缓存
+    cache['big'] = b'x' * 11
+    assert 'big' not in cache
+    assert cache.total_bytes == 6
+
+
+def test_shared_converter_image_cache_is_bounded(tmp_path):
+    """测试共享的转换器连续转换大量不同图片时缓存不会无限增长"""
+    converter = BaseConverter()
+    image_converter = converter.converters['image']
+    assert isinstance(image_converter._image_cache, ImageCache)
+    cache = image_converter._image_cache = ImageCache(max_entries=8)
+    for i in range(cache.max_entries + 20):
+        path = tmp_path / f'{i}.bin'
+        path.write_bytes(b'x' * 100)
+        converter.reset()
+        converter.convert(f"![图]({path.as_posix()})\n")
+    assert len(cache) == cache.max_entries
+    assert cache.total_bytes == 100 * cache.max_entries
@@ -0,0 +1,91 @@
+"""
+导入开销测试模块
+
+在新的子进程中导入转换器，检查重量级依赖只在需要时才加载。
+"""
+import modulefinder
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 冷启动导入耗时上限（微秒），留出慢速 CI 机器的余量
+PACKAGE_IMPORT_BUDGET_US = 50_000
+BASE_IMPORT_BUDGET_US = 1_000_000
+
+
+def loaded_modules(code):
+    """在新进程中运行代码，返回运行后 sys.modules 中的模块名"""
+    code += '\nimport sys\nprint("\\n".join(sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def import_time(module):
+    """用 ``python -X importtime`` 在新进程中导入模块，返回模块名 -> 累计耗时（微秒）"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time_budget():
+    """测试冷启动导入包和基础转换器的耗时在预算之内"""
+    times = import_time('src.converter')
+    assert times['src.converter'] < PACKAGE_IMPORT_BUDGET_US
+    assert 'docx' not in times
+
+    times = import_time('src.converter.base')
+    assert times['src.converter.base'] < BASE_IMPORT_BUDGET_US
+    for name in ('requests', 'html2docx', 'src.converter.elements.image'):
+        assert name not in times
+
+
+def test_lazy_modules_are_visible_to_bundlers():
+    """测试按需导入的模块仍能被静态分析发现，PyInstaller 打包时不会遗漏"""
+    finder = modulefinder.ModuleFinder(
+        path=[str(PROJECT_ROOT)] + sys.path,
+        excludes=['docx', 'lxml', 'markdown_it', 'PIL', 'requests', 'html2docx'])
+    finder.import_hook('src.converter.base')
+    finder.import_hook('src.converter')
+    found = set(finder.modules) | set(finder.badmodules)
+    for name in ('heading', 'text', 'blockquote', 'list', 'code', 'links',
+                 'image', 'table', 'hr', 'task_list', 'html'):
+        assert f'src.converter.elements.{name}' in found
+    # 排除的第三方模块被记入 badmodules，说明导入语句已被发现
+    for name in ('requests', 'html2docx'):
+        assert name in finder.badmodules
+
+
+def test_package_import_is_lazy():
+    """测试导入包本身不加载 python-docx、markdown-it 和转换器模块"""
+    modules = loaded_modules('import src.converter')
+    for name in ('docx', 'markdown_it', 'src.converter.base', 'src.converter.elements'):
+        assert name not in modules
+
+
+def test_base_import_skips_optional_dependencies():
+    """测试导入基础转换器不加载具体的转换器模块和可选依赖"""
+    modules = loaded_modules('import src.converter.base')
+    assert 'src.converter.base' in modules
+    for name in ('requests', 'html2docx', 'concurrent.futures',
+                 'src.converter.elements.image', 'src.converter.elements.html'):
+        assert name not in modules
+
+
+def test_conversion_without_online_images_skips_requests():
+    """测试转换不含在线图片的文档时不导入 requests"""
+    modules = loaded_modules(
+        'from src.converter import BaseConverter\n'
+        'BaseConverter().convert("# 标题\\n\\n段落 [链接](http://example.com)\\n\\n![图](missing.png)")'
+    )
+    assert 'src.converter.elements.image' in modules
+    assert 'requests' not in modules
+    assert 'html2docx' not in modules
@@ -0,0 +1,108 @@
+"""
+行内渲染引擎测试模块
+"""
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from markdown_it import MarkdownIt
+
+from src.converter.base import BaseConverter
+from src.converter import inline
+from src.converter.inline import register_inline_handler, render_inline
+
+
+def _convert(md_text):
+    return BaseConverter().convert(md_text)
+
+
+def _children(md_text):
+    tokens = MarkdownIt('commonmark').enable('strikethrough').parse(md_text)
+    return next(token for token in tokens if token.type == 'inline').children
+
+
+def test_nested_formats_use_style_stack():
+    """测试嵌套格式按栈恢复外层格式"""
+    runs = _convert("**粗 *粗斜* 粗**\n").paragraphs[0].runs
+    assert [(run.text, run.bold, run.italic) for run in runs] == [
+        ('粗 ', True, None), ('粗斜', True, True), (' 粗', True, None)]
+
+
+def test_code_inline_uses_monospace_font():
+    """测试行内代码使用等宽字体"""
+    runs = _convert("调用 `main()` 函数\n").paragraphs[0].runs
+    assert [run.text for run in runs] == ['调用 ', 'main()', ' 函数']
+    assert runs[1].style.name == 'Code Char'
+    assert runs[1].style.font.name == 'Consolas'
+    assert runs[0]._r.rPr is None
+
+
+def test_hardbreak_is_rendered_as_break():
+    """测试硬换行生成 w:br"""
+    paragraph = _convert("第一行\\\n第二行\n").paragraphs[0]
+    assert paragraph._p.findall('.//' + qn('w:br'))
+    assert paragraph.text == '第一行\n第二行'
+
+
+def test_heading_keeps_inline_formatting_and_links():
+    """测试标题中的粗体和链接"""
+    paragraph = _convert("# 标题 **粗体** [链接](http://example.com)\n").paragraphs[0]
+    assert paragraph.style.name == 'Heading 1'
+    assert [(run.text, run.bold) for run in paragraph.runs] == [('标题 ', None), ('粗体 ', True)]
+    hyperlinks = paragraph._p.findall(qn('w:hyperlink'))
+    assert len(hyperlinks) == 1
+    # 字号和粗体来自标题样式，run 上不重复设置
+    assert paragraph.style.font.size == Pt(24)
+    assert paragraph.style.font.bold is True
+    assert not paragraph._p.findall('.//' + qn('w:sz'))
+
+
+def test_table_cells_render_inline_content():
+    """测试表格单元格中的格式和链接，表头为粗体"""
+    document = _convert("| 名称 | 地址 |\n| --- | --- |\n| *斜体* | [链接](http://example.com) |\n")
+    table = document.tables[0]
+    header = table.cell(0, 0).paragraphs[0]
+    assert all(run.bold for run in header.runs)
+    body = table.cell(1, 0).paragraphs[0]
+    assert [(run.text, run.italic) for run in body.runs] == [('斜体', True)]
+    link = table.cell(1, 1).paragraphs[0]
+    assert link._p.findall(qn('w:hyperlink'))
+
+
+def test_marker_next_to_link_applies_format():
+    """测试中文中紧贴链接的强调定界符"""
+    paragraph = _convert("文字**[链接](http://example.com)**文字\n").paragraphs[0]
+    assert paragraph.text == '文字链接文字'
+    hyperlink = paragraph._p.find(qn('w:hyperlink'))
+    assert hyperlink.find(qn('w:r')).find(qn('w:rPr')).find(qn('w:b')) is not None
+    assert [(run.text, run.bold) for run in paragraph.runs] == [('文字', None), ('文字', None)]
+
+
+def test_register_inline_handler(monkeypatch):
+    """测试注册新的行内标记处理函数"""
+    monkeypatch.setattr(inline, 'INLINE_HANDLERS', dict(inline.INLINE_HANDLERS))
+
+    def upper_text(state, i):
+        state.buffer.add(state.children[i].content.upper(), state.format)
+        return i + 1
+
+    register_inline_handler('text', upper_text)
+    paragraph = Document().add_paragraph()
+    render_inline(paragraph, _children("abc *def*\n"))
+    assert paragraph.text == 'ABC DEF'
+
+
+def test_hyperlink_runs_reference_style():
+    """测试超链接 run 只引用 Hyperlink 样式和开启的格式"""
+    paragraph = _convert("[链接](http://example.com) **[粗体](http://example.org)**\n").paragraphs[0]
+    plain, bold = [h.find(qn('w:r')).rPr for h in paragraph._p.findall(qn('w:hyperlink'))]
+    assert [child.tag for child in plain] == [qn('w:rStyle')]
+    assert [child.tag for child in bold] == [qn('w:rStyle'), qn('w:b')]
+
+
+def test_unclosed_marker_before_link_is_literal():
+    """测试链接前的定界符没有对应的结束定界符时按原文输出，格式不泄漏"""
+    paragraph = _convert("a **[x](http://u) b **c**\n").paragraphs[0]
+    assert paragraph.text == 'a **x b c'
+    hyperlink = paragraph._p.find(qn('w:hyperlink'))
+    assert hyperlink.find(qn('w:r')).find(qn('w:rPr')).find(qn('w:b')) is None
+    assert [(run.text, run.bold) for run in paragraph.runs] == [('a **', None), (' b ', None), ('c', True)]
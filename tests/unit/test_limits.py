@@ -0,0 +1,132 @@
+"""
+资源限制测试模块
+"""
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+
+import pytest
+from src.converter import BaseConverter, ConvertError, LimitExceededError, Limits
+from src.converter.errors import ConversionCancelled
+from src.converter.limits import ResourceGovernor
+
+
+def convert(md_text, **limits):
+    return BaseConverter(limits=Limits(**limits)).convert(md_text)
+
+
+def test_limit_error_is_convert_error():
+    """测试超出限制的异常是 ConvertError 并注明限制名称"""
+    with pytest.raises(ConvertError) as info:
+        convert("段落" * 100, max_input_bytes=10)
+    assert isinstance(info.value, LimitExceededError)
+    assert info.value.limit == 'max_input_bytes'
+    assert info.value.value > info.value.maximum == 10
+    assert 'max_input_bytes' in str(info.value)
+
+
+def test_input_bytes_counts_utf8():
+    """测试输入大小按 UTF-8 字节计算"""
+    convert("段落", max_input_bytes=6)
+    with pytest.raises(LimitExceededError):
+        convert("段落", max_input_bytes=5)
+
+
+def test_token_count():
+    """测试标记数限制"""
+    md_text = "\n\n".join(f"段落 {i}" for i in range(10))
+    convert(md_text, max_tokens=30)
+    with pytest.raises(LimitExceededError) as info:
+        convert(md_text, max_tokens=29)
+    assert info.value.limit == 'max_tokens'
+
+
+def test_nesting_depth():
+    """测试嵌套深度限制"""
+    md_text = "> " * 10 + "深层引用"
+    with pytest.raises(LimitExceededError) as info:
+        convert(md_text, max_depth=5)
+    assert info.value.limit == 'max_depth'
+
+
+def test_table_cells():
+    """测试表格单元格总数限制"""
+    table = "| a | b |\n|---|---|\n| 1 | 2 |\n"
+    convert(table + "\n" + table, max_table_cells=8)
+    with pytest.raises(LimitExceededError) as info:
+        convert(table + "\n" + table, max_table_cells=7)
+    assert info.value.limit == 'max_table_cells'
+
+
+def test_images(tmp_path):
+    """测试图片数量和总大小限制"""
+    image = tmp_path / 'image.png'
+    image.write_bytes(b'x' * 100)
+    md_text = f"![a]({image})\n\n![b]({image})\n\n![c](missing.png)\n"
+
+    with pytest.raises(LimitExceededError) as info:
+        convert(md_text, max_images=2)
+    assert info.value.limit == 'max_images'
+
+    with pytest.raises(LimitExceededError) as info:
+        convert(md_text, max_image_bytes=150)
+    assert info.value.limit == 'max_image_bytes'
+
+
+def test_deadline_stops_dispatch_loop():
+    """测试分派循环协作式检查截止时间"""
+    converter = BaseConverter(limits=Limits(timeout=0.05))
+    slow_calls = []
+
+    def slow_paragraph(tokens, i):
+        slow_calls.append(i)
+        time.sleep(0.02)
+        return i + 1
+
+    converter.register_handler('paragraph_open', slow_paragraph)
+    with pytest.raises(LimitExceededError) as info:
+        converter.convert("\n\n".join(f"段落 {i}" for i in range(100)))
+    assert info.value.limit == 'timeout'
+    assert len(slow_calls) < 10
+
+
+def test_usage_resets_per_conversion():
+    """测试每次转换重新计数"""
+    converter = BaseConverter(limits=Limits(max_tokens=5))
+    converter.convert("段落")
+    converter.reset()
+    converter.convert("段落")
+    assert converter.governor.tokens == 3
+
+
+def test_stream_counts_all_chunks():
+    """测试流式转换累计所有分块的输入"""
+    converter = BaseConverter(limits=Limits(max_input_bytes=100))
+    with pytest.raises(LimitExceededError):
+        converter.convert_stream(StringIO("段落\n\n" * 50), chunk_size=10)
+
+
+def test_remaining_caps_timeout():
+    """测试阻塞操作的超时不超过剩余时间"""
+    assert ResourceGovernor(Limits()).remaining(10) == 10
+    assert ResourceGovernor(Limits(timeout=1)).remaining(10) <= 1
+
+
+def test_errors_survive_pickle():
+    """测试异常经 pickle 往返后保留限制信息"""
+    error = pickle.loads(pickle.dumps(LimitExceededError('max_tokens', 12, 10)))
+    assert (error.limit, error.value, error.maximum) == ('max_tokens', 12, 10)
+    assert str(error) == "超出资源限制 max_tokens: 12 > 10"
+    assert str(pickle.loads(pickle.dumps(ConversionCancelled()))) == "转换已取消"
+
+
+def test_parallel_reraises_limit_from_worker():
+    """测试工作进程中超出限制时主进程收到同一个异常，执行器仍然可用"""
+    md_text = "# 一\n\n| a | b |\n| - | - |\n| 1 | 2 |\n\n# 二\n\n段落\n"
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        converter = BaseConverter(limits=Limits(max_table_cells=2))
+        with pytest.raises(LimitExceededError) as info:
+            converter.convert_parallel(md_text, executor=pool)
+        assert info.value.limit == 'max_table_cells'
+        BaseConverter().convert_parallel(md_text, executor=pool)
@@ -0,0 +1,167 @@
+"""
+并行转换测试模块
+"""
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+from src.converter.base import BaseConverter
+from src.converter.parallel import convert_section, follows_code, merge_fragments, split_sections
+
+
+MD_TEXT = """前言段落
+
+# 第一章
+
+1. 第一项
+2. 第二项
+
+[链接一](http://example.com/1)
+
+## 第一节
+
+- 无序项
+  - 嵌套项
+
+> 引用
+
+# 第二章
+
+1. 新的列表
+
+[链接二](http://example.com/2)
+"""
+
+
+def _png(path):
+    """写入一个 1x1 的 PNG 图片"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    data = (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff'))
+            + chunk(b'IEND', b''))
+    path.write_bytes(data)
+    return path
+
+
+def merged(md_text):
+    return merge_fragments(BaseConverter().document,
+                           [convert_section(section) for section in split_sections(md_text)])
+
+
+def test_split_sections():
+    """测试只在顶层一级/二级标题处切分"""
+    sections = split_sections(MD_TEXT)
+    assert [section.splitlines()[0] for section in sections] == \
+        ["前言段落", "# 第一章", "## 第一节", "# 第二章"]
+    assert ''.join(sections) == MD_TEXT
+
+    # 引用和列表内的标题、三级标题不切分
+    assert len(split_sections("# 章\n\n> # 引用标题\n\n- ## 列表标题\n\n### 小节\n")) == 1
+
+
+def test_merge_matches_sequential():
+    """测试合并结果与顺序转换的段落一致"""
+    sequential = BaseConverter().convert(MD_TEXT)
+    document = merged(MD_TEXT)
+
+    assert [(p.text, p.style.name) for p in document.paragraphs] == \
+        [(p.text, p.style.name) for p in sequential.paragraphs]
+    # sectPr 仍是正文最后一个元素
+    assert document.element.body[-1].tag == qn('w:sectPr')
+
+
+def test_merge_reconciles_ids():
+    """测试合并后关系 ID 和编号 ID 唯一且有效"""
+    document = merged(MD_TEXT)
+    part = document.part
+
+    links = document.element.body.findall('.//' + qn('w:hyperlink'))
+    targets = [part.rels[link.get(qn('r:id'))].target_ref for link in links]
+    assert targets == ["http://example.com/1", "http://example.com/2"]
+
+    numbering = part.numbering_part.element
+    num_ids = numbering.xpath('w:num/@w:numId')
+    abstract_ids = numbering.xpath('w:abstractNum/@w:abstractNumId')
+    assert len(num_ids) == len(set(num_ids))
+    assert len(abstract_ids) == len(set(abstract_ids))
+    for abstract_id in numbering.xpath('w:num/w:abstractNumId/@w:val'):
+        assert abstract_id in abstract_ids
+    # 抽象编号定义全部位于编号实例之前
+    tags = [child.tag for child in numbering]
+    assert tags.index(qn('w:num')) > max(i for i, tag in enumerate(tags) if tag == qn('w:abstractNum'))
+
+    # 列表样式引用的编号存在
+    style = document.styles['List Number']
+    assert str(style._element.pPr.numPr.numId.val) in num_ids
+
+
+def test_merge_images(tmp_path):
+    """测试图片关系重新分配并按内容去重"""
+    image = _png(tmp_path / 'dot.png')
+    document = merged(f"# 一\n\n![图]({image})\n\n# 二\n\n![图]({image})\n")
+
+    blips = document.element.body.findall('.//' + qn('a:blip'))
+    assert len(blips) == 2
+    r_ids = {blip.get(qn('r:embed')) for blip in blips}
+    assert len(r_ids) == 1
+    assert document.part.rels[r_ids.pop()].reltype == RT.IMAGE
+
+    doc_pr_ids = [doc_pr.get('id') for doc_pr in document.element.body.iter(qn('wp:docPr'))]
+    assert len(set(doc_pr_ids)) == 2
+
+    # 合并结果可以保存并重新打开
+    stream = BytesIO()
+    document.save(stream)
+    assert len(Document(BytesIO(stream.getvalue())).inline_shapes) == 2
+
+
+def test_convert_parallel_with_processes():
+    """测试在进程池中并行转换"""
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        document = BaseConverter().convert_parallel(MD_TEXT, executor=pool)
+
+    sequential = BaseConverter().convert(MD_TEXT)
+    assert [p.text for p in document.paragraphs] == [p.text for p in sequential.paragraphs]
+
+
+CODE_TEXT = """# 第一章
+
+```
+first()
+```
+
+# 第二章
+
+段落
+
+```
+second()
+```
+
+# 第三章
+
+- 列表项
+
+  ```
+  third()
+  ```
+"""
+
+
+def test_code_state_carries_across_sections():
+    """测试章节边界处的代码块与顺序转换一致：之前出现过代码块时同样插入空行"""
+    assert follows_code(split_sections(CODE_TEXT)) == [False, True, True]
+
+    sequential = BaseConverter().convert(CODE_TEXT)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        document = BaseConverter().convert_parallel(CODE_TEXT, executor=pool)
+
+    expected = [(p.text, p.style.name) for p in sequential.paragraphs]
+    assert [(p.text, p.style.name) for p in document.paragraphs] == expected
+    assert expected.count(('', 'Normal')) == 2
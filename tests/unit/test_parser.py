@@ -0,0 +1,48 @@
+"""
+解析器池测试模块
+"""
+import threading
+from src.converter.base import BaseConverter
+from src.converter.parser import get_parser, clear_parsers
+
+
+def test_parser_is_cached():
+    """测试同一线程内相同选项返回同一个解析器"""
+    assert get_parser() is get_parser()
+    assert get_parser(options={'html': True, 'breaks': True}) is get_parser()
+
+
+def test_parser_options_are_separate():
+    """测试不同选项使用不同的解析器"""
+    plain = get_parser(options={'html': False})
+    assert plain is not get_parser()
+    assert plain.options['html'] is False
+    assert get_parser().options['html'] is True
+
+
+def test_default_rules_enabled():
+    """测试默认解析器启用了表格和删除线"""
+    tokens = get_parser().parse("~~删除~~\n\n| a |\n|---|\n| 1 |")
+    assert any(t.type == 'table_open' for t in tokens)
+    assert any(c.type == 's_open' for c in tokens[1].children)
+
+
+def test_parser_per_thread():
+    """测试每个线程持有独立的解析器副本"""
+    parsers = []
+    thread = threading.Thread(target=lambda: parsers.append(get_parser()))
+    thread.start()
+    thread.join()
+    assert parsers[0] is not get_parser()
+
+
+def test_converters_share_parser():
+    """测试转换器复用同一个解析器"""
+    assert BaseConverter().md is BaseConverter().md
+
+
+def test_clear_parsers():
+    """测试清空解析器缓存"""
+    parser = get_parser()
+    clear_parsers()
+    assert get_parser() is not parser
@@ -0,0 +1,97 @@
+"""
+进度回调和取消测试模块
+"""
+import pytest
+
+from src.converter.base import BaseConverter
+from src.converter.cache import BlockCache
+from src.converter.errors import ConversionCancelled, ConvertError
+from src.converter.progress import CancellationToken, ProgressMonitor
+
+MARKDOWN = "\n\n".join(f"段落 {i}" for i in range(50))
+
+
+def test_progress_reports_start_and_finish():
+    """测试进度回调以 0 开始、以 total/total 结束且单调递增"""
+    calls = []
+    converter = BaseConverter()
+    converter.convert(MARKDOWN, progress=lambda done, total: calls.append((done, total)))
+
+    total = calls[0][1]
+    assert total == len(converter.md.parse(MARKDOWN))
+    assert calls[0] == (0, total)
+    assert calls[-1] == (total, total)
+    assert [done for done, _ in calls] == sorted(done for done, _ in calls)
+
+
+def test_progress_is_throttled():
+    """测试进度回调按时间间隔节流"""
+    calls = []
+    monitor = ProgressMonitor(100, lambda done, total: calls.append(done), interval=60)
+    for i in range(100):
+        monitor.update(i)
+    monitor.finish()
+
+    assert calls == [0, 100]
+
+
+def test_progress_without_throttle_reports_every_block():
+    """测试间隔为 0 时每个块都报告"""
+    calls = []
+    monitor = ProgressMonitor(3, lambda done, total: calls.append(done), interval=0)
+    for i in range(3):
+        monitor.update(i)
+
+    assert calls == [0, 0, 1, 2]
+
+
+def test_cancel_before_conversion():
+    """测试已取消的令牌不会开始转换"""
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(ConversionCancelled):
+        BaseConverter().convert(MARKDOWN, cancel=token)
+
+
+def _cancel_after(converter, token, count):
+    """包装文本转换器，转换 count 个段落后请求取消"""
+    text = converter.converters['text']
+    convert = text.convert
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == count:
+            token.cancel()
+        return convert(*args, **kwargs)
+
+    text.convert = wrapper
+
+
+def test_cancel_during_conversion():
+    """测试转换在请求取消后的下一个块之前停止"""
+    token = CancellationToken()
+    converter = BaseConverter()
+    _cancel_after(converter, token, 10)
+
+    with pytest.raises(ConversionCancelled) as exc_info:
+        converter.convert(MARKDOWN, cancel=token)
+
+    assert isinstance(exc_info.value, ConvertError)
+    assert len(converter.document.paragraphs) == 10
+
+
+def test_cancel_with_block_cache():
+    """测试增量转换在缓存命中时也检查取消"""
+    cache = BlockCache()
+    BaseConverter(block_cache=cache).convert(MARKDOWN)
+
+    token = CancellationToken()
+    converter = BaseConverter(block_cache=cache)
+    _cancel_after(converter, token, 1)
+
+    # 修改中间的段落：之前的块命中缓存，修改的块触发取消，之后的块不再回放
+    with pytest.raises(ConversionCancelled):
+        converter.convert(MARKDOWN.replace("段落 20", "修改的段落"), cancel=token)
+    assert len(converter.document.paragraphs) == 21
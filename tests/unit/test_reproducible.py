@@ -0,0 +1,113 @@
+"""
+可复现输出测试模块
+"""
+import struct
+import zipfile
+import zlib
+from io import BytesIO
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from src.converter.base import BaseConverter
+from src.converter.cache import BlockCache
+from src.converter.reproducible import save_reproducible
+
+
+def _png(path, rgb=b'\xff\xff\xff'):
+    """写入一个 1x1 的 PNG 图片"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    data = (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b'\x00' + rgb))
+            + chunk(b'IEND', b''))
+    path.write_bytes(data)
+    return str(path).replace('\\', '/')
+
+
+def sample(tmp_path):
+    """包含列表、链接、图片和表格的示例文档"""
+    red = _png(tmp_path / 'red.png', b'\xff\x00\x00')
+    blue = _png(tmp_path / 'blue.png', b'\x00\x00\xff')
+    return (f"# 标题\n\n- 项目\n- [链接](http://example.com)\n\n1. 有序\n\n"
+            f"![蓝]({blue})\n\n![红]({red})\n\n| a | b |\n|---|---|\n| 1 | 2 |\n")
+
+
+def test_identical_bytes(tmp_path):
+    """测试相同输入两次转换得到相同的字节"""
+    md_text = sample(tmp_path)
+    first = BaseConverter(deterministic=True).convert_to_bytes(md_text)
+    second = BaseConverter(deterministic=True).convert_to_bytes(md_text)
+
+    assert first == second
+    # 结果仍然是有效的文档
+    document = Document(BytesIO(first))
+    assert document.paragraphs[0].text == '标题'
+
+
+def test_zip_entries_are_fixed(tmp_path):
+    """测试 zip 条目按部件名排序且时间戳固定"""
+    data = BaseConverter(deterministic=True).convert_to_bytes(sample(tmp_path))
+
+    infos = zipfile.ZipFile(BytesIO(data)).infolist()
+    names = [info.filename for info in infos]
+    assert names[:2] == ['[Content_Types].xml', '_rels/.rels']
+    parts = [name for name in names[2:] if '_rels/' not in name]
+    assert parts == sorted(parts)
+    assert {info.date_time for info in infos} == {(1980, 1, 1, 0, 0, 0)}
+
+
+def test_source_date_epoch(tmp_path, monkeypatch):
+    """测试 SOURCE_DATE_EPOCH 决定时间戳和核心属性"""
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    data = BaseConverter(deterministic=True).convert_to_bytes("段落")
+
+    info = zipfile.ZipFile(BytesIO(data)).infolist()[0]
+    assert info.date_time == (2023, 11, 14, 22, 13, 20)
+    core = Document(BytesIO(data)).core_properties
+    assert core.created.year == 2023
+    assert core.modified == core.created
+    assert core.revision == 1
+
+
+def test_image_names_follow_document_order(tmp_path):
+    """测试图片部件按正文中首次引用的顺序命名，关系 ID 按引用顺序编号"""
+    data = BaseConverter(deterministic=True).convert_to_bytes(sample(tmp_path))
+    document = Document(BytesIO(data))
+
+    blips = list(document.element.body.iter(qn('a:blip')))
+    parts = [document.part.rels[blip.get(qn('r:embed'))].target_part for blip in blips]
+    assert [part.partname for part in parts] == ['/word/media/image1.png', '/word/media/image2.png']
+    # 第一张是先引用的蓝色图片
+    assert parts[0].blob == (tmp_path / 'blue.png').read_bytes()
+
+    referenced = [blip.get(qn('r:embed')) for blip in blips]
+    assert referenced == sorted(referenced, key=lambda r_id: int(r_id[3:]))
+    assert max(int(r_id[3:]) for r_id in document.part.rels) == len(document.part.rels)
+
+
+def test_incremental_conversion_gives_same_bytes(tmp_path):
+    """测试缓存回放和完整转换得到相同的字节"""
+    md_text = sample(tmp_path)
+    expected = BaseConverter(deterministic=True).convert_to_bytes(md_text)
+
+    cache = BlockCache()
+    BaseConverter(block_cache=cache).convert(md_text)
+    replayed = BaseConverter(block_cache=cache, deterministic=True).convert_to_bytes(md_text)
+
+    assert cache.hits > 0
+    assert replayed == expected
+
+
+def test_save_reproducible_on_document(tmp_path):
+    """测试直接保存 python-docx 文档"""
+    outputs = []
+    for _ in range(2):
+        document = Document()
+        document.add_paragraph('段落')
+        stream = BytesIO()
+        save_reproducible(document, stream)
+        outputs.append(stream.getvalue())
+
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,122 @@
+"""
+转换结果测试模块
+"""
+import json
+import struct
+import zlib
+from unittest.mock import MagicMock
+
+from src.converter.base import BaseConverter
+from src.converter.elements import html
+from src.converter.parallel import convert_parallel
+from src.converter.stats import ConversionStats
+
+
+def _png(path):
+    """写入一个 1x1 的 PNG 图片"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    data = (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff'))
+            + chunk(b'IEND', b''))
+    path.write_bytes(data)
+    return str(path).replace('\\', '/'), len(data)
+
+
+def test_element_counts_and_timings():
+    """测试元素数量和各阶段耗时"""
+    md_text = "# 标题\n\n段落 [链接](http://example.com)\n\n- 一\n- 二\n\n```\ncode\n```\n\n| a |\n|---|\n| 1 |\n"
+    result = BaseConverter().convert_with_result(md_text)
+
+    counts = result.element_counts
+    assert counts['heading'] == 1
+    assert counts['list'] == 1
+    assert counts['list_item'] == 2
+    assert counts['code'] == 1
+    assert counts['table'] == 1
+    assert counts['link'] == 1
+    assert result.timings['parse'] > 0
+    assert result.timings['convert'] > 0
+    assert not result.degraded
+    assert result.warnings == []
+
+
+def test_images_fetched_cached_and_failed(tmp_path):
+    """测试图片获取、缓存命中和失败的统计"""
+    path, size = _png(tmp_path / 'a.png')
+    missing = str(tmp_path / 'missing.png').replace('\\', '/')
+    md_text = f"![a]({path})\n\n![b]({path})\n\n![c]({missing})\n"
+    result = BaseConverter().convert_with_result(md_text)
+
+    stats = result.stats
+    assert (stats.images_fetched, stats.images_cached, stats.images_failed) == (1, 1, 1)
+    assert stats.image_bytes == 2 * size
+    assert result.degraded
+    assert len(result.warnings) == 1
+    assert result.warnings[0].source == 'image'
+    assert 'missing.png' in result.warnings[0].message
+
+
+def test_fallbacks_and_serialization():
+    """测试回退处理计数和序列化"""
+    result = BaseConverter().convert_with_result("<section><custom>内容</custom></section>\n")
+
+    assert result.fallbacks == {'html_text': 1}
+    assert result.degraded
+    data = json.loads(json.dumps(result.to_dict()))
+    assert data['fallbacks'] == {'html_text': 1}
+    assert data['degraded'] is True
+
+
+def test_html2docx_fallback_is_counted(monkeypatch):
+    """测试自定义解析失败后使用 html2docx 时记录回退，html2docx 失败时再记录纯文本回退"""
+    module = MagicMock()
+    module.convert.side_effect = RuntimeError('boom')
+    monkeypatch.setattr(html, 'HTML2DOCX_AVAILABLE', True)
+    monkeypatch.setattr(html, 'html2docx', module)
+    result = BaseConverter().convert_with_result("<section><custom>内容</custom></section>\n")
+
+    assert module.convert.called
+    assert result.fallbacks == {'html2docx': 1, 'html_text': 1}
+
+
+def test_each_call_has_own_stats():
+    """测试每次调用的统计互不影响"""
+    converter = BaseConverter()
+    first = converter.convert_with_result("# 一\n")
+    second = converter.convert_with_result("# 二\n\n# 三\n")
+
+    assert first.element_counts['heading'] == 1
+    assert second.element_counts['heading'] == 2
+    assert first.document is not second.document
+
+
+def test_parallel_merges_section_stats():
+    """测试并行转换累加各章节的统计"""
+    stats = ConversionStats()
+    md_text = "".join(f"# 章节 {i}\n\n段落\n\n![x](missing{i}.png)\n\n" for i in range(3))
+    convert_parallel(BaseConverter().document, md_text, max_workers=1, stats=stats)
+
+    assert stats.element_counts['heading'] == 3
+    assert stats.images_failed == 3
+    assert len(stats.warnings) == 3
+
+
+def test_parallel_merges_converter_stats():
+    """测试性能统计模式下并行转换累加各章节的转换器统计"""
+    converter = BaseConverter(profile=True)
+    md_text = "".join(f"# 章节 {i}\n\n段落\n\n" for i in range(3))
+    converter.convert_parallel(md_text, max_workers=1)
+
+    converters = converter.stats.converters
+    assert converters['heading'].calls == 3
+    assert converters['text'].calls == 3
+    assert converters['text'].elements == 3
+    assert converters['text'].time > 0
+
+    merged = ConversionStats()
+    merged.merge(converter.stats)
+    merged.merge(converter.stats)
+    assert merged.converters['heading'].calls == 6
+    assert merged.converters['text'].output_bytes == 2 * converters['text'].output_bytes
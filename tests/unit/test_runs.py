@@ -0,0 +1,67 @@
+"""
+行内 run 合并测试模块
+"""
+from docx.oxml.ns import qn
+
+from src.converter.base import BaseConverter
+from src.converter.runs import RunBuffer
+
+
+def _runs(md_text):
+    document = BaseConverter().convert(md_text)
+    return document.paragraphs[0].runs
+
+
+def test_whitespace_between_emphasis_is_merged():
+    """测试被换行分开的同格式强调合并为一个 run"""
+    runs = _runs("**甲**\n**乙** *丙*\n")
+    assert [(run.text, run.bold, run.italic) for run in runs] == [
+        ('甲 乙 ', True, None), ('丙', None, True)]
+
+
+def test_strike_whitespace_is_kept():
+    """测试删除线上的空白可见，不合并"""
+    runs = _runs("~~甲~~\n~~乙~~\n")
+    assert [run.text for run in runs] == ['甲', ' ', '乙']
+
+
+def test_text_around_missing_image_is_merged():
+    """测试图片缺失时前后的文本合并为一个 run"""
+    runs = _runs("前 ![图](missing.png) 后\n")
+    assert [run.text for run in runs] == ['前  后']
+
+
+def test_plain_runs_have_no_properties():
+    """测试普通文本的 run 不写入关闭的格式"""
+    runs = _runs("普通 **粗体**\n")
+    assert runs[0]._r.rPr is None
+    assert len(runs[1]._r.rPr) == 1
+
+
+def test_adjacent_links_to_same_target_are_merged():
+    """测试紧邻的同目标链接合并为一个超链接"""
+    document = BaseConverter().convert("[甲](http://example.com)[乙](http://example.com)\n")
+    p = document.paragraphs[0]._p
+    hyperlinks = p.findall(qn('w:hyperlink'))
+    assert len(hyperlinks) == 1
+    assert [r.text for r in hyperlinks[0].findall(qn('w:r'))] == ['甲乙']
+
+
+def test_list_and_blockquote_coalesce(monkeypatch):
+    """测试列表和引用块同样合并，关闭合并时 run 更多"""
+    md_text = "- **甲**\n  **乙**\n\n> **甲**\n> **乙**\n"
+    document = BaseConverter().convert(md_text)
+    assert [len(p.runs) for p in document.paragraphs] == [1, 1]
+
+    monkeypatch.setattr(RunBuffer, 'coalesce', False)
+    document = BaseConverter().convert(md_text)
+    assert [len(p.runs) for p in document.paragraphs] == [3, 3]
+
+
+def test_long_softbreak_paragraph_is_one_text_element():
+    """测试换行分开的长段落只生成一个 run 和一个 w:t"""
+    lines = [f"日志行 {i} status=200" for i in range(2000)]
+    runs = _runs("\n".join(lines) + "\n")
+    assert len(runs) == 1
+    assert len(runs[0]._r.findall(qn('w:t'))) == 1
+    assert runs[0].text == " ".join(lines)
@@ -0,0 +1,95 @@
+"""
+转换统计测试模块
+"""
+import json
+import struct
+import zlib
+from io import BytesIO
+
+from src.converter.base import BaseConverter
+
+
+MD_TEXT = """# 标题
+
+段落 **粗体**
+
+- [ ] 任务
+
+| 列 | 值 |
+|---|---|
+| a | 1 |
+
+```
+code
+```
+"""
+
+
+def test_timings_always_recorded():
+    """测试总是记录解析、转换和保存耗时"""
+    converter = BaseConverter()
+    converter.convert(MD_TEXT)
+    converter.save(BytesIO())
+
+    stats = converter.stats
+    assert stats.parse_time > 0
+    assert stats.convert_time > 0
+    assert stats.save_time > 0
+    assert stats.converters == {}
+
+
+def test_profile_per_converter():
+    """测试按元素转换器记录调用次数、耗时和输出大小"""
+    converter = BaseConverter(profile=True)
+    document = converter.convert(MD_TEXT)
+    converters = converter.stats.converters
+
+    for name in ('heading', 'text', 'task_list', 'table', 'code'):
+        assert converters[name].calls == 1
+        assert converters[name].time > 0
+    # 任务列表调用列表转换器：耗时分别计入，输出只计入最外层
+    assert converters['list'].calls == 1
+    assert converters['list'].elements == 0
+    assert converters['task_list'].elements == 1
+
+    assert sum(stats.elements for stats in converters.values()) == len(document.element.body) - 1
+    assert converters['table'].output_bytes > converters['heading'].output_bytes
+    assert sum(stats.time for stats in converters.values()) <= converter.stats.convert_time
+
+
+def test_profile_inline_image_and_link(tmp_path):
+    """测试行内图片和链接计入各自的转换器，而不是所在段落的文字转换器"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    image = tmp_path / 'image.png'
+    image.write_bytes(b'\x89PNG\r\n\x1a\n'
+                      + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+                      + chunk(b'IDAT', zlib.compress(b'\x00\xff\xff\xff'))
+                      + chunk(b'IEND', b''))
+
+    converter = BaseConverter(profile=True)
+    document = converter.convert(f"文字 ![图]({image}) 和 [链接](http://example.com)\n")
+    converters = converter.stats.converters
+
+    assert len(document.inline_shapes) == 1
+    for name in ('image', 'link'):
+        assert converters[name].calls == 1
+        assert converters[name].time > 0
+    # 段落只计为一次文字转换，行内元素的耗时不重复计入
+    assert converters['text'].calls == 1
+    assert converters['text'].elements == 1
+    assert converters['image'].elements == 0
+
+
+def test_stats_export_and_reset():
+    """测试导出 JSON，reset 后清空统计"""
+    converter = BaseConverter(profile=True)
+    converter.convert(MD_TEXT)
+
+    data = json.loads(converter.stats.to_json())
+    assert data['converters']['table']['calls'] == 1
+    assert 'table' in converter.stats.format()
+
+    converter.reset()
+    assert converter.stats.converters == {}
+    assert converter.stats.parse_time == 0
@@ -0,0 +1,114 @@
+"""
+流式分块转换测试模块
+"""
+from io import StringIO
+
+from docx.oxml.ns import qn
+from src.converter.base import BaseConverter
+from src.converter.stream import iter_chunks
+
+
+def chunks_of(text, chunk_size=1):
+    return list(iter_chunks(StringIO(text), chunk_size))
+
+
+def test_split_at_blank_lines():
+    """测试在空行处切分"""
+    chunks = chunks_of("第一段\n\n第二段\n\n第三段\n")
+    assert chunks == ["第一段\n\n", "第二段\n\n", "第三段\n"]
+
+
+def test_chunk_size_groups_blocks():
+    """测试未达到分块大小时不切分"""
+    text = "第一段\n\n第二段\n\n第三段\n"
+    assert chunks_of(text, chunk_size=1 << 20) == [text]
+
+
+def test_no_split_inside_fence():
+    """测试不在围栏代码块内切分"""
+    text = "```\ncode\n\nmore code\n```\n\n段落\n"
+    chunks = chunks_of(text)
+    assert chunks == ["```\ncode\n\nmore code\n```\n\n", "段落\n"]
+
+
+def test_no_split_inside_list():
+    """测试不在松散列表内切分"""
+    text = "1. 第一项\n\n2. 第二项\n\n   续行\n\n段落\n"
+    chunks = chunks_of(text)
+    assert chunks == ["1. 第一项\n\n2. 第二项\n\n   续行\n\n", "段落\n"]
+
+
+def test_no_split_inside_raw_html():
+    """测试不在可含空行的 HTML 块内切分"""
+    text = "<pre>\na\n\nb\n</pre>\n\n段落\n"
+    assert chunks_of(text) == ["<pre>\na\n\nb\n</pre>\n\n", "段落\n"]
+
+
+def test_stream_matches_full_conversion():
+    """测试流式转换与一次性转换结果一致"""
+    text = """# 标题
+
+第一段 **粗体**
+
+- 列表项 1
+  - 嵌套项
+
+- 列表项 2
+
+```python
+print("a")
+
+print("b")
+```
+
+> 引用
+
+1. 有序 1
+2. 有序 2
+"""
+    full = BaseConverter().convert(text)
+    streamed = BaseConverter().convert_stream(StringIO(text), chunk_size=1)
+
+    assert [(p.text, p.style.name) for p in streamed.paragraphs] == \
+        [(p.text, p.style.name) for p in full.paragraphs]
+
+
+REFERENCE_TEXT = """第一段 [链接][ref]
+
+第二段
+
+[ref]: http://example.com/ref
+[other]: http://example.com/first
+
+第三段 [另一个][other]
+
+[other]: http://example.com/second
+"""
+
+
+def _links(document):
+    rels = document.part.rels
+    return [rels[h.get(qn('r:id'))].target_ref
+            for p in document.paragraphs for h in p._p.findall(qn('w:hyperlink'))]
+
+
+def test_reference_defined_in_another_chunk(tmp_path):
+    """测试引用式链接定义在其他分块中时仍然解析为链接，同一标签以第一次定义为准"""
+    path = tmp_path / 'refs.md'
+    path.write_text(REFERENCE_TEXT, encoding='utf-8')
+    assert len(chunks_of(REFERENCE_TEXT)) == 5
+
+    full = BaseConverter().convert(REFERENCE_TEXT)
+    expected = ['http://example.com/ref', 'http://example.com/first']
+    assert _links(full) == expected
+    with open(path, encoding='utf-8') as f:
+        streamed = BaseConverter().convert_stream(f, chunk_size=1)
+    assert _links(streamed) == expected
+    assert [p.text for p in streamed.paragraphs] == [p.text for p in full.paragraphs]
+
+
+def test_reference_from_earlier_chunk_in_unseekable_input():
+    """测试只能迭代一次的输入可以引用之前分块中的定义"""
+    text = "[ref]: http://example.com/ref\n\n段落 [链接][ref]\n"
+    streamed = BaseConverter().convert_stream(iter(text.splitlines(keepends=True)), chunk_size=1)
+    assert _links(streamed) == ['http://example.com/ref']
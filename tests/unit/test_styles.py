@@ -0,0 +1,100 @@
+"""
+样式索引测试模块
+"""
+import copy
+
+import pytest
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.styles import CT_Styles
+
+from src.converter.base import BaseConverter
+from src.converter.styles import get_style_index
+
+
+def test_lookup_by_name_and_id():
+    """测试按界面名称和样式 ID 查找"""
+    document = Document()
+    styles = get_style_index(document)
+
+    assert 'Heading 1' in styles
+    assert styles['Heading 1'].style_id == 'Heading1'
+    assert styles.get_by_id('Heading1') is styles.get_element('Heading 1')
+    assert 'Missing' not in styles
+    with pytest.raises(KeyError):
+        styles['Missing']
+
+
+def test_index_is_shared_per_document():
+    """测试同一文档的索引只建立一次"""
+    document = Document()
+    assert get_style_index(document) is get_style_index(document.part.document)
+    assert get_style_index(document) is not get_style_index(Document())
+
+
+def test_add_style_updates_index():
+    """测试通过索引新增的样式可以立即查到"""
+    document = Document()
+    styles = get_style_index(document)
+    style = styles.add_style('Custom', WD_STYLE_TYPE.PARAGRAPH)
+
+    assert styles['Custom'] == style
+    assert styles.get_by_id(style.style_id) is style.element
+
+
+def test_external_changes_are_detected():
+    """测试绕过索引新增或替换的样式在下次查找时被发现"""
+    document = Document()
+    styles = get_style_index(document)
+    styles.get('Normal')
+
+    document.styles.add_style('Added', WD_STYLE_TYPE.PARAGRAPH)
+    assert 'Added' in styles
+
+    old = styles.get_element('Added')
+    new = copy.deepcopy(old)
+    old.getparent().replace(old, new)
+    assert styles.get_element('Added') is new
+
+
+def test_set_styles_matches_python_docx():
+    """测试设置样式的结果与 python-docx 相同"""
+    document = Document()
+    styles = get_style_index(document)
+
+    expected = document.add_paragraph()
+    expected.style = 'Heading 2'
+    paragraph = document.add_paragraph()
+    styles.set_paragraph_style(paragraph, 'Heading 2')
+    assert paragraph._p.xml == expected._p.xml
+
+    # 默认样式不写入 pStyle
+    styles.set_paragraph_style(paragraph, 'Normal')
+    assert paragraph._p.pPr.pStyle is None
+
+    run = paragraph.add_run('文字')
+    styles.set_run_style(run, 'Strong')
+    assert run.style.name == 'Strong'
+
+    table = document.add_table(rows=1, cols=1)
+    styles.set_table_style(table, 'Table Grid')
+    assert table.style.name == 'Table Grid'
+
+    with pytest.raises(ValueError):
+        styles.set_run_style(run, 'Heading 1')
+
+
+def test_conversion_does_not_scan_styles(monkeypatch):
+    """测试转换过程中不再按名称线性查找样式"""
+    calls = []
+    original = CT_Styles.get_by_name
+
+    def get_by_name(self, name):
+        calls.append(name)
+        return original(self, name)
+
+    monkeypatch.setattr(CT_Styles, 'get_by_name', get_by_name)
+    md_text = "# 标题\n\n> 引用\n\n- 列表\n\n1. 有序\n\n```\ncode\n```\n\n[链接](http://example.com)\n\n| a |\n|---|\n| 1 |\n"
+    BaseConverter().convert(md_text * 20)
+
+    assert calls == []
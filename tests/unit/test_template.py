@@ -0,0 +1,43 @@
+"""
+文档模板缓存测试模块
+"""
+from io import BytesIO
+from docx import Document
+from src.converter.template import new_document, clear_template_cache
+
+
+def test_template_contains_converter_styles():
+    """测试模板预先包含转换器样式"""
+    document = new_document()
+    for style_name in ('Code', 'Hyperlink', 'Quote', 'Quote2', 'Quote3', 'List Bullet 4', 'List Number 6'):
+        assert style_name in document.styles
+
+
+def test_cloned_documents_are_independent():
+    """测试克隆出的文档互不影响"""
+    first = new_document()
+    second = new_document()
+    first.add_paragraph("只在第一个文档中")
+
+    assert len(first.paragraphs) == 1
+    assert len(second.paragraphs) == 0
+    assert first.styles.element is not second.styles.element
+    assert len(new_document().paragraphs) == 0
+
+
+def test_cloned_document_roundtrip():
+    """测试克隆出的文档可以正常保存和重新打开"""
+    document = new_document()
+    document.add_paragraph("内容", style='Code')
+    stream = BytesIO()
+    document.save(stream)
+
+    reopened = Document(BytesIO(stream.getvalue()))
+    assert reopened.paragraphs[0].text == "内容"
+    assert reopened.paragraphs[0].style.name == 'Code'
+
+
+def test_clear_template_cache():
+    """测试清空模板缓存后重新构建"""
+    clear_template_cache()
+    assert 'Code' in new_document().styles
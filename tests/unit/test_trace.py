@@ -0,0 +1,93 @@
+"""
+跟踪器测试模块
+"""
+import weakref
+from io import StringIO
+
+import pytest
+from src.converter.base import BaseConverter, ConvertError
+from src.converter.elements.base import ElementConverter
+from src.converter.trace import MAX_ARG_LENGTH, Tracer
+
+
+MD_TEXT = "# 标题\n\n段落\n\n| 列 |\n|---|\n| a |\n"
+
+
+def test_disabled_by_default(capsys):
+    """测试非调试模式下不记录也不输出"""
+    converter = BaseConverter()
+    converter.convert(MD_TEXT)
+    assert converter.tracer.events() == []
+    assert capsys.readouterr().out == ""
+
+
+def test_debug_echoes_events(capsys):
+    """测试调试模式下立即输出事件到标准错误"""
+    BaseConverter(debug=True).convert(MD_TEXT)
+    captured = capsys.readouterr()
+    assert "[table] 处理表格" in captured.err
+    assert "[tokens] Token type=heading_open" in captured.err
+    assert captured.out == ""
+
+
+def test_arguments_are_snapshotted():
+    """测试记录时保存参数快照，不引用原对象，大参数被截断"""
+    class Node:
+        def __format__(self, spec):
+            return "节点"
+
+    node = Node()
+    ref = weakref.ref(node)
+    items = [1, 2]
+    tracer = Tracer()
+    tracer.event('test', "{} {} {} {:.1f} {}", node, items, "长" * 1000, 0.25, None)
+    items.append(3)
+    del node
+    assert ref() is None
+
+    stream = StringIO()
+    tracer.dump(stream)
+    assert stream.getvalue() == f"[test] 节点 [1, 2] {'长' * MAX_ARG_LENGTH}... 0.2 None\n"
+
+
+def test_ring_buffer_and_sampling():
+    """测试环形缓冲区容量和采样"""
+    tracer = Tracer(capacity=10)
+    for i in range(100):
+        tracer.event('test', "{}", i)
+    assert [event.args[0] for event in tracer.events()] == list(range(90, 100))
+
+    sampled = Tracer(sample_rate=0.1)
+    for i in range(1000):
+        sampled.event('test', "{}", i)
+    assert 0 < len(sampled.events()) < 300
+    assert len(sampled.events()) + sampled.dropped == 1000
+
+
+def test_source_filter():
+    """测试按转换器过滤"""
+    tracer = Tracer(sources=('table',))
+    converter = BaseConverter(tracer=tracer)
+    converter.convert(MD_TEXT)
+
+    events = tracer.events()
+    assert events
+    assert {event.source for event in events} == {'table'}
+    assert not converter.converters['text'].tracing
+    assert converter.converters['table'].tracing
+
+
+def test_dump_on_error():
+    """测试转换出错时输出缓冲区中的事件"""
+    class Failing(ElementConverter):
+        def convert(self, token, tokens=None):
+            self.trace("即将失败: {}", token.type)
+            raise RuntimeError("boom")
+
+    stream = StringIO()
+    converter = BaseConverter(tracer=Tracer(stream=stream))
+    converter.register_converter('failing', Failing(converter), token_types=('fence',))
+
+    with pytest.raises(ConvertError):
+        converter.convert("```\ncode\n```\n")
+    assert "[failing] 即将失败: fence" in stream.getvalue()